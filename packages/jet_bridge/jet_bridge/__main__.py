@@ -18,6 +18,7 @@ from jet_bridge_base.logger import logger
 from jet_bridge import settings, VERSION
 from jet_bridge.settings import missing_options, required_options_without_default
 from jet_bridge.tasks.release_inactive_graphql_schemas import run_release_inactive_graphql_schemas_task
+from jet_bridge.tasks.release_inactive_connections import run_release_inactive_connections_task
 
 
 def main():
@@ -80,6 +81,19 @@ def main():
         )
         release_inactive_graphql_schemas_task.start()
 
+    if settings.RELEASE_INACTIVE_CONNECTIONS_TIMEOUT or settings.CONNECTIONS_LIMIT or settings.CONNECTIONS_MEMORY_LIMIT:
+        logger.info('RELEASE_INACTIVE_CONNECTIONS task is enabled (TIMEOUT={}s, LIMIT={}, MEMORY_LIMIT={})'.format(
+            settings.RELEASE_INACTIVE_CONNECTIONS_TIMEOUT,
+            settings.CONNECTIONS_LIMIT,
+            settings.CONNECTIONS_MEMORY_LIMIT
+        ))
+
+        release_inactive_connections_task = PeriodicCallback(
+            lambda: run_release_inactive_connections_task(),
+            60 * 1000  # every minute
+        )
+        release_inactive_connections_task.start()
+
     if settings.DEBUG:
         logger.warning('Server is running in DEBUG mode')
 
@@ -54,7 +54,13 @@ class JetBridgeConfiguration(Configuration):
             'DATABASE_RLS_TYPE': settings.DATABASE_RLS_TYPE,
             'DATABASE_RLS_SSO': settings.DATABASE_RLS_SSO,
             'DATABASE_RLS_USER_PROPERTY': settings.DATABASE_RLS_USER_PROPERTY,
+            'DATABASE_SQL_MAX_ROWS': settings.DATABASE_SQL_MAX_ROWS,
+            'DATABASE_SQL_MAX_RESPONSE_SIZE': settings.DATABASE_SQL_MAX_RESPONSE_SIZE,
             'DATABASE_REFLECT_MAX_RECORDS': settings.DATABASE_REFLECT_MAX_RECORDS,
+            'DATABASE_REFLECT_THREADS': settings.DATABASE_REFLECT_THREADS,
+            'DATABASE_REFLECT_SAMPLE': settings.DATABASE_REFLECT_SAMPLE,
+            'DATABASE_BULK_WRITE_SIZE': settings.DATABASE_BULK_WRITE_SIZE,
+            'DATABASE_LAZY_MAPPING': settings.DATABASE_LAZY_MAPPING,
             'DATABASE_SSL_CA': settings.DATABASE_SSL_CA,
             'DATABASE_SSL_CERT': settings.DATABASE_SSL_CERT,
             'DATABASE_SSL_KEY': settings.DATABASE_SSL_KEY,
@@ -70,6 +76,27 @@ class JetBridgeConfiguration(Configuration):
             'CACHE_METADATA': settings.CACHE_METADATA,
             'CACHE_METADATA_PATH': settings.CACHE_METADATA_PATH,
             'CACHE_MODEL_DESCRIPTIONS': settings.CACHE_MODEL_DESCRIPTIONS,
+            'CACHE_GRAPHQL_SCHEMA': settings.CACHE_GRAPHQL_SCHEMA,
+            'BRIDGE_SETTINGS_CACHE_SIZE': settings.BRIDGE_SETTINGS_CACHE_SIZE,
+            'BRIDGE_SETTINGS_CACHE_TTL': settings.BRIDGE_SETTINGS_CACHE_TTL,
+            'COUNT_STRATEGY': settings.COUNT_STRATEGY,
+            'COUNT_CAP': settings.COUNT_CAP,
+            'COUNT_CACHE_SIZE': settings.COUNT_CACHE_SIZE,
+            'COUNT_CACHE_TTL': settings.COUNT_CACHE_TTL,
+            'COUNT_CONCURRENT': settings.COUNT_CONCURRENT,
+            'STREAM_RESPONSES': settings.STREAM_RESPONSES,
+            'STREAM_CHUNK_SIZE': settings.STREAM_CHUNK_SIZE,
+            'JSON_BACKEND': settings.JSON_BACKEND,
+            'GRAPHQL_LAZY_SCHEMA': settings.GRAPHQL_LAZY_SCHEMA,
+            'GRAPHQL_DOCUMENTS_CACHE_SIZE': settings.GRAPHQL_DOCUMENTS_CACHE_SIZE,
+            'GRAPHQL_PERSISTED_QUERIES': settings.GRAPHQL_PERSISTED_QUERIES,
+            'GRAPHQL_PERSISTED_QUERIES_CACHE_SIZE': settings.GRAPHQL_PERSISTED_QUERIES_CACHE_SIZE,
+            'SQL_BATCH_CONCURRENCY': settings.SQL_BATCH_CONCURRENCY,
+            'SQL_CACHE_TTL': settings.SQL_CACHE_TTL,
+            'SQL_CACHE_STALE_TTL': settings.SQL_CACHE_STALE_TTL,
+            'SQL_CACHE_SIZE': settings.SQL_CACHE_SIZE,
+            'SQL_CACHE_MAX_MEMORY': settings.SQL_CACHE_MAX_MEMORY,
+            'COALESCE_REQUESTS': settings.COALESCE_REQUESTS,
             'SSO_APPLICATIONS': self.clean_sso_applications(settings.SSO_APPLICATIONS),
             'ALLOW_ORIGIN': settings.ALLOW_ORIGIN,
             'TRACK_DATABASES': settings.TRACK_DATABASES,
@@ -80,6 +107,9 @@ class JetBridgeConfiguration(Configuration):
             'TRACK_QUERY_SLOW_TIME': settings.TRACK_QUERY_SLOW_TIME,
             'TRACK_QUERY_HIGH_MEMORY': settings.TRACK_QUERY_HIGH_MEMORY,
             'RELEASE_INACTIVE_GRAPHQL_SCHEMAS_TIMEOUT': settings.RELEASE_INACTIVE_GRAPHQL_SCHEMAS_TIMEOUT,
+            'RELEASE_INACTIVE_CONNECTIONS_TIMEOUT': settings.RELEASE_INACTIVE_CONNECTIONS_TIMEOUT,
+            'CONNECTIONS_LIMIT': settings.CONNECTIONS_LIMIT,
+            'CONNECTIONS_MEMORY_LIMIT': settings.CONNECTIONS_MEMORY_LIMIT,
             'DISABLE_AUTH': settings.DISABLE_AUTH
         }
 
@@ -5,12 +5,14 @@ import tornado.web
 from jet_bridge.utils.async_exec import as_future
 from jet_bridge_base.db import get_connection
 from jet_bridge_base.exceptions.request_error import RequestError
+from jet_bridge_base.logger import logger
 from jet_bridge_base.sentry import sentry_controller
 from tornado import gen
 from six.moves.urllib_parse import parse_qs
 
 from jet_bridge_base.request import Request
 from jet_bridge_base.responses.redirect import RedirectResponse
+from jet_bridge_base.responses.streaming import StreamingResponse
 from jet_bridge_base.responses.template import TemplateResponse
 from jet_bridge_base.status import HTTP_204_NO_CONTENT
 from tornado.iostream import StreamClosedError
@@ -76,6 +78,8 @@ class BaseViewHandler(tornado.web.RequestHandler):
 
             if isinstance(response, TemplateResponse):
                 yield self.render(response.template, **(response.data or {}))
+            elif isinstance(response, StreamingResponse):
+                yield self.write_streaming_response(response)
             else:
                 yield self.finish(response.render())
         except StreamClosedError:
@@ -83,6 +87,39 @@ class BaseViewHandler(tornado.web.RequestHandler):
 
         raise gen.Return()
 
+    @gen.coroutine
+    def write_streaming_response(self, response):
+        chunks = iter(response)
+        started = False
+
+        try:
+            while True:
+                # Rows are fetched from database in executor to not block IOLoop
+                chunk = yield as_future(lambda: next(chunks, None))
+
+                if chunk is None:
+                    break
+
+                self.write(chunk)
+                yield self.flush()
+                started = True
+
+            yield self.finish()
+        except StreamClosedError:
+            raise
+        except Exception as e:
+            if not started:
+                raise
+
+            # Headers are already sent, connection is closed so that client receives incomplete response
+            logger.error('Streaming response failed', exc_info=e)
+            sentry_controller.capture_exception(e)
+            self.request.connection.close()
+        finally:
+            response.close()
+
+        raise gen.Return()
+
     @gen.coroutine
     def write_error(self, status_code, **kwargs):
         exc_type = exc = traceback = None
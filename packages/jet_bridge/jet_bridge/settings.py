@@ -64,7 +64,13 @@ define('database_timezone', default=None, type=str)
 define('database_rls_type', default=None, type=str)
 define('database_rls_sso', default=None, type=str)
 define('database_rls_user_property', default=None, type=str)
+define('database_sql_max_rows', default=1000000, help='Max rows returned by SQL query, 0 for no limit', type=int)
+define('database_sql_max_response_size', default=256 * 1024 * 1024, help='Max SQL query response size in bytes, 0 for no limit', type=int)
 define('database_reflect_max_records', default=1000000, type=int)
+define('database_reflect_threads', default=4, type=int)
+define('database_reflect_sample', default=True, type=bool)
+define('database_bulk_write_size', default=1000, type=int)
+define('database_lazy_mapping', default=False, type=bool)
 
 define('database_ssl_ca', default=None, type=str, help='Path to "CA Certificate" file')
 define('database_ssl_cert', default=None, type=str, help='Path to "Client Certificate" file')
@@ -85,6 +91,32 @@ define('store_path', default='jet_bridge_store.sqlite3', type=str)
 define('cache_metadata', default=False, type=bool)
 define('cache_metadata_path', default='metadata', type=str)
 define('cache_model_descriptions', default=False, type=bool)
+define('cache_graphql_schema', default=False, type=bool)
+
+define('bridge_settings_cache_size', default=1000, type=int)
+define('bridge_settings_cache_ttl', default=300, type=int)
+
+define('count_strategy', default='auto', type=str)
+define('count_cap', default=10000, type=int)
+define('count_cache_size', default=1000, type=int)
+define('count_cache_ttl', default=60, type=int)
+define('count_concurrent', default=False, type=bool)
+
+define('stream_responses', default=False, type=bool)
+define('stream_chunk_size', default=1000, type=int)
+define('json_backend', default='json', help='JSON encoder backend: json, orjson or auto (orjson if installed)', type=str)
+define('graphql_lazy_schema', default=False, help='Generate GraphQL schema per model on first use', type=bool)
+define('graphql_documents_cache_size', default=1000, help='Parsed GraphQL queries cache size', type=int)
+define('graphql_persisted_queries', default=False, help='Allow sending GraphQL query hash instead of query', type=bool)
+define('graphql_persisted_queries_cache_size', default=1000, help='Persisted GraphQL queries cache size', type=int)
+
+define('sql_batch_concurrency', default=0, help='Max pooled connections used by single batched SQL request, 0 to execute queries one by one', type=int)
+define('sql_cache_ttl', default=0, help='Seconds read-only SQL query results are cached, 0 to disable', type=int)
+define('sql_cache_stale_ttl', default=60, help='Seconds stale SQL query results are served while refreshing', type=int)
+define('sql_cache_size', default=1000, help='SQL query results cache size', type=int)
+define('sql_cache_max_memory', default=64 * 1024 * 1024, help='SQL query results cache max size in bytes', type=int)
+
+define('coalesce_requests', default=False, help='Execute identical concurrent read requests once', type=bool)
 
 define('sso_applications', default='{}', type=str)
 define('allow_origin', default='*')
@@ -100,6 +132,9 @@ define('track_query_slow_time', default=None, type=float)
 define('track_query_high_memory', default=None, type=int)
 
 define('release_inactive_graphql_schemas_timeout', default=None, type=int)
+define('release_inactive_connections_timeout', default=None, type=int)
+define('connections_limit', default=None, type=int)
+define('connections_memory_limit', default=None, type=int)
 
 define('disable_auth', default=False, type=bool)
 
@@ -187,7 +222,13 @@ DATABASE_TIMEZONE = options.database_timezone
 DATABASE_RLS_TYPE = options.database_rls_type
 DATABASE_RLS_SSO = options.database_rls_sso
 DATABASE_RLS_USER_PROPERTY = options.database_rls_user_property
+DATABASE_SQL_MAX_ROWS = options.database_sql_max_rows
+DATABASE_SQL_MAX_RESPONSE_SIZE = options.database_sql_max_response_size
 DATABASE_REFLECT_MAX_RECORDS = options.database_reflect_max_records
+DATABASE_REFLECT_THREADS = options.database_reflect_threads
+DATABASE_REFLECT_SAMPLE = options.database_reflect_sample
+DATABASE_BULK_WRITE_SIZE = options.database_bulk_write_size
+DATABASE_LAZY_MAPPING = options.database_lazy_mapping
 
 DATABASE_SSL_CA = options.database_ssl_ca
 DATABASE_SSL_CERT = options.database_ssl_cert
@@ -208,6 +249,32 @@ STORE_PATH = options.store_path
 CACHE_METADATA = options.cache_metadata
 CACHE_METADATA_PATH = options.cache_metadata_path
 CACHE_MODEL_DESCRIPTIONS = options.cache_model_descriptions
+CACHE_GRAPHQL_SCHEMA = options.cache_graphql_schema
+
+BRIDGE_SETTINGS_CACHE_SIZE = options.bridge_settings_cache_size
+BRIDGE_SETTINGS_CACHE_TTL = options.bridge_settings_cache_ttl
+
+COUNT_STRATEGY = options.count_strategy
+COUNT_CAP = options.count_cap
+COUNT_CACHE_SIZE = options.count_cache_size
+COUNT_CACHE_TTL = options.count_cache_ttl
+COUNT_CONCURRENT = options.count_concurrent
+
+STREAM_RESPONSES = options.stream_responses
+STREAM_CHUNK_SIZE = options.stream_chunk_size
+JSON_BACKEND = options.json_backend
+GRAPHQL_LAZY_SCHEMA = options.graphql_lazy_schema
+GRAPHQL_DOCUMENTS_CACHE_SIZE = options.graphql_documents_cache_size
+GRAPHQL_PERSISTED_QUERIES = options.graphql_persisted_queries
+GRAPHQL_PERSISTED_QUERIES_CACHE_SIZE = options.graphql_persisted_queries_cache_size
+
+SQL_BATCH_CONCURRENCY = options.sql_batch_concurrency
+SQL_CACHE_TTL = options.sql_cache_ttl
+SQL_CACHE_STALE_TTL = options.sql_cache_stale_ttl
+SQL_CACHE_SIZE = options.sql_cache_size
+SQL_CACHE_MAX_MEMORY = options.sql_cache_max_memory
+
+COALESCE_REQUESTS = options.coalesce_requests
 
 try:
     SSO_APPLICATIONS = json.loads(options.sso_applications)
@@ -228,6 +295,9 @@ TRACK_QUERY_SLOW_TIME = options.track_query_slow_time
 TRACK_QUERY_HIGH_MEMORY = options.track_query_high_memory
 
 RELEASE_INACTIVE_GRAPHQL_SCHEMAS_TIMEOUT = options.release_inactive_graphql_schemas_timeout
+RELEASE_INACTIVE_CONNECTIONS_TIMEOUT = options.release_inactive_connections_timeout
+CONNECTIONS_LIMIT = options.connections_limit
+CONNECTIONS_MEMORY_LIMIT = options.connections_memory_limit
 
 DISABLE_AUTH = options.disable_auth
 
@@ -0,0 +1,8 @@
+import gc
+
+from jet_bridge_base.db import release_connections_over_limits
+
+
+def run_release_inactive_connections_task():
+    if release_connections_over_limits():
+        gc.collect()
@@ -1,16 +1,20 @@
 import contextlib
+import os
 import threading
+from concurrent.futures import ThreadPoolExecutor
 from datetime import timedelta, datetime
 
 from jet_bridge_base import settings
-from jet_bridge_base.db_types import dump_metadata_file, load_mapped_base, init_database_connection, \
-    fetch_default_timezone
+from jet_bridge_base.db_types import dump_metadata_file, load_mapped_base, refresh_mapped_base, remap_mapped_base, \
+    get_loaded_classes, init_database_connection, fetch_default_timezone, create_concurrent_session, \
+    create_pool_session, get_pool_concurrency, reset_session_info, MongoSession, TABLE_FINGERPRINT_KEY
 from jet_bridge_base.logger import logger
 from jet_bridge_base.ssh_tunnel import SSHTunnel
 from jet_bridge_base.utils.common import get_random_string, format_size
 from jet_bridge_base.utils.conf import get_connection_id, get_connection_schema, get_connection_name, \
     get_connection_params_id, is_tunnel_connection, get_conf, get_settings_conf
 from jet_bridge_base.utils.datetime import date_trunc_minutes
+from jet_bridge_base.utils.tables import get_table_name
 
 try:
     from geoalchemy2 import types
@@ -19,8 +23,22 @@ except ImportError:
 
 connections = {}
 pending_connections = {}
+blacklist_hostnames_cache = None
+connections_eviction_lock = threading.Lock()
+connections_eviction_stats = {
+    'evicted_limit': 0,
+    'evicted_idle': 0,
+    'evicted_memory': 0,
+    'last_evicted': None
+}
+concurrent_queries_executor = ThreadPoolExecutor(thread_name_prefix='jet_concurrent_query')
+# Batch workers wait for count queries, so they are not sharing executor with them
+batch_queries_executor = ThreadPoolExecutor(thread_name_prefix='jet_batch_query')
 MODEL_DESCRIPTIONS_RESPONSE_CACHE_KEY = 'model_descriptions_response'
 MODEL_DESCRIPTIONS_HASH_CACHE_KEY = 'model_descriptions_hash'
+MODEL_DESCRIPTIONS_CACHE_KEY = 'model_descriptions'
+MODEL_SERIALIZERS_CACHE_KEY = 'model_serializers'
+GRAPHQL_SCHEMA_CACHE_KEYS = ['graphql_schema', 'graphql_schema_draft', 'graphql_schema_base62', 'graphql_schema_base62_draft']
 
 
 def get_connection_tunnel(conf):
@@ -129,7 +147,29 @@ def clean_hostname(hostname):
     return hostname
 
 
+def get_config_file_mtime():
+    try:
+        return os.path.getmtime(settings.CONFIG)
+    except (OSError, TypeError, ValueError):
+        return None
+
+
 def get_blacklist_hostnames():
+    global blacklist_hostnames_cache
+
+    cache_key = (settings.BLACKLIST_HOSTS, settings.CONFIG, get_config_file_mtime())
+    cache = blacklist_hostnames_cache
+
+    if cache is not None and cache[0] == cache_key:
+        return cache[1]
+
+    hostnames = read_blacklist_hostnames()
+    blacklist_hostnames_cache = (cache_key, hostnames)
+
+    return hostnames
+
+
+def read_blacklist_hostnames():
     hostnames = []
 
     if settings.BLACKLIST_HOSTS:
@@ -237,9 +277,15 @@ def connect_database(conf):
             'token': conf.get('token'),
             'init_start': init_start.isoformat(),
             'last_request': datetime.now(),
+            'active_requests': 0,
             **database_connection
         }
 
+        try:
+            release_connections_over_limits(exclude=[connection_id])
+        except Exception as e:
+            logger.error('[{}] Failed releasing connections over limits'.format(id_short), exc_info=e)
+
         return connections[connection_id]
     except Exception as e:
         if tunnel:
@@ -283,7 +329,19 @@ def dispose_request_connection(request):
     return dispose_connection(get_conf(request))
 
 
+def get_request_connection_memo(request):
+    connection = request.connection
+
+    # Connection is resolved once per request and reused while it is still registered (not disposed or reconnected)
+    if connection is not None and connections.get(connection['id']) is connection:
+        return connection
+
+
 def get_connection(request):
+    connection = get_request_connection_memo(request)
+    if connection is not None:
+        return connection
+
     conf = get_conf(request)
     connection_id = get_connection_id(conf)
     return connections.get(connection_id)
@@ -296,7 +354,14 @@ def connect_database_from_settings():
 
 
 def get_request_connection(request):
-    return connect_database(get_conf(request))
+    connection = get_request_connection_memo(request)
+    if connection is not None:
+        return connection
+
+    connection = connect_database(get_conf(request))
+    request.connection = connection
+
+    return connection
 
 
 def create_session(request):
@@ -311,7 +376,159 @@ def create_session(request):
         dispose_connection(conf)
         raise Exception('Hostname "{}" is blacklisted'.format(hostname))
 
-    return connection['Session']()
+    session = connection['Session']()
+
+    with connection['lock']:
+        connection['active_requests'] = connection.get('active_requests', 0) + 1
+        connection['last_request'] = datetime.now()
+
+    request.session_connection = connection
+
+    return session
+
+
+def release_session(session, connection):
+    if session is not None:
+        session.close()
+        reset_session_info(session)
+
+    if connection is not None:
+        with connection['lock']:
+            connection['active_requests'] = max(connection.get('active_requests', 0) - 1, 0)
+
+
+def close_session(request):
+    if request.session_detached:
+        return
+
+    release_session(request.session, request.session_connection)
+    request.session = None
+    request.session_connection = None
+
+
+def detach_session(request):
+    """
+    Keeps request session open after request is dispatched, used by streaming responses.
+    Returns function which should be called to close session instead of close_session.
+    """
+
+    session = request.session
+    connection = request.session_connection
+    request.session_detached = True
+
+    registry = getattr(connection['Session'], 'registry', None) if connection is not None else None
+
+    if registry is not None:
+        # Scoped session is removed from thread registry without closing, so that next request on this thread
+        # gets new session instead of closing the one used by streaming response
+        registry.clear()
+
+    return lambda: release_session(session, connection)
+
+
+def submit_request_count_query(request, count_query, data_session=None):
+    """
+    Starts count_query(session) on another pooled connection while data_session executes data query.
+    Returns Future or None if count should be executed on data session.
+    """
+
+    data_session = data_session or request.session
+
+    if not settings.COUNT_CONCURRENT or data_session is None:
+        return
+
+    session = create_concurrent_session(data_session)
+
+    if session is None:
+        return
+
+    def execute():
+        try:
+            request.apply_rls_if_enabled(session)
+            return count_query(session)
+        finally:
+            session.close()
+
+    return concurrent_queries_executor.submit(execute)
+
+
+def cancel_request_count_query(count_future):
+    """
+    Cancels count query which result is not used. Query already running is awaited, so its pooled session
+    is released and its exception is not left unobserved.
+    """
+
+    if count_future is not None and not count_future.cancel():
+        count_future.exception()
+
+
+def get_request_batch_concurrency(request, queries_count):
+    if request.session is None or isinstance(request.session, MongoSession) or settings.SQL_BATCH_CONCURRENCY <= 1:
+        return 1
+
+    concurrency = min(settings.SQL_BATCH_CONCURRENCY, queries_count)
+    pool_concurrency = get_pool_concurrency(request.session.get_bind())
+
+    if pool_concurrency is not None:
+        # Single request should not take more connections than pool keeps for all requests
+        concurrency = min(concurrency, pool_concurrency)
+
+    return max(concurrency, 1)
+
+
+def map_request_batch_queries(request, queries, execute_query):
+    """
+    Executes execute_query(session, query) for each query spreading them across pooled connections.
+    Results are returned in the original order of queries.
+    """
+
+    concurrency = get_request_batch_concurrency(request, len(queries))
+    sessions = [request.session]
+
+    while len(sessions) < concurrency:
+        # Request session state is not copied, each query applies its own timezone and schema
+        session = create_pool_session(request.session.get_bind())
+
+        if session is None:
+            break
+
+        sessions.append(session)
+
+    if len(sessions) == 1:
+        return list(map(lambda x: execute_query(request.session, x), queries))
+
+    results = [None] * len(queries)
+    pending = iter(enumerate(queries))
+    pending_lock = threading.Lock()
+
+    def get_next_query():
+        with pending_lock:
+            return next(pending, None)
+
+    def execute(session):
+        try:
+            while True:
+                item = get_next_query()
+
+                if item is None:
+                    break
+
+                i, query = item
+                results[i] = execute_query(session, query)
+        finally:
+            if session is not request.session:
+                session.close()
+
+    futures = list(map(lambda x: batch_queries_executor.submit(execute, x), sessions[1:]))
+
+    # Request session takes queries in current thread together with pooled sessions
+    try:
+        execute(request.session)
+    finally:
+        for future in futures:
+            future.result()
+
+    return results
 
 
 def get_connection_id_short(request):
@@ -411,14 +628,42 @@ def connection_cache_set(request, name, value):
         connection['cache'][name] = value
 
 
-def reload_request_mapped_base(request):
+def reload_request_mapped_base(request, tables=None):
+    conf = get_conf(request)
+    MappedBase = get_mapped_base(request)
+
+    if tables is not None:
+        # Tables were changed in memory, make next incremental refresh compare them with database again
+        # Only tables loaded into memory could have been changed
+        for table in dict.values(MappedBase.metadata.tables):
+            if table.name in tables:
+                table.info.pop(TABLE_FINGERPRINT_KEY, None)
+
+    if tables is not None:
+        remap_mapped_base(MappedBase, tables)
+    else:
+        load_mapped_base(MappedBase, True)
+
+    # Schema cache fingerprint is updated before GraphQL schemas are reloaded from persisted artifacts
+    dump_metadata_file(conf, MappedBase.metadata)
+    reload_request_tables_cache(request, tables)
+
+
+def refresh_request_mapped_base(request):
     conf = get_conf(request)
     MappedBase = get_mapped_base(request)
+    engine = get_engine(request)
+
+    # None means every table could have changed
+    changed = refresh_mapped_base(conf, engine, MappedBase)
+
+    if changed is not None and not changed:
+        return changed
 
-    load_mapped_base(MappedBase, True)
-    reload_request_model_descriptions_cache(request)
-    reload_request_graphql_schema(request)
     dump_metadata_file(conf, MappedBase.metadata)
+    reload_request_tables_cache(request, changed)
+
+    return changed
 
 
 def reload_connection_graphql_schema(connection, draft=None):
@@ -451,24 +696,134 @@ def reload_request_graphql_schema(request, draft=None):
             cache['graphql_schema_base62'] = None
 
 
-def reload_request_model_descriptions_cache(request):
+def get_tables_foreign_tables(MappedBase, tables):
+    metadata = getattr(MappedBase, 'metadata', None)
+    result = set()
+
+    if metadata is None:
+        return result
+
+    metadata_tables = dict.values(metadata.tables) if isinstance(metadata.tables, dict) else metadata.tables
+
+    for table in metadata_tables:
+        if table.name not in tables:
+            continue
+
+        for foreign_key in getattr(table, 'foreign_keys', []):
+            try:
+                result.add(get_table_name(metadata, foreign_key.column.table))
+            except Exception:
+                pass
+
+    return result
+
+
+def reload_request_model_descriptions_cache(request, models=None):
     with request_connection_cache(request) as cache:
         cache[MODEL_DESCRIPTIONS_RESPONSE_CACHE_KEY] = None
         cache[MODEL_DESCRIPTIONS_HASH_CACHE_KEY] = None
 
+        descriptions = cache.get(MODEL_DESCRIPTIONS_CACHE_KEY)
+
+        if models is None or descriptions is None:
+            cache[MODEL_DESCRIPTIONS_CACHE_KEY] = None
+            return
+
+        # Relations and foreign key fields of related models are described from both sides
+        models = set(models)
+        invalidate = models | get_tables_foreign_tables(get_mapped_base(request), models)
+
+        for model in models:
+            description = descriptions.get(model)
+            if description is not None:
+                invalidate.update(description['related_models'])
+
+        for model, description in list(descriptions.items()):
+            if model in invalidate or not description['related_models'].isdisjoint(models):
+                descriptions.pop(model, None)
+
+
+def reload_request_graphql_schema_models(request, models=None):
+    if models is None:
+        reload_request_graphql_schema(request)
+        return
+
+    with request_connection_cache(request) as cache:
+        for key in GRAPHQL_SCHEMA_CACHE_KEYS:
+            graphql_schema = cache.get(key)
+
+            if graphql_schema and graphql_schema.get('lazy') and graphql_schema.get('instance'):
+                # Lazy schema keeps models not related to changed tables
+                graphql_schema['instance'].reload_models(models)
+            else:
+                # Full schema is cached for all tables at once
+                cache[key] = None
+
+
+def reload_request_model_serializers_cache(request, models=None):
+    with request_connection_cache(request) as cache:
+        serializers = cache.get(MODEL_SERIALIZERS_CACHE_KEY)
+
+        if models is None or serializers is None:
+            cache[MODEL_SERIALIZERS_CACHE_KEY] = None
+            return
+
+        # Serializers are cached by model class, classes of changed and related tables are replaced on remap
+        loaded_classes = set(get_loaded_classes(get_mapped_base(request)))
+
+        for Model in list(serializers.keys()):
+            if Model not in loaded_classes:
+                serializers.pop(Model, None)
+
+
+def reload_request_tables_cache(request, tables=None):
+    reload_request_model_descriptions_cache(request, tables)
+    reload_request_graphql_schema_models(request, tables)
+    reload_request_model_serializers_cache(request, tables)
+
+
+def get_graphql_schema_memory_usage_approx(graphql_schema):
+    if graphql_schema.get('lazy'):
+        instance = graphql_schema.get('instance')
+        return instance.get_memory_usage_approx() if instance else 0
+    else:
+        return max(graphql_schema.get('memory_usage_approx') or 0, 0)
+
+
+def release_inactive_lazy_graphql_schemas(connection):
+    for key in GRAPHQL_SCHEMA_CACHE_KEYS:
+        graphql_schema = connection['cache'].get(key)
+
+        if not graphql_schema or not graphql_schema.get('lazy') or not graphql_schema.get('instance'):
+            continue
+
+        # Lazy schema models are released one by one when not used
+        released_models = graphql_schema['instance'].release_inactive_models(settings.RELEASE_INACTIVE_GRAPHQL_SCHEMAS_TIMEOUT)
+
+        for model in released_models:
+            memory_usage_approx = max(model['memory_usage_approx'] or 0, 0)
+
+            logger.info('Release inactive GraphQL model "{}" of "{}" (MEM:{})...'.format(
+                model['name'],
+                connection['name'],
+                format_size(memory_usage_approx) if memory_usage_approx else None
+            ))
+
 
 def release_inactive_graphql_schemas():
     if not settings.RELEASE_INACTIVE_GRAPHQL_SCHEMAS_TIMEOUT:
         return
 
-    for connection in connections.values():
+    for connection in list(connections.values()):
+        release_inactive_lazy_graphql_schemas(connection)
+
         cache = connection['cache']
-        graphql_schema = cache.get('graphql_schema')
-        graphql_schema_draft = cache.get('graphql_schema_draft')
-        graphql_schema_base62 = cache.get('graphql_schema_base62')
-        graphql_schema_base62_draft = cache.get('graphql_schema_base62_draft')
+        graphql_schemas = list(filter(
+            lambda x: x and not x.get('lazy'),
+            map(lambda x: cache.get(x), GRAPHQL_SCHEMA_CACHE_KEYS)
+        ))
 
-        if not graphql_schema and not graphql_schema_draft and not graphql_schema_base62 and not graphql_schema_base62_draft:
+        if not len(graphql_schemas):
             continue
 
         time_elapsed = (datetime.now() - connection['last_request']).total_seconds()
@@ -476,11 +831,7 @@ def release_inactive_graphql_schemas():
         if time_elapsed <= settings.RELEASE_INACTIVE_GRAPHQL_SCHEMAS_TIMEOUT:
             continue
 
-        graphql_schema_memory = graphql_schema.get('memory_usage_approx') if graphql_schema else 0
-        graphql_schema_draft_memory = graphql_schema_draft.get('memory_usage_approx') if graphql_schema_draft else 0
-        graphql_schema_base62_memory = graphql_schema_base62.get('memory_usage_approx') if graphql_schema_base62 else 0
-        graphql_schema_base62_draft_memory = graphql_schema_base62_draft.get('memory_usage_approx') if graphql_schema_base62_draft else 0
-        memory_usage_approx = graphql_schema_memory + graphql_schema_draft_memory + graphql_schema_base62_memory + graphql_schema_base62_draft_memory
+        memory_usage_approx = sum(map(lambda x: get_graphql_schema_memory_usage_approx(x), graphql_schemas))
 
         logger.info('Release inactive GraphQL schema "{}" (MEM:{}, ELAPSED:{})...'.format(
             connection['name'],
@@ -489,3 +840,121 @@ def release_inactive_graphql_schemas():
         ))
 
         reload_connection_graphql_schema(connection)
+
+
+def get_connection_memory_usage_approx(connection):
+    memory_usage_approx = max(connection.get('reflect_memory_usage_approx') or 0, 0)
+
+    for key in GRAPHQL_SCHEMA_CACHE_KEYS:
+        graphql_schema = connection['cache'].get(key)
+        if graphql_schema:
+            memory_usage_approx += get_graphql_schema_memory_usage_approx(graphql_schema)
+
+    return memory_usage_approx
+
+
+def get_connections_memory_usage_approx():
+    return sum(map(lambda x: get_connection_memory_usage_approx(x), list(connections.values())))
+
+
+def release_connection(connection, reason):
+    connection_id = connection['id']
+
+    if connections.get(connection_id) is not connection:
+        return False
+
+    del connections[connection_id]
+
+    memory_usage_approx = get_connection_memory_usage_approx(connection)
+    time_elapsed = (datetime.now() - connection['last_request']).total_seconds()
+
+    logger.info('[{}] Release connection "{}" ({}, MEM:{}, ELAPSED:{})...'.format(
+        connection_id[:4],
+        connection['name'],
+        reason,
+        format_size(memory_usage_approx) if memory_usage_approx else None,
+        '{}s'.format(round(time_elapsed))
+    ))
+
+    with connection['lock']:
+        connection['cache'].clear()
+
+    dispose_connection_object(connection)
+
+    connections_eviction_stats['evicted_{}'.format(reason)] += 1
+    connections_eviction_stats['last_evicted'] = datetime.now()
+
+    return True
+
+
+def get_releasable_connections(exclude=None):
+    exclude = exclude or []
+    result = filter(
+        lambda x: x['id'] not in exclude and not x.get('active_requests'),
+        list(connections.values())
+    )
+
+    # Least recently used first
+    return sorted(result, key=lambda x: x['last_request'])
+
+
+def release_inactive_connections(exclude=None):
+    if not settings.RELEASE_INACTIVE_CONNECTIONS_TIMEOUT:
+        return 0
+
+    released = 0
+
+    for connection in get_releasable_connections(exclude):
+        time_elapsed = (datetime.now() - connection['last_request']).total_seconds()
+
+        if time_elapsed <= settings.RELEASE_INACTIVE_CONNECTIONS_TIMEOUT:
+            break
+
+        if release_connection(connection, 'idle'):
+            released += 1
+
+    return released
+
+
+def release_connections_over_limits(exclude=None):
+    released = 0
+
+    with connections_eviction_lock:
+        released += release_inactive_connections(exclude)
+
+        if settings.CONNECTIONS_LIMIT:
+            for connection in get_releasable_connections(exclude):
+                if len(connections) <= settings.CONNECTIONS_LIMIT:
+                    break
+
+                if release_connection(connection, 'limit'):
+                    released += 1
+
+        if settings.CONNECTIONS_MEMORY_LIMIT:
+            for connection in get_releasable_connections(exclude):
+                if get_connections_memory_usage_approx() <= settings.CONNECTIONS_MEMORY_LIMIT:
+                    break
+
+                if release_connection(connection, 'memory'):
+                    released += 1
+
+    return released
+
+
+def get_connections_registry_stats():
+    memory_usage_approx = get_connections_memory_usage_approx()
+
+    return {
+        'connections': len(connections),
+        'connections_limit': settings.CONNECTIONS_LIMIT,
+        'inactive_timeout': settings.RELEASE_INACTIVE_CONNECTIONS_TIMEOUT,
+        'memory_limit': settings.CONNECTIONS_MEMORY_LIMIT,
+        'memory_limit_str': format_size(settings.CONNECTIONS_MEMORY_LIMIT) if settings.CONNECTIONS_MEMORY_LIMIT else None,
+        'memory_usage_approx': memory_usage_approx,
+        'memory_usage_approx_str': format_size(memory_usage_approx) if memory_usage_approx else None,
+        'evicted_limit': connections_eviction_stats['evicted_limit'],
+        'evicted_idle': connections_eviction_stats['evicted_idle'],
+        'evicted_memory': connections_eviction_stats['evicted_memory'],
+        'last_evicted': connections_eviction_stats['last_evicted'].isoformat()
+            if connections_eviction_stats['last_evicted'] else None
+    }
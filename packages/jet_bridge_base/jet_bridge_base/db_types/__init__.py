@@ -1,9 +1,17 @@
 from .common import inspect_uniform, aliased_uniform, get_session_engine
-from .db import init_database_connection, load_mapped_base
+from .db import init_database_connection, load_mapped_base, refresh_mapped_base, remap_mapped_base, \
+    get_loaded_classes
 from .discover import discover_connection, discover_tables
 from .metadata_file import dump_metadata_file, remove_metadata_file
 from .queryset import desc_uniform, empty_filter, get_queryset_order_by, get_queryset_limit, apply_default_ordering, \
-    queryset_count_optimized, queryset_aggregate, queryset_group, get_sql_aggregate_func_by_name, \
-    get_sql_group_func_lookup, queryset_search
+    queryset_aggregate, queryset_group, get_sql_aggregate_func_by_name, get_sql_group_func_lookup, queryset_search
+from .count import COUNT_STRATEGIES, queryset_count_optimized, queryset_count_strategy, get_count_strategy, \
+    get_count_cache_scope, count_cache
+from .keyset import get_queryset_keyset, apply_keyset_cursor, encode_keyset_cursor
 from .timezones import fetch_default_timezone, apply_session_timezone
-from .mongo import MongoDeclarativeMeta, MongoColumn, MongoDesc, MongoQueryset, MongoSession
+from .concurrent import apply_session_search_path, create_concurrent_session, create_pool_session, \
+    get_pool_concurrency, reset_session_info
+from .rls import apply_session_rls
+from .mongo import MongoDeclarativeMeta, MongoColumn, MongoDesc, MongoQueryset, MongoSession, \
+    MongoBulkWriteError
+from .sql import TABLE_FINGERPRINT_KEY
@@ -0,0 +1,92 @@
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import QueuePool, NullPool
+
+from .mongo import MongoSession
+from .timezones import apply_session_timezone
+
+
+def apply_session_search_path(session, schema):
+    session.execute('SET search_path TO :schema', {'schema': schema})
+    session.info['_search_path'] = schema
+
+
+def reset_session_info(session):
+    """
+    Removes request state stored in session info, as thread scoped session object is reused by next requests.
+    """
+
+    if isinstance(session, MongoSession):
+        return
+
+    session.info.pop('_queries_timezone', None)
+    session.info.pop('_search_path', None)
+
+
+def is_pool_connection_available(engine):
+    pool = engine.pool
+
+    if isinstance(pool, QueuePool):
+        # Connection should be available without waiting for connections held by other requests
+        max_overflow = getattr(pool, '_max_overflow', 0)
+        return pool.checkedin() > 0 or max_overflow < 0 or pool.overflow() < max_overflow
+    elif isinstance(pool, NullPool):
+        return True
+    else:
+        # Single connection pools can't execute queries concurrently
+        return False
+
+
+def get_pool_concurrency(engine):
+    """
+    Returns number of connections which can be used concurrently without overflow or None if not limited.
+    """
+
+    pool = engine.pool
+
+    if isinstance(pool, QueuePool):
+        return pool.size()
+    elif isinstance(pool, NullPool):
+        return
+    else:
+        return 1
+
+
+def create_pool_session(engine):
+    """
+    Creates session without any request state on another pooled connection.
+    Returns None if pooled connection can't be taken without waiting.
+    """
+
+    if not is_pool_connection_available(engine):
+        return
+
+    return Session(bind=engine)
+
+
+def create_concurrent_session(session):
+    """
+    Creates session on another pooled connection with the same timezone and search_path as session.
+    Returns None if queries can't be executed concurrently for session.
+    """
+
+    if isinstance(session, MongoSession):
+        return
+
+    concurrent_session = create_pool_session(session.get_bind())
+
+    if concurrent_session is None:
+        return
+
+    try:
+        timezone = session.info.get('_queries_timezone')
+        if timezone is not None:
+            apply_session_timezone(concurrent_session, timezone)
+
+        search_path = session.info.get('_search_path')
+        if search_path is not None:
+            apply_session_search_path(concurrent_session, search_path)
+    except Exception:
+        concurrent_session.close()
+        raise
+
+    return concurrent_session
@@ -0,0 +1,250 @@
+import json
+
+from sqlalchemy import select, func, text
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.orm import Query
+from sqlalchemy.sql.base import Executable
+from sqlalchemy.sql.elements import ClauseElement
+
+from jet_bridge_base import settings
+from jet_bridge_base.exceptions.validation_error import ValidationError
+from jet_bridge_base.utils.cache import TTLCache
+from jet_bridge_base.utils.conf import get_conf, get_connection_id
+
+from .common import get_session_engine
+from .mongo import MongoQueryset
+
+# Counts from database statistics, database is queried with EXPLAIN
+COUNT_STRATEGY_ESTIMATE = 'estimate'
+# SELECT count(*) FROM (... LIMIT N)
+COUNT_STRATEGY_CAPPED = 'capped'
+# Exact count reused for the same statement until TTL expires
+COUNT_STRATEGY_CACHED = 'cached'
+COUNT_STRATEGY_EXACT = 'exact'
+# Statistics for large unfiltered tables, exact count otherwise
+COUNT_STRATEGY_AUTO = 'auto'
+
+COUNT_STRATEGIES = [
+    COUNT_STRATEGY_AUTO,
+    COUNT_STRATEGY_EXACT,
+    COUNT_STRATEGY_CAPPED,
+    COUNT_STRATEGY_ESTIMATE,
+    COUNT_STRATEGY_CACHED
+]
+
+# Estimates below are not reliable enough and are checked with capped count
+COUNT_ESTIMATE_MIN = 10000
+
+count_cache = TTLCache(
+    max_size=lambda: settings.COUNT_CACHE_SIZE,
+    ttl=lambda: settings.COUNT_CACHE_TTL
+)
+
+
+class Explain(Executable, ClauseElement):
+    inherit_cache = False
+
+    def __init__(self, statement, prefix):
+        self.statement = statement
+        self.prefix = prefix
+
+
+@compiles(Explain)
+def visit_explain(element, compiler, **kwargs):
+    return '{} {}'.format(element.prefix, compiler.process(element.statement, **kwargs))
+
+
+def get_count_strategy(value=None):
+    strategy = value or settings.COUNT_STRATEGY or COUNT_STRATEGY_AUTO
+
+    if strategy not in COUNT_STRATEGIES:
+        raise ValidationError('Unknown count strategy "{}", available: {}'.format(
+            strategy,
+            ', '.join(COUNT_STRATEGIES)
+        ))
+
+    return strategy
+
+
+def get_count_cache_scope(request):
+    conf = get_conf(request)
+    return get_connection_id(conf), request.get_rls_key()
+
+
+def get_queryset_statement(queryset, limit=None):
+    if isinstance(queryset, Query):
+        queryset = queryset.order_by(None)
+        if limit is not None:
+            queryset = queryset.limit(limit)
+        return queryset.statement
+    else:
+        statement = queryset.order_by(None)
+        if limit is not None:
+            statement = statement.limit(limit)
+        return statement
+
+
+def get_count_statement(queryset, limit=None):
+    statement = get_queryset_statement(queryset, limit)
+    return select([func.count()]).select_from(statement.subquery('__jet_count'))
+
+
+def is_queryset_unfiltered(queryset):
+    if isinstance(queryset, (Query, MongoQueryset)):
+        return queryset.whereclause is None
+    else:
+        return False
+
+
+def execute_count(session, statement, params=None):
+    try:
+        return session.execute(statement, params).scalar()
+    except SQLAlchemyError:
+        session.rollback()
+        raise
+
+
+def queryset_count_exact(session, queryset, params=None):
+    if isinstance(queryset, MongoQueryset):
+        return queryset.order_by(None).count()
+
+    return execute_count(session, get_count_statement(queryset), params)
+
+
+def queryset_count_capped(session, queryset, cap, params=None):
+    if isinstance(queryset, MongoQueryset):
+        return queryset.order_by(None).limit(cap).count()
+
+    return execute_count(session, get_count_statement(queryset, limit=cap), params)
+
+
+def queryset_count_optimized_for_postgresql(session, db_table, schema=None):
+    name = '"{}"."{}"'.format(schema, db_table) if schema else '"{}"'.format(db_table)
+
+    try:
+        # to_regclass resolves name with schema or using search_path, not any table with the same name
+        cursor = session.execute(text('SELECT reltuples FROM pg_class WHERE oid = to_regclass(:name)'), {'name': name})
+        row = cursor.fetchone()
+
+        if row is None or row[0] is None or row[0] < 0:
+            # Table was never analyzed
+            return
+        return int(row[0])
+    except SQLAlchemyError:
+        session.rollback()
+        raise
+
+
+def queryset_count_optimized_for_mysql(session, db_table):
+    try:
+        cursor = session.execute(text('EXPLAIN SELECT COUNT(*) FROM `{}`'.format(db_table)))
+        row = cursor.fetchone()
+        return int(row[8])
+    except SQLAlchemyError:
+        session.rollback()
+        raise
+
+
+def queryset_count_unfiltered_estimate(session, queryset):
+    if isinstance(queryset, MongoQueryset):
+        return queryset.estimated_document_count()
+
+    try:
+        table = queryset.statement.froms[0]
+        engine = get_session_engine(queryset.session)
+
+        if engine == 'postgresql':
+            return queryset_count_optimized_for_postgresql(session, table.name, table.schema)
+        elif engine == 'mysql':
+            return queryset_count_optimized_for_mysql(session, table.name)
+    except Exception:
+        pass
+
+
+def queryset_count_explain_estimate(session, queryset, params=None):
+    engine = get_session_engine(session)
+    statement = get_queryset_statement(queryset)
+
+    try:
+        if engine == 'postgresql':
+            row = session.execute(Explain(statement, 'EXPLAIN (FORMAT JSON)'), params).fetchone()
+            plan = row[0]
+            if not isinstance(plan, list):
+                plan = json.loads(plan)
+            return int(plan[0]['Plan']['Plan Rows'])
+        elif engine == 'mysql':
+            row = session.execute(Explain(statement, 'EXPLAIN'), params).fetchone()
+            return int(row._mapping['rows'])
+    except SQLAlchemyError:
+        session.rollback()
+    except Exception:
+        pass
+
+
+def queryset_count_estimate(session, queryset, params=None):
+    if isinstance(queryset, MongoQueryset):
+        return queryset.estimated_document_count() if is_queryset_unfiltered(queryset) else None
+    elif is_queryset_unfiltered(queryset):
+        estimate = queryset_count_unfiltered_estimate(session, queryset)
+        if estimate is not None:
+            return estimate
+
+    return queryset_count_explain_estimate(session, queryset, params)
+
+
+def get_count_cache_key(session, queryset, params=None, cache_scope=None):
+    if isinstance(queryset, MongoQueryset):
+        statement_key = repr([queryset.name, queryset.order_by(None).get_aggregate_pipeline()])
+    else:
+        compiled = get_count_statement(queryset).compile(dialect=session.get_bind().dialect)
+        statement_key = repr([str(compiled), sorted(compiled.params.items()), params])
+
+    return repr(cache_scope), statement_key
+
+
+def queryset_count_strategy(session, queryset, strategy=None, params=None, cache_scope=None):
+    """
+    Counts queryset rows with the requested strategy, returns (count, exact)
+    where exact is False for estimated, capped or possibly stale cached counts.
+    """
+
+    strategy = get_count_strategy(strategy)
+
+    if strategy == COUNT_STRATEGY_EXACT:
+        return queryset_count_exact(session, queryset, params), True
+    elif strategy == COUNT_STRATEGY_CAPPED:
+        cap = settings.COUNT_CAP
+        count = queryset_count_capped(session, queryset, cap, params)
+        return count, count < cap
+    elif strategy == COUNT_STRATEGY_ESTIMATE:
+        estimate = queryset_count_estimate(session, queryset, params)
+
+        if estimate is not None and estimate >= COUNT_ESTIMATE_MIN:
+            return estimate, False
+
+        count = queryset_count_capped(session, queryset, COUNT_ESTIMATE_MIN, params)
+        return count, count < COUNT_ESTIMATE_MIN
+    elif strategy == COUNT_STRATEGY_CACHED:
+        cache_key = get_count_cache_key(session, queryset, params, cache_scope)
+        count = count_cache.get(cache_key)
+
+        if count is not None:
+            return count, False
+
+        count = queryset_count_exact(session, queryset, params)
+        count_cache.set(cache_key, count)
+        return count, True
+    else:
+        if is_queryset_unfiltered(queryset):
+            estimate = queryset_count_unfiltered_estimate(session, queryset)
+
+            if estimate is not None and estimate >= COUNT_ESTIMATE_MIN:
+                return estimate, False
+
+        return queryset_count_exact(session, queryset, params), True
+
+
+def queryset_count_optimized(session, queryset):
+    count, _ = queryset_count_strategy(session, queryset, COUNT_STRATEGY_AUTO)
+    return count
@@ -1,5 +1,6 @@
 from .mongo import mongodb_init_database_connection, MongoBase, mongo_load_mapped_base
-from .sql import sql_init_database_connection, sql_load_mapped_base
+from .sql import sql_init_database_connection, sql_load_mapped_base, sql_refresh_mapped_base, sql_get_loaded_classes, \
+    sql_remap_mapped_base
 
 
 def init_database_connection(conf, tunnel, id_short, connection_name, schema, pending_connection):
@@ -28,3 +29,24 @@ def load_mapped_base(MappedBase, clear=False):
         mongo_load_mapped_base(MappedBase, clear)
     else:
         sql_load_mapped_base(MappedBase, clear)
+
+
+def refresh_mapped_base(conf, engine, MappedBase):
+    if isinstance(MappedBase, MongoBase):
+        mongo_load_mapped_base(MappedBase, True)
+    else:
+        return sql_refresh_mapped_base(conf, engine, MappedBase)
+
+
+def remap_mapped_base(MappedBase, tables):
+    if isinstance(MappedBase, MongoBase):
+        mongo_load_mapped_base(MappedBase, True)
+    else:
+        return sql_remap_mapped_base(MappedBase, tables)
+
+
+def get_loaded_classes(MappedBase):
+    if isinstance(MappedBase, MongoBase):
+        return list(MappedBase.classes)
+    else:
+        return sql_get_loaded_classes(MappedBase)
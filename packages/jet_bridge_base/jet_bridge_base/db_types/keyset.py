@@ -0,0 +1,243 @@
+import base64
+import binascii
+import datetime
+import decimal
+import json
+import uuid
+
+from bson import ObjectId
+from bson.errors import InvalidId
+from sqlalchemy import sql, tuple_, or_, and_
+from sqlalchemy.engine import Row
+from sqlalchemy.sql import operators
+from sqlalchemy.sql.elements import ColumnElement, UnaryExpression
+
+from jet_bridge_base.exceptions.validation_error import ValidationError
+
+from .common import inspect_uniform, get_session_engine
+from .mongo import MongoQueryset, MongoOperator
+from .queryset import get_queryset_order_by
+
+# Engines which sort NULL after all values in ascending order
+KEYSET_NULLS_LARGE_ENGINES = ['postgresql', 'oracle', 'snowflake']
+# Engines with indexable row value comparison: (a, b) > (1, 2)
+KEYSET_ROW_VALUE_ENGINES = ['postgresql', 'mysql', 'sqlite']
+
+
+class KeysetColumn(object):
+    def __init__(self, name, column, descending, nullable):
+        self.name = name
+        self.column = column
+        self.descending = descending
+        self.nullable = nullable
+
+
+def get_queryset_keyset(Model, queryset):
+    """
+    Returns queryset ordering columns up to primary key which are used to identify row position.
+    apply_default_ordering should be applied to queryset to have primary key in ordering.
+    """
+
+    mapper = inspect_uniform(Model)
+    pk = mapper.primary_key[0]
+    ordering = get_queryset_order_by(queryset) or []
+    result = []
+
+    for item in ordering:
+        if isinstance(queryset, MongoQueryset):
+            name, direction = item
+            column = mapper.columns.get(name)
+            descending = direction < 0
+        else:
+            descending = False
+
+            if isinstance(item, UnaryExpression) and item.modifier in [operators.desc_op, operators.asc_op]:
+                descending = item.modifier == operators.desc_op
+                item = item.element
+
+            name = getattr(item, 'name', None)
+            column = mapper.columns.get(name) if name is not None else None
+
+            if column is None or not isinstance(item, ColumnElement) or getattr(item, 'table', None) is not column.table:
+                column = None
+
+        if column is None:
+            raise ValidationError('Cursor pagination is not supported for current ordering')
+
+        is_pk = name == pk.name
+        result.append(KeysetColumn(name, column, descending, column.nullable and not is_pk))
+
+        if is_pk:
+            return result
+
+    raise ValidationError('Cursor pagination requires ordering by primary key')
+
+
+def get_keyset_signature(keyset):
+    return list(map(lambda x: '-{}'.format(x.name) if x.descending else x.name, keyset))
+
+
+def encode_keyset_value(value):
+    if isinstance(value, datetime.datetime):
+        return {'dt': value.isoformat()}
+    elif isinstance(value, datetime.date):
+        return {'d': value.isoformat()}
+    elif isinstance(value, datetime.time):
+        return {'t': value.isoformat()}
+    elif isinstance(value, decimal.Decimal):
+        return {'dec': str(value)}
+    elif isinstance(value, uuid.UUID):
+        return {'uuid': str(value)}
+    elif isinstance(value, ObjectId):
+        return {'oid': str(value)}
+    elif isinstance(value, bytes):
+        return {'b': base64.b64encode(value).decode('ascii')}
+    elif value is None or isinstance(value, (bool, int, float, str)):
+        return value
+    else:
+        raise ValidationError('Cursor pagination is not supported for value {}'.format(repr(value)))
+
+
+def decode_keyset_value(value):
+    if not isinstance(value, dict):
+        return value
+    elif 'dt' in value:
+        return datetime.datetime.fromisoformat(value['dt'])
+    elif 'd' in value:
+        return datetime.date.fromisoformat(value['d'])
+    elif 't' in value:
+        return datetime.time.fromisoformat(value['t'])
+    elif 'dec' in value:
+        return decimal.Decimal(value['dec'])
+    elif 'uuid' in value:
+        return uuid.UUID(value['uuid'])
+    elif 'oid' in value:
+        return ObjectId(value['oid'])
+    elif 'b' in value:
+        return base64.b64decode(value['b'])
+    else:
+        raise ValidationError('Invalid cursor')
+
+
+def get_row_value(row, name):
+    if isinstance(row, Row):
+        return row._mapping[name]
+    elif isinstance(row, dict):
+        return row.get(name)
+    else:
+        return getattr(row, name, None)
+
+
+def encode_keyset_cursor(keyset, row):
+    data = {
+        'o': get_keyset_signature(keyset),
+        'v': list(map(lambda x: encode_keyset_value(get_row_value(row, x.name)), keyset))
+    }
+    data_str = json.dumps(data, separators=(',', ':')).encode('utf-8')
+    return base64.urlsafe_b64encode(data_str).decode('ascii').rstrip('=')
+
+
+def decode_keyset_cursor(keyset, cursor):
+    try:
+        data_str = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4))
+        data = json.loads(data_str.decode('utf-8'))
+
+        if not isinstance(data, dict) or not isinstance(data.get('v'), list):
+            raise ValidationError('Invalid cursor')
+
+        values = list(map(lambda x: decode_keyset_value(x), data['v']))
+    except (binascii.Error, ValueError, TypeError, KeyError, decimal.InvalidOperation, InvalidId):
+        raise ValidationError('Invalid cursor')
+
+    if data.get('o') != get_keyset_signature(keyset) or len(values) != len(keyset):
+        raise ValidationError('Cursor does not match current ordering')
+
+    return values
+
+
+class KeysetExpressions(object):
+    def __init__(self, mongo):
+        self.mongo = mongo
+
+    def gt(self, column, value):
+        return MongoOperator('__gt__', column, value) if self.mongo else column > value
+
+    def lt(self, column, value):
+        return MongoOperator('__lt__', column, value) if self.mongo else column < value
+
+    def eq(self, column, value):
+        return MongoOperator('__eq__', column, value) if self.mongo else column == value
+
+    def is_null(self, column):
+        return MongoOperator('__eq__', column, None) if self.mongo else column.is_(None)
+
+    def is_not_null(self, column):
+        return MongoOperator('not', MongoOperator('__eq__', column, None)) if self.mongo else column.isnot(None)
+
+    def and_(self, items):
+        if len(items) == 1:
+            return items[0]
+        return MongoOperator('and', items) if self.mongo else and_(*items)
+
+    def or_(self, items):
+        if len(items) == 1:
+            return items[0]
+        return MongoOperator('or', items) if self.mongo else or_(*items)
+
+
+def get_keyset_after_expression(expressions, item, value, nulls_large):
+    nulls_first = nulls_large == item.descending
+
+    if value is None:
+        # Only NULL values could go before non NULL values
+        return expressions.is_not_null(item.column) if item.nullable and nulls_first else None
+
+    if item.descending:
+        after = expressions.lt(item.column, value)
+    else:
+        after = expressions.gt(item.column, value)
+
+    if item.nullable and not nulls_first:
+        after = expressions.or_([after, expressions.is_null(item.column)])
+
+    return after
+
+
+def get_keyset_equal_expression(expressions, item, value):
+    if value is None:
+        return expressions.is_null(item.column)
+    return expressions.eq(item.column, value)
+
+
+def apply_keyset_cursor(queryset, keyset, cursor):
+    values = decode_keyset_cursor(keyset, cursor)
+    mongo = isinstance(queryset, MongoQueryset)
+    engine = get_session_engine(queryset.session)
+
+    if not mongo \
+            and engine in KEYSET_ROW_VALUE_ENGINES \
+            and all(map(lambda x: not x.nullable, keyset)) \
+            and all(map(lambda x: x.descending == keyset[0].descending, keyset)):
+        # Single row value comparison can use composite index
+        lhs = tuple_(*map(lambda x: x.column, keyset))
+        rhs = tuple_(*map(lambda x: sql.bindparam(None, x[1], type_=x[0].column.type), zip(keyset, values)))
+        return queryset.filter(lhs < rhs if keyset[0].descending else lhs > rhs)
+
+    expressions = KeysetExpressions(mongo)
+    nulls_large = engine in KEYSET_NULLS_LARGE_ENGINES
+    conditions = []
+
+    # (a > 1) OR (a = 1 AND b > 2) OR (a = 1 AND b = 2 AND pk > 3)
+    for i, item in enumerate(keyset):
+        after = get_keyset_after_expression(expressions, item, values[i], nulls_large)
+
+        if after is None:
+            continue
+
+        equal = list(map(lambda x: get_keyset_equal_expression(expressions, x[1], values[x[0]]), enumerate(keyset[:i])))
+        conditions.append(expressions.and_(equal + [after]))
+
+    if not len(conditions):
+        return queryset.filter(MongoOperator('exists', keyset[-1].column, False) if mongo else sql.false())
+
+    return queryset.filter(expressions.or_(conditions))
@@ -9,7 +9,7 @@ from .mongo_metadata_file import mongo_dump_metadata_file, mongo_load_metadata_f
 from .mongo_operator import MongoOperator
 from .mongo_queryset import MongoQueryset
 from .mongo_record import MongoRecordMeta, MongoRecord
-from .mongo_session import MongoSession
+from .mongo_session import MongoSession, MongoBulkWriteError
 from .mongo_table import MongoTable
 from .mongo_reflect import reflect_mongodb
 from .mongo_db import mongodb_init_database_connection, mongo_load_mapped_base
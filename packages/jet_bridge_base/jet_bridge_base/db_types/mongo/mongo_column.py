@@ -3,7 +3,7 @@ from .mongo_operator import MongoOperator
 
 class MongoColumn(object):
     def __init__(self, table, name, type, nullable=True, mixed_types=None, autoincrement=False, default=None,
-                 server_default=None, foreign_keys=None, comment=None, params=None):
+                 server_default=None, foreign_keys=None, comment=None, params=None, type_stats=None, null_count=0):
         self.table = table
         self.name = name
         self.key = name
@@ -16,6 +16,9 @@ class MongoColumn(object):
         self.foreign_keys = foreign_keys or list()
         self.comment = comment
         self.params = params or dict()
+        # Number of analyzed values of each type and empty values
+        self.type_stats = type_stats or dict()
+        self.null_count = null_count
 
     @staticmethod
     def deserialize(table, obj):
@@ -34,7 +37,9 @@ class MongoColumn(object):
             'server_default': self.server_default,
             'foreign_keys': self.foreign_keys,
             'comment': self.comment,
-            'params': self.params
+            'params': self.params,
+            'type_stats': self.type_stats,
+            'null_count': self.null_count
         }
 
     def __eq__(self, other):
@@ -25,7 +25,7 @@ def mongodb_init_database_connection(conf, tunnel, id_short, connection_name, sc
 
     engine.connect(database_url)
     db = engine.get_db(database_name)
-    Session = lambda: MongoSession(db)
+    Session = lambda: MongoSession(db, bulk_size=settings.DATABASE_BULK_WRITE_SIZE)
 
     connect_end = time.time()
     connect_time = round(connect_end - connect_start, 3)
@@ -58,7 +58,9 @@ def mongodb_init_database_connection(conf, tunnel, id_short, connection_name, sc
             db,
             only=only,
             pending_connection=pending_connection,
-            max_read_records=settings.DATABASE_REFLECT_MAX_RECORDS or 1000000
+            max_read_records=settings.DATABASE_REFLECT_MAX_RECORDS or 1000000,
+            sample=settings.DATABASE_REFLECT_SAMPLE,
+            threads=settings.DATABASE_REFLECT_THREADS
         )
 
         reflect_end_time = time.time()
@@ -1,11 +1,13 @@
-import json
 import os
 
 from jet_bridge_base import settings
 from jet_bridge_base.logger import logger
 from jet_bridge_base.utils.conf import get_connection_id, get_connection_schema, get_connection_name, get_metadata_file_path
 
+from ..schema_cache_file import SchemaCacheReader, SchemaCacheFormatError, write_schema_cache_file, \
+    encode_schema_cache_record, set_schema_cache_fingerprint
 from .mongo_metadata import MongoMetadata
+from .mongo_table import MongoTable
 
 
 def mongo_dump_metadata_file(conf, metadata):
@@ -19,14 +21,17 @@ def mongo_dump_metadata_file(conf, metadata):
 
     file_path = get_metadata_file_path(conf)
 
-    try:
-        dir_path = os.path.dirname(file_path)
+    set_schema_cache_fingerprint(metadata, None)
 
-        if dir_path and not os.path.exists(dir_path):
-            os.makedirs(dir_path)
+    try:
+        fingerprint = write_schema_cache_file(
+            file_path,
+            'mongo',
+            map(lambda x: (x.name, encode_schema_cache_record(x.serialize())), metadata.tables),
+            schema=metadata.schema
+        )
 
-        with open(file_path, 'w') as file:
-            json.dump(metadata.serialize(), file, cls=MetadataJSONEncoder)
+        set_schema_cache_fingerprint(metadata, fingerprint)
 
         logger.info('[{}] Saved schema cache for "{}"'.format(id_short, connection_name))
 
@@ -35,13 +40,6 @@ def mongo_dump_metadata_file(conf, metadata):
         logger.error('[{}] Failed dumping schema cache for "{}"'.format(id_short, connection_name), exc_info=e)
 
 
-class MetadataJSONEncoder(json.JSONEncoder):
-    def default(self, obj):
-        if isinstance(obj, set):
-            return list(obj)
-        return super(MetadataJSONEncoder, self).default(obj)
-
-
 def mongo_load_metadata_file(conf):
     if not settings.CACHE_METADATA:
         return
@@ -58,9 +56,21 @@ def mongo_load_metadata_file(conf):
         return
 
     try:
-        with open(file_path, 'r') as file:
-            data = json.load(file)
-            metadata = MongoMetadata.deserialize(data)
+        reader = SchemaCacheReader(file_path, 'mongo')
+    except SchemaCacheFormatError as e:
+        logger.info('[{}] Schema cache is outdated for "{}": {}'.format(id_short, connection_name, e))
+        return
+    except Exception as e:
+        logger.error('[{}] Failed loading schema cache for "{}"'.format(id_short, connection_name), exc_info=e)
+        return
+
+    try:
+        metadata = MongoMetadata(schema=reader.header.get('schema'))
+
+        for key in reader.get_keys():
+            metadata.append_table(MongoTable.deserialize(reader.read_record(key)))
+
+        set_schema_cache_fingerprint(metadata, reader.header.get('fingerprint'))
 
         return {
             'file_path': file_path,
@@ -68,3 +78,5 @@ def mongo_load_metadata_file(conf):
         }
     except Exception as e:
         logger.error('[{}] Failed loading schema cache for "{}"'.format(id_short, connection_name), exc_info=e)
+    finally:
+        reader.close()
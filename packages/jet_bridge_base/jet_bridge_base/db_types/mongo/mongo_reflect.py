@@ -1,4 +1,5 @@
-import time
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from datetime import date
 from bson import ObjectId
 
@@ -10,13 +11,128 @@ from .mongo_column import MongoColumn
 from .mongo_table import MongoTable
 from .mongo_metadata import MongoMetadata
 
+MONGO_REFLECT_BATCH_SIZE = 1000
+
+
+def get_mongo_value_type(value):
+    field_params = None
+
+    if isinstance(value, bool):
+        field_type = data_types.BOOLEAN
+    elif isinstance(value, int):
+        field_type = data_types.INTEGER
+    elif isinstance(value, str):
+        # field_type = data_types.TEXT
+        field_type = data_types.CHAR
+    elif isinstance(value, float):
+        field_type = data_types.FLOAT
+    elif isinstance(value, date):
+        field_type = data_types.DATE_TIME
+    elif isinstance(value, dict):
+        field_type = data_types.JSON
+    elif isinstance(value, list):
+        field_type = data_types.JSON
+    elif isinstance(value, ObjectId) or type(value) is ObjectId:
+        field_type = data_types.BINARY
+        field_params = {'type': 'object_id'}
+    else:
+        field_type = data_types.TEXT
+
+    return field_type, field_params
+
+
+def get_mongo_collection_documents(cid_short, db, name, max_read_records=None, sample=False):
+    collection = db[name]
+
+    if sample and max_read_records is not None:
+        try:
+            total = collection.estimated_document_count()
+        except Exception:
+            # Views do not support count estimation
+            total = None
+
+        if total is not None and total > max_read_records:
+            logger.info('[{}] Collection "{}" has ~{} documents, analyzing random sample of {}'.format(
+                cid_short,
+                name,
+                total,
+                max_read_records
+            ))
+
+            return collection.aggregate(
+                [{'$sample': {'size': max_read_records}}],
+                allowDiskUse=True,
+                batchSize=MONGO_REFLECT_BATCH_SIZE
+            )
+
+    # Single cursor instead of skip based pages, documents are streamed in batches
+    return collection.find(limit=max_read_records or 0, batch_size=MONGO_REFLECT_BATCH_SIZE)
+
+
+def reflect_mongodb_collection(cid_short, db, name, max_read_records=None, sample=False):
+    table = MongoTable(name)
+    has_items = False
+
+    for item in get_mongo_collection_documents(cid_short, db, name, max_read_records, sample):
+        has_items = True
+
+        for key, value in item.items():
+            if key in table.columns:
+                column = table.columns[key]
+            else:
+                column = MongoColumn(table, key, None)
+                table.append_column(column)
+
+            if value is None:
+                column.null_count += 1
+                continue
+
+            field_type, field_params = get_mongo_value_type(value)
+
+            column.type_stats[field_type] = column.type_stats.get(field_type, 0) + 1
+
+            if column.type and column.type != field_type:
+                column.mixed_types = column.mixed_types or set()
+                column.mixed_types.add(column.type)
+                column.mixed_types.add(field_type)
+
+            column.type = field_type
+
+            if field_params:
+                column.params = field_params
+
+    if not has_items:
+        logger.info('[{}] Collection "{}" does not have any data to analyze, skipping'.format(
+            cid_short,
+            name
+        ))
+        return
+
+    for column in table.columns:
+        if column.type is None:
+            column.type = data_types.CHAR
+
+        if column.mixed_types:
+            column.type = data_types.JSON
+
+            logger.info('[{}] Field "{}"."{}" has data stored in multiple types ({}), falling back to JSON'.format(
+                cid_short,
+                name,
+                column.name,
+                ','.join(map(lambda x: '{}:{}'.format(x[0], x[1]), column.type_stats.items()))
+            ))
+
+    return table
+
 
 def reflect_mongodb(
     cid_short,
     db,
     only=None,
     pending_connection=None,
-    max_read_records=None
+    max_read_records=None,
+    sample=False,
+    threads=None
 ):
     available = db.list_collection_names()
 
@@ -32,105 +148,30 @@ def reflect_mongodb(
     if pending_connection:
         pending_connection['tables_total'] = len(load)
 
-    i = 0
-    for name in load:
-        # Wait to allow other threads execution
-        time.sleep(0.01)
-
-        logger.info('[{}] Analyzing collection "{}" ({} / {})" (Mem:{})...'.format(
-            cid_short, name, i + 1, len(load), get_memory_usage_human())
-        )
-
-        page = 1
-        limit = 10000
-        table = MongoTable(name)
-
-        while True:
-            skip = (page - 1) * limit
-            query_page = page
-            items = db[name].find(skip=skip, limit=limit)
-            has_items = False
-
-            for item in items:
-                has_items = True
-
-                for key, value in item.items():
-                    if value is None and key in table.columns:
-                        continue
-
-                    field_type = None
-                    field_params = None
-
-                    if value is None and key not in table.columns:
-                        # field_type = None
-                        pass
-                    if isinstance(value, bool):
-                        field_type = data_types.BOOLEAN
-                    elif isinstance(value, int):
-                        field_type = data_types.INTEGER
-                    elif isinstance(value, str):
-                        # field_type = data_types.TEXT
-                        field_type = data_types.CHAR
-                    elif isinstance(value, float):
-                        field_type = data_types.FLOAT
-                    elif isinstance(value, date):
-                        field_type = data_types.DATE_TIME
-                    elif isinstance(value, dict):
-                        field_type = data_types.JSON
-                    elif isinstance(value, list):
-                        field_type = data_types.JSON
-                    elif isinstance(value, ObjectId) or type(value) is ObjectId:
-                        field_type = data_types.BINARY
-                        field_params = {'type': 'object_id'}
-                    else:
-                        field_type = data_types.TEXT
-
-                    if key in table.columns:
-                        column = table.columns[key]
-                    else:
-                        column = MongoColumn(table, key, None)
-                        table.append_column(column)
-
-                    if column.type and column.type != field_type:
-                        column.mixed_types = column.mixed_types or set()
-                        column.mixed_types.add(column.type)
-                        column.mixed_types.add(field_type)
-
-                    column.type = field_type
-
-                    if field_params:
-                        column.params = field_params
-
-            if has_items and (max_read_records is None or skip + limit < max_read_records):
-                page += 1
-            else:
-                break
+    progress_lock = threading.Lock()
+    progress = {'processed': 0}
 
-        if query_page == 1 and not has_items:
-            logger.info('[{}] Collection "{}" does not have any data to analyze, skipping'.format(
-                cid_short,
-                name
-            ))
-        else:
-            for column in table.columns:
-                if column.type is None:
-                    column.type = data_types.CHAR
+    def reflect_collection(name):
+        try:
+            return reflect_mongodb_collection(cid_short, db, name, max_read_records, sample)
+        finally:
+            with progress_lock:
+                progress['processed'] += 1
 
-                if column.mixed_types:
-                    column.type = data_types.JSON
+                logger.info('[{}] Analyzed collection "{}" ({} / {})" (Mem:{})'.format(
+                    cid_short, name, progress['processed'], len(load), get_memory_usage_human())
+                )
 
-                    logger.info('[{}] Field "{}"."{}" has data stored in multiple types ({}), falling back to JSON'.format(
-                        cid_short,
-                        name,
-                        column.name,
-                        ','.join(column.mixed_types)
-                    ))
+                if pending_connection:
+                    pending_connection['tables_processed'] = progress['processed']
 
-            metadata.append_table(table)
+    threads = min(max(threads or 1, 1), max(len(load), 1))
 
-        i += 1
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        tables = list(executor.map(reflect_collection, load))
 
-        if pending_connection:
-            pending_connection['tables_processed'] = i
+    for table in tables:
+        if table is not None:
+            metadata.append_table(table)
 
     return metadata
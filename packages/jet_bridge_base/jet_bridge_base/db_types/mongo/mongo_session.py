@@ -1,46 +1,147 @@
+import contextlib
+
+from pymongo import InsertOne, UpdateOne, DeleteOne
+from pymongo.errors import BulkWriteError
+
 from .mongo_queryset import MongoQueryset
 from .mongo_column import MongoColumn
 from .mongo_declarative_meta import MongoDeclarativeMeta
 
 
+class MongoBulkWriteError(Exception):
+    def __init__(self, errors):
+        self.errors = errors
+        super(MongoBulkWriteError, self).__init__(errors[0][1] if len(errors) else 'Bulk write failed')
+
+    def get_record_error(self, record):
+        for error_record, error in self.errors:
+            if error_record is record:
+                return error
+
+
 class MongoSession(object):
     info = None
     records = None
 
-    def __init__(self, db):
+    def __init__(self, db, bulk_size=None, ordered=True):
         self.db = db
         self.info = dict()
         self.records = list()
+        self.bulk_size = bulk_size
+        self.ordered = ordered
+        self.commit_deferred = False
+
+    @contextlib.contextmanager
+    def defer_commit(self):
+        # commit() calls are ignored inside, pending records should be committed explicitly afterwards
+        self.commit_deferred = True
+        try:
+            yield
+        finally:
+            self.commit_deferred = False
+
+    def get_record_operation(self, record):
+        update_pending = record.get_update_pending()
+
+        if record.is_delete_pending() and not record.is_create_pending():
+            return DeleteOne({'_id': record._id}), None
+        elif record.is_create_pending():
+            record_data = record.get_data()
+            data = {}
+
+            for key, value in record_data.items():
+                if key == '_id':
+                    continue
+                data[key] = value
+
+            # Document gets "_id" generated client side when added to bulk
+            return InsertOne(data), data
+        elif len(update_pending):
+            record_data = record.get_data()
+            data = {}
+
+            for key, value in record_data.items():
+                if key not in update_pending:
+                    continue
+                data[key] = value
+
+            return UpdateOne({'_id': record._id}, {'$set': data}), None
+        else:
+            return None, None
+
+    def get_operations_batches(self, ordered):
+        batches = []
+        collections_batches = {}
 
-    def commit(self):
         for record in self.records:
+            operation, document = self.get_record_operation(record)
+
+            if operation is None:
+                continue
+
             name = record.get_meta().table_name
-            update_pending = record.get_update_pending()
 
-            if record.is_delete_pending() and not record.is_create_pending():
-                self.db[name].delete_one({'_id': record._id})
-            elif record.is_create_pending():
-                record_data = record.get_data()
-                data = {}
+            if ordered:
+                # Only consecutive operations on the same collection can be sent together to keep order
+                batch = batches[-1] if len(batches) and batches[-1][0] == name else None
+            else:
+                batch = collections_batches.get(name)
 
-                for key, value in record_data.items():
-                    if key == '_id':
-                        continue
-                    data[key] = value
+            if batch is None or (self.bulk_size and len(batch[1]) >= self.bulk_size):
+                batch = (name, [])
+                batches.append(batch)
+                collections_batches[name] = batch
 
-                self.db[name].insert_one(data)
-            elif len(update_pending):
-                record_data = record.get_data()
-                data = {}
+            batch[1].append((record, operation, document))
 
-                for key, value in record_data.items():
-                    if key not in update_pending:
-                        continue
-                    data[key] = value
+        return batches
 
-                self.db[name].update_one({'_id': record._id}, {'$set': data})
+    def commit(self, ordered=None):
+        if self.commit_deferred:
+            return
 
-            record.clear_pending()
+        if ordered is None:
+            ordered = self.ordered
+
+        errors = []
+
+        try:
+            batches = self.get_operations_batches(ordered)
+
+            for i, (name, operations) in enumerate(batches):
+                executed = len(operations)
+                failed = set()
+
+                try:
+                    self.db[name].bulk_write(list(map(lambda x: x[1], operations)), ordered=ordered)
+                except BulkWriteError as e:
+                    write_errors = e.details.get('writeErrors', [])
+                    failed = set(map(lambda x: x['index'], write_errors))
+
+                    for error in write_errors:
+                        errors.append((operations[error['index']][0], error.get('errmsg')))
+
+                    if ordered and len(failed):
+                        # Ordered bulk stops on first error
+                        executed = min(failed)
+                        not_executed = operations[executed + 1:]
+                        not_executed += [x for _, batch_operations in batches[i + 1:] for x in batch_operations]
+
+                        for record, _, _ in not_executed:
+                            errors.append((record, 'Not executed because of previous error'))
+
+                for index, (record, operation, document) in enumerate(operations[:executed]):
+                    if document is not None and index not in failed:
+                        record.get_data()['_id'] = document['_id']
+
+                if ordered and len(errors):
+                    break
+        finally:
+            for record in self.records:
+                record.clear_pending()
+
+        if len(errors):
+            raise MongoBulkWriteError(errors)
 
     def rollback(self):
         self.clear()
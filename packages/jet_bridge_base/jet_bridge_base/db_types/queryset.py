@@ -1,7 +1,6 @@
 import pymongo
 import sqlalchemy
 from sqlalchemy import desc, sql, func, or_, cast
-from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.orm import DeclarativeMeta
 from sqlalchemy.sql import operators, sqltypes, text
 from sqlalchemy.sql.elements import AnnotatedColumnElement, UnaryExpression
@@ -73,55 +72,6 @@ def apply_default_ordering(Model, queryset):
     return queryset
 
 
-def queryset_count_optimized_for_postgresql(session, db_table):
-    try:
-        cursor = session.execute(text('SELECT reltuples FROM pg_class WHERE relname = :db_table'), {'db_table': db_table})
-        row = cursor.fetchone()
-        return int(row[0])
-    except SQLAlchemyError:
-        session.rollback()
-        raise
-
-
-def queryset_count_optimized_for_mysql(session, db_table):
-    try:
-        cursor = session.execute(text('EXPLAIN SELECT COUNT(*) FROM `{}`'.format(db_table)))
-        row = cursor.fetchone()
-        return int(row[8])
-    except SQLAlchemyError:
-        session.rollback()
-        raise
-
-
-def queryset_count_optimized(session, queryset):
-    queryset = queryset.order_by(None)
-
-    if queryset.whereclause is None:
-        count_optimized = None
-
-        if isinstance(queryset, MongoQueryset):
-            count_optimized = queryset.estimated_document_count()
-        else:
-            try:
-                table = queryset.statement.froms[0].name
-
-                if get_session_engine(queryset.session) == 'postgresql':
-                    count_optimized = queryset_count_optimized_for_postgresql(session, table)
-                elif get_session_engine(queryset.session) == 'mysql':
-                    count_optimized = queryset_count_optimized_for_mysql(session, table)
-            except:
-                pass
-
-        if count_optimized is not None and count_optimized >= 10000:
-            return count_optimized
-
-    try:
-        return queryset.count()
-    except SQLAlchemyError:
-        queryset.session.rollback()
-        raise
-
-
 def get_sql_aggregate_func_by_name(name, column):
     if name == 'count':
         return func.count(column)
@@ -0,0 +1,8 @@
+def apply_session_rls(session, rls_key):
+    if rls_key is None:
+        return
+
+    _, user_id = rls_key
+
+    session.execute('SET ROLE authenticated')
+    session.execute('SELECT set_config(\'request.jwt.claim.sub\', :uid, TRUE)', {'uid': user_id})
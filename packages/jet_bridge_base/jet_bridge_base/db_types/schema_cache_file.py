@@ -0,0 +1,138 @@
+import hashlib
+import json
+import os
+import threading
+
+SCHEMA_CACHE_FORMAT = 'jet_schema_cache'
+SCHEMA_CACHE_VERSION = 2
+SCHEMA_CACHE_FINGERPRINT_ATTR = '__jet_schema_cache_fingerprint__'
+
+
+class SchemaCacheFormatError(Exception):
+    pass
+
+
+class SchemaCacheJSONEncoder(json.JSONEncoder):
+    def default(self, obj):
+        if isinstance(obj, set):
+            return list(obj)
+        return super(SchemaCacheJSONEncoder, self).default(obj)
+
+
+def encode_schema_cache_record(record):
+    return json.dumps(record, cls=SchemaCacheJSONEncoder, separators=(',', ':')).encode('utf-8')
+
+
+def get_schema_cache_fingerprint(metadata):
+    return getattr(metadata, SCHEMA_CACHE_FINGERPRINT_ATTR, None)
+
+
+def set_schema_cache_fingerprint(metadata, fingerprint):
+    # Fingerprint of schema cache file metadata was loaded from or dumped to, None when metadata is not in sync with it
+    setattr(metadata, SCHEMA_CACHE_FINGERPRINT_ATTR, fingerprint)
+
+
+def write_schema_cache_file(file_path, engine_type, records, **meta):
+    """
+    Schema cache file layout:
+
+    - first line: JSON header with format version and index of table records (key, offset, length)
+    - following bytes: JSON records, one per table, read only when table is accessed
+
+    `records` is an iterable of (key, record bytes).
+    Returns file fingerprint, hash of records and meta stored in header.
+    """
+
+    data = []
+    index = []
+    offset = 0
+    fingerprint = hashlib.sha256()
+
+    for key, record in records:
+        index.append([key, offset, len(record)])
+        data.append(record)
+        offset += len(record)
+        fingerprint.update(record)
+
+    fingerprint.update(encode_schema_cache_record([engine_type, index, meta]))
+
+    header = {
+        'format': SCHEMA_CACHE_FORMAT,
+        'version': SCHEMA_CACHE_VERSION,
+        'type': engine_type,
+        'index': index,
+        'fingerprint': fingerprint.hexdigest(),
+        **meta
+    }
+
+    dir_path = os.path.dirname(file_path)
+
+    if dir_path and not os.path.exists(dir_path):
+        os.makedirs(dir_path)
+
+    # File is replaced atomically so open readers keep reading previous version
+    temp_file_path = '{}.tmp{}'.format(file_path, threading.get_ident())
+
+    with open(temp_file_path, 'wb') as file:
+        file.write(encode_schema_cache_record(header))
+        file.write(b'\n')
+
+        for record in data:
+            file.write(record)
+
+    os.replace(temp_file_path, file_path)
+
+    return header['fingerprint']
+
+
+class SchemaCacheReader(object):
+    def __init__(self, file_path, engine_type):
+        self.file_path = file_path
+        self.lock = threading.Lock()
+        self.file = open(file_path, 'rb')
+
+        try:
+            header_line = self.file.readline()
+
+            try:
+                header = json.loads(header_line.decode('utf-8'))
+            except ValueError:
+                raise SchemaCacheFormatError('Unknown schema cache format')
+
+            if not isinstance(header, dict) or header.get('format') != SCHEMA_CACHE_FORMAT:
+                raise SchemaCacheFormatError('Unknown schema cache format')
+            elif header.get('version') != SCHEMA_CACHE_VERSION:
+                raise SchemaCacheFormatError('Unsupported schema cache version: {}'.format(header.get('version')))
+            elif header.get('type') != engine_type:
+                raise SchemaCacheFormatError('Schema cache is created for another database type')
+        except Exception:
+            self.close()
+            raise
+
+        self.header = header
+        self.data_offset = len(header_line)
+        self.index = dict(map(lambda x: (x[0], (x[1], x[2])), header['index']))
+        self.keys = list(map(lambda x: x[0], header['index']))
+
+    def get_keys(self):
+        return list(self.keys)
+
+    def read_record_raw(self, key):
+        offset, length = self.index[key]
+
+        with self.lock:
+            self.file.seek(self.data_offset + offset)
+            return self.file.read(length)
+
+    def read_record(self, key):
+        return json.loads(self.read_record_raw(key).decode('utf-8'))
+
+    def close(self):
+        if not self.file.closed:
+            self.file.close()
+
+    def __del__(self):
+        try:
+            self.close()
+        except Exception:
+            pass
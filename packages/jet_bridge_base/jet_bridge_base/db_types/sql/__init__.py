@@ -1,5 +1,7 @@
 from .common import sql_inspect, sql_get_session_engine
-from .sql_reflect import sql_get_tables, sql_reflect
+from .sql_reflect import sql_get_tables, sql_reflect, sql_get_table_fingerprint, TABLE_FINGERPRINT_KEY
 from .sql_db import sql_init_database_connection, sql_build_engine_url, sql_create_connection_engine, sql_load_mapped_base, sql_load_database_table
+from .sql_refresh import sql_refresh_mapped_base
+from .sql_mapped_base import sql_get_loaded_classes, sql_is_lazy_mapped_base, sql_remap_mapped_base
 from .sql_metadata_file import sql_dump_metadata_file, sql_load_metadata_file
 from .timezones import sql_fetch_default_timezone
@@ -6,12 +6,14 @@ from six.moves.urllib_parse import parse_qsl, quote_plus
 from sqlalchemy import MetaData, create_engine
 from sqlalchemy.orm import sessionmaker, scoped_session
 
+from jet_bridge_base import settings
 from jet_bridge_base.automap import automap_base
 from jet_bridge_base.utils.conf import get_connection_only_predicate
 from jet_bridge_base.utils.process import get_memory_usage_human, get_memory_usage
-from jet_bridge_base.utils.tables import get_table_name
 from jet_bridge_base.logger import logger
 
+from .sql_mapped_base import sql_classname_for_table, sql_name_for_scalar_relationship, \
+    sql_name_for_collection_relationship, sql_setup_lazy_mapped_base, sql_is_lazy_mapped_base
 from .sql_metadata_file import sql_load_metadata_file, sql_dump_metadata_file
 from .sql_reflect import sql_reflect
 from .timezones import sql_fetch_default_timezone
@@ -72,12 +74,17 @@ def sql_init_database_connection(conf, tunnel, id_short, connection_name, schema
         logger.info('[{}] Connected to "{}" (Mem:{})'.format(id_short, connection_name, get_memory_usage_human()))
 
         MappedBase = automap_base(metadata=metadata)
-        sql_load_mapped_base(MappedBase)
 
-        for table_name, table in MappedBase.metadata.tables.items():
-            if len(table.primary_key.columns) == 0 and table_name not in MappedBase.classes:
-                logger.warning(
-                    '[{}] Table "{}" does not have primary key and will be ignored'.format(id_short, table_name))
+        if settings.DATABASE_LAZY_MAPPING:
+            # Models are mapped on first lookup
+            sql_setup_lazy_mapped_base(MappedBase, id_short)
+        else:
+            sql_load_mapped_base(MappedBase)
+
+            for table_name, table in MappedBase.metadata.tables.items():
+                if len(table.primary_key.columns) == 0 and table_name not in MappedBase.classes:
+                    logger.warning(
+                        '[{}] Table "{}" does not have primary key and will be ignored'.format(id_short, table_name))
 
         result = {
             'engine': engine,
@@ -276,43 +283,17 @@ def sql_create_connection_engine(conf, tunnel):
 
 
 def sql_load_mapped_base(MappedBase, clear=False):
-    def classname_for_table(base, tablename, table):
-        return get_table_name(MappedBase.metadata, table)
-
-    def name_for_scalar_relationship(base, local_cls, referred_cls, constraint):
-        foreign_key = constraint.elements[0] if len(constraint.elements) else None
-        if foreign_key:
-            name = '__'.join([foreign_key.parent.name, 'to', foreign_key.column.table.name, foreign_key.column.name])
-        else:
-            name = referred_cls.__name__.lower()
-
-        if name in constraint.parent.columns:
-            name = name + '_relation'
-            logger.warning('Already detected column name, using {}'.format(name))
-
-        return name
-
-    def name_for_collection_relationship(base, local_cls, referred_cls, constraint):
-        foreign_key = constraint.elements[0] if len(constraint.elements) else None
-        if foreign_key:
-            name = '__'.join([foreign_key.parent.table.name, foreign_key.parent.name, 'to', foreign_key.column.name])
-        else:
-            name = referred_cls.__name__.lower()
-
-        if name in constraint.parent.columns:
-            name = name + '_relation'
-            logger.warning('Already detected column name, using {}'.format(name))
-
-        return name
-
     if clear:
         MappedBase.registry.dispose()
         MappedBase.classes.clear()
 
+    if sql_is_lazy_mapped_base(MappedBase):
+        return
+
     MappedBase.prepare(
-        classname_for_table=classname_for_table,
-        name_for_scalar_relationship=name_for_scalar_relationship,
-        name_for_collection_relationship=name_for_collection_relationship
+        classname_for_table=sql_classname_for_table,
+        name_for_scalar_relationship=sql_name_for_scalar_relationship,
+        name_for_collection_relationship=sql_name_for_collection_relationship
     )
 
 
@@ -0,0 +1,403 @@
+import threading
+import warnings
+
+from sqlalchemy import util, exc
+from sqlalchemy.orm import relationship, backref, Mapper, clsregistry
+from sqlalchemy.orm.decl_base import _DeferredMapperConfig
+
+from jet_bridge_base.logger import logger
+from jet_bridge_base.utils.tables import get_table_name
+
+from .sql_metadata_file import sql_get_metadata_foreign_table_keys
+from .sql_metadata_serializer import sql_get_table_foreign_table_keys
+
+
+def sql_classname_for_table(base, tablename, table):
+    return get_table_name(base.metadata, table)
+
+
+def sql_name_for_scalar_relationship(base, local_cls, referred_cls, constraint):
+    foreign_key = constraint.elements[0] if len(constraint.elements) else None
+    if foreign_key:
+        name = '__'.join([foreign_key.parent.name, 'to', foreign_key.column.table.name, foreign_key.column.name])
+    else:
+        name = referred_cls.__name__.lower()
+
+    if name in constraint.parent.columns:
+        name = name + '_relation'
+        logger.warning('Already detected column name, using {}'.format(name))
+
+    return name
+
+
+def sql_name_for_collection_relationship(base, local_cls, referred_cls, constraint):
+    foreign_key = constraint.elements[0] if len(constraint.elements) else None
+    if foreign_key:
+        name = '__'.join([foreign_key.parent.table.name, foreign_key.parent.name, 'to', foreign_key.column.name])
+    else:
+        name = referred_cls.__name__.lower()
+
+    if name in constraint.parent.columns:
+        name = name + '_relation'
+        logger.warning('Already detected column name, using {}'.format(name))
+
+    return name
+
+
+class SqlLazyClasses(dict):
+    """
+    MappedBase.classes storage which maps table to model class on first lookup.
+
+    Model is returned only after relationships with all tables referenced by it and referencing it are generated,
+    related tables are mapped as well but generate their other relationships only when looked up themselves.
+    Iterating over classes maps all tables. Association tables are mapped as regular classes without many-to-many
+    relationships, the same way patched automap does for eager mapping.
+    """
+
+    def __init__(self, base, id_short):
+        super(SqlLazyClasses, self).__init__()
+        self.base = base
+        self.id_short = id_short
+        self.lock = threading.RLock()
+        self.completed = set()
+        self.constraints = set()
+        self.referencing_tables = None
+
+    def reset(self):
+        with self.lock:
+            dict.clear(self)
+            self.completed = set()
+            self.constraints = set()
+            self.referencing_tables = None
+
+    def get_table_key(self, name):
+        tables = self.base.metadata.tables
+        schema = self.base.metadata.schema
+
+        if schema:
+            key = '{}.{}'.format(schema, name)
+            if key in tables:
+                return key
+
+        if name in tables:
+            return name
+
+    def get_class_name(self, key):
+        schema = self.base.metadata.schema
+
+        if schema and key.startswith('{}.'.format(schema)):
+            return key[len(schema) + 1:]
+        else:
+            return key
+
+    def get_referencing_tables(self, key):
+        if self.referencing_tables is None:
+            referencing_tables = {}
+
+            for table_key, foreign_table_keys in sql_get_metadata_foreign_table_keys(self.base.metadata).items():
+                for foreign_table_key in foreign_table_keys:
+                    foreign_table_key = self.get_table_key(foreign_table_key)
+                    if foreign_table_key is None:
+                        continue
+                    referencing_tables.setdefault(foreign_table_key, []).append(table_key)
+
+            self.referencing_tables = referencing_tables
+
+        return self.referencing_tables.get(key, [])
+
+    def get_table_class_name(self, table):
+        return sql_classname_for_table(self.base, table.name, table)
+
+    def get_class_related_names(self, cls):
+        return set(map(
+            lambda x: self.get_table_class_name(x.mapper.local_table),
+            cls.__mapper__.relationships
+        ))
+
+    def is_constraint_related(self, constraint, names):
+        if self.get_table_class_name(constraint.table) in names:
+            return True
+
+        try:
+            referred_table = constraint.referred_table
+        except exc.SQLAlchemyError:
+            return True
+
+        return self.get_table_class_name(referred_table) in names
+
+    def is_stale_property(self, mapper, name):
+        # Relationship with class replaced by remap()
+        if not mapper.has_property(name):
+            return False
+
+        target = getattr(mapper.get_property(name, _configure_mappers=False), 'argument', None)
+        if isinstance(target, Mapper):
+            target = target.class_
+        if not isinstance(target, type) or getattr(target, '__table__', None) is None:
+            return False
+
+        return dict.get(self, self.get_table_class_name(target.__table__)) is not target
+
+    def map_table(self, table):
+        name = sql_classname_for_table(self.base, table.name, table)
+
+        if dict.__contains__(self, name):
+            return dict.__getitem__(self, name)
+        elif not table.primary_key:
+            return
+
+        cls = type(name, (self.base,), {'__table__': table})
+        _DeferredMapperConfig.config_for_cls(cls).map()
+        dict.__setitem__(self, name, cls)
+
+        return cls
+
+    def generate_relationships(self, constraint):
+        if constraint in self.constraints:
+            return
+
+        self.constraints.add(constraint)
+
+        fks = constraint.elements
+        local_cls = self.map_table(constraint.table)
+        referred_cls = self.map_table(fks[0].column.table)
+
+        if local_cls is None or referred_cls is None:
+            return
+        elif local_cls is not referred_cls and issubclass(local_cls, referred_cls):
+            return
+
+        # Same relationships as automap prepare() generates
+        relationship_name = sql_name_for_scalar_relationship(self.base, local_cls, referred_cls, constraint)
+        backref_name = sql_name_for_collection_relationship(self.base, referred_cls, local_cls, constraint)
+
+        local_mapper = local_cls.__mapper__
+        referred_mapper = referred_cls.__mapper__
+
+        o2m_kws = {}
+        nullable = False not in {fk.parent.nullable for fk in fks}
+        if not nullable:
+            o2m_kws['cascade'] = 'all, delete-orphan'
+
+            if constraint.ondelete and constraint.ondelete.lower() == 'cascade':
+                o2m_kws['passive_deletes'] = True
+        else:
+            if constraint.ondelete and constraint.ondelete.lower() == 'set null':
+                o2m_kws['passive_deletes'] = True
+
+        if self.is_stale_property(local_mapper, relationship_name) \
+                or self.is_stale_property(referred_mapper, backref_name):
+            # Properties can't be removed from mapper, both sides are replaced to point to current classes
+            with warnings.catch_warnings():
+                warnings.simplefilter('ignore', category=exc.SAWarning)
+
+                local_mapper.add_property(relationship_name, relationship(
+                    referred_cls,
+                    foreign_keys=[fk.parent for fk in fks],
+                    remote_side=[fk.column for fk in fks]
+                ))
+                referred_mapper.add_property(backref_name, relationship(
+                    local_cls,
+                    foreign_keys=[fk.parent for fk in fks],
+                    collection_class=list,
+                    back_populates=relationship_name,
+                    **o2m_kws
+                ))
+            return
+
+        create_backref = not referred_mapper.has_property(backref_name)
+
+        if not local_mapper.has_property(relationship_name):
+            local_mapper.add_property(relationship_name, relationship(
+                referred_cls,
+                foreign_keys=[fk.parent for fk in fks],
+                backref=backref(backref_name, collection_class=list, **o2m_kws) if create_backref else None,
+                remote_side=[fk.column for fk in fks]
+            ))
+        elif create_backref:
+            referred_mapper.add_property(backref_name, relationship(
+                local_cls,
+                foreign_keys=[fk.parent for fk in fks],
+                collection_class=list,
+                **o2m_kws
+            ))
+
+    def load(self, name):
+        with self.lock:
+            if name in self.completed:
+                return dict.get(self, name)
+
+            key = self.get_table_key(name)
+            if key is None:
+                return
+
+            tables = self.base.metadata.tables
+            table = tables.get(key)
+            if table is None:
+                return
+
+            cls = self.map_table(table)
+
+            if cls is None:
+                self.completed.add(name)
+                logger.warning(
+                    '[{}] Table "{}" does not have primary key and will be ignored'.format(self.id_short, name))
+                return
+
+            constraints = list(table.foreign_key_constraints)
+
+            for referencing_key in self.get_referencing_tables(key):
+                referencing_table = tables.get(referencing_key)
+                if referencing_table is None:
+                    continue
+
+                for constraint in referencing_table.foreign_key_constraints:
+                    if constraint.referred_table is table:
+                        constraints.append(constraint)
+
+            for constraint in constraints:
+                self.generate_relationships(constraint)
+
+            self.completed.add(name)
+
+            return cls
+
+    def populate(self, classes):
+        # Classes mapped by automap prepare() with all their relationships generated
+        with self.lock:
+            self.reset()
+            dict.update(self, classes)
+            self.completed = set(map(lambda x: self.get_class_name(x), self.base.metadata.tables.keys()))
+
+            for cls in classes.values():
+                self.constraints.update(cls.__table__.foreign_key_constraints)
+
+    def remap(self, names):
+        """
+        Maps changed or removed tables again after their metadata was reflected. Tables related to them before
+        or after change get new classes as well, other classes with relationships to replaced ones regenerate
+        them on next lookup. Returns names of replaced classes.
+        """
+
+        with self.lock:
+            tables = self.base.metadata.tables
+            self.referencing_tables = None
+            remapped = set(names)
+
+            for name in names:
+                cls = dict.get(self, name)
+                if cls is not None:
+                    remapped.update(self.get_class_related_names(cls))
+
+                key = self.get_table_key(name)
+                if key is None:
+                    continue
+
+                table = tables.get(key)
+                if table is not None:
+                    for foreign_table_key in sql_get_table_foreign_table_keys(table):
+                        foreign_table_key = self.get_table_key(foreign_table_key)
+                        if foreign_table_key is not None:
+                            remapped.add(self.get_class_name(foreign_table_key))
+
+                for referencing_key in self.get_referencing_tables(key):
+                    remapped.add(self.get_class_name(referencing_key))
+
+            related = set()
+
+            for name in remapped:
+                cls = dict.pop(self, name, None)
+                self.completed.discard(name)
+
+                if cls is not None:
+                    related.update(self.get_class_related_names(cls))
+                    # Replaced class is kept by mapper registry, but should not be looked up by name
+                    clsregistry.remove_class(cls.__name__, cls, self.base.registry._class_registry)
+
+            for name in related - remapped:
+                self.completed.discard(name)
+
+            self.constraints = set(filter(lambda x: not self.is_constraint_related(x, remapped), self.constraints))
+
+            return remapped
+
+    def load_all(self):
+        for key in list(self.base.metadata.tables.keys()):
+            self.load(self.get_class_name(key))
+
+    def get_loaded(self):
+        with self.lock:
+            return list(map(lambda x: dict.__getitem__(self, x), filter(lambda x: dict.__contains__(self, x), self.completed)))
+
+    def __getitem__(self, name):
+        cls = self.load(name)
+        if cls is None:
+            raise KeyError(name)
+        return cls
+
+    def __contains__(self, name):
+        return self.load(name) is not None
+
+    def get(self, name, default=None):
+        cls = self.load(name)
+        return cls if cls is not None else default
+
+    def __iter__(self):
+        self.load_all()
+        return dict.__iter__(self)
+
+    def __len__(self):
+        self.load_all()
+        return dict.__len__(self)
+
+    def keys(self):
+        self.load_all()
+        return dict.keys(self)
+
+    def values(self):
+        self.load_all()
+        return dict.values(self)
+
+    def items(self):
+        self.load_all()
+        return dict.items(self)
+
+    def clear(self):
+        self.reset()
+
+    def __repr__(self):
+        return 'SqlLazyClasses(mapped={}, loaded={})'.format(dict.__len__(self), len(self.completed))
+
+
+def sql_setup_lazy_mapped_base(MappedBase, id_short):
+    MappedBase.classes = util.Properties(SqlLazyClasses(MappedBase, id_short))
+
+
+def sql_is_lazy_mapped_base(MappedBase):
+    return isinstance(MappedBase.classes._data, SqlLazyClasses)
+
+
+def sql_remap_mapped_base(MappedBase, names):
+    """
+    Maps only changed tables and tables related to them instead of reloading all classes.
+    """
+
+    if sql_is_lazy_mapped_base(MappedBase):
+        return MappedBase.classes._data.remap(names)
+
+    classes = SqlLazyClasses(MappedBase, None)
+    classes.populate(MappedBase.classes._data)
+    remapped = classes.remap(names)
+    classes.load_all()
+
+    MappedBase.classes._data.clear()
+    MappedBase.classes._data.update(dict.items(classes))
+
+    return remapped
+
+
+def sql_get_loaded_classes(MappedBase):
+    if sql_is_lazy_mapped_base(MappedBase):
+        return MappedBase.classes._data.get_loaded()
+    else:
+        return list(MappedBase.classes)
@@ -1,10 +1,178 @@
 import os
-import pickle
+import threading
+from collections import OrderedDict
+
+import sqlalchemy
+from sqlalchemy import MetaData, util
 
 from jet_bridge_base import settings
 from jet_bridge_base.logger import logger
 from jet_bridge_base.utils.conf import get_connection_id, get_connection_schema, get_connection_name, get_metadata_file_path
 
+from ..schema_cache_file import SchemaCacheReader, SchemaCacheFormatError, write_schema_cache_file, \
+    encode_schema_cache_record, set_schema_cache_fingerprint
+from .sql_metadata_serializer import sql_serialize_table, sql_deserialize_table, sql_get_table_foreign_table_keys, \
+    sql_get_record_foreign_table_keys
+from .sql_reflect import sql_reflect
+
+
+class SqlLazyTables(util.FacadeDict):
+    """
+    MetaData.tables replacement which knows all table keys from schema cache index
+    and creates Table objects only when they are accessed.
+    """
+
+    def setup(self, reader, materialize):
+        object.__setattr__(self, 'reader', reader)
+        object.__setattr__(self, 'materialize_table', materialize)
+        object.__setattr__(self, 'pending', OrderedDict.fromkeys(reader.get_keys()))
+        object.__setattr__(self, 'lock', threading.RLock())
+        object.__setattr__(self, 'local', threading.local())
+
+    def is_materialized(self, key):
+        return dict.__contains__(self, key)
+
+    def is_pending(self, key):
+        # Do not resolve foreign keys to pending tables while table is being created, otherwise
+        # loading one table would load all related tables recursively
+        if getattr(self.local, 'materializing', False):
+            return False
+        return key in self.pending
+
+    def materialize(self, key):
+        with self.lock:
+            if dict.__contains__(self, key):
+                self.pending.pop(key, None)
+                return dict.__getitem__(self, key)
+            elif key not in self.pending:
+                return
+
+            del self.pending[key]
+            self.local.materializing = True
+
+            try:
+                return self.materialize_table(key)
+            finally:
+                self.local.materializing = False
+
+    def materialize_all(self):
+        for key in list(self.pending.keys()):
+            self.materialize(key)
+
+    def discard_pending(self, key):
+        with self.lock:
+            if key not in self.pending:
+                return False
+            del self.pending[key]
+            return True
+
+    def read_pending_record(self, key):
+        with self.lock:
+            if key not in self.pending:
+                return
+            return self.reader.read_record_raw(key)
+
+    def get_pending_foreign_table_keys(self, key):
+        foreign_tables = self.reader.header.get('foreign_tables')
+
+        if foreign_tables is not None and key in foreign_tables:
+            return foreign_tables[key]
+
+        return sql_get_record_foreign_table_keys(self.reader.read_record(key))
+
+    def get_foreign_table_keys(self):
+        with self.lock:
+            result = OrderedDict()
+
+            for key, table in dict.items(self):
+                result[key] = sql_get_table_foreign_table_keys(table)
+
+            for key in self.pending.keys():
+                if key not in result:
+                    result[key] = self.get_pending_foreign_table_keys(key)
+
+            return result
+
+    def __missing__(self, key):
+        table = self.materialize(key)
+        if table is None:
+            raise KeyError(key)
+        return table
+
+    def __contains__(self, key):
+        return dict.__contains__(self, key) or self.is_pending(key)
+
+    def __iter__(self):
+        for key in list(dict.keys(self)):
+            yield key
+        for key in list(self.pending.keys()):
+            if not dict.__contains__(self, key):
+                yield key
+
+    def __len__(self):
+        return len(list(iter(self)))
+
+    def keys(self):
+        return list(iter(self))
+
+    def get(self, key, default=None):
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def values(self):
+        self.materialize_all()
+        return dict.values(self)
+
+    def items(self):
+        self.materialize_all()
+        return dict.items(self)
+
+    def __reduce__(self):
+        return util.FacadeDict, (dict(self.items()),)
+
+    def __repr__(self):
+        return 'SqlLazyTables(materialized={}, pending={})'.format(dict.__len__(self), len(self.pending))
+
+
+def sql_get_metadata_foreign_table_keys(metadata):
+    tables = metadata.tables
+
+    if isinstance(tables, SqlLazyTables):
+        return tables.get_foreign_table_keys()
+
+    return OrderedDict(map(lambda x: (x[0], sql_get_table_foreign_table_keys(x[1])), tables.items()))
+
+
+def sql_get_metadata_file_records(id_short, metadata, foreign_tables):
+    tables = metadata.tables
+    lazy = isinstance(tables, SqlLazyTables)
+
+    for key in list(tables.keys()):
+        # Tables which were not accessed are copied from the previous schema cache as is
+        raw_record = tables.read_pending_record(key) if lazy else None
+
+        if raw_record is not None:
+            foreign_tables[key] = tables.get_pending_foreign_table_keys(key)
+            yield key, raw_record
+            continue
+
+        table = tables[key]
+
+        try:
+            record = sql_serialize_table(table)
+        except Exception as e:
+            logger.warning('[{}] Table "{}" can\'t be saved to schema cache and will be reflected on load: {}'.format(
+                id_short,
+                key,
+                e
+            ))
+            record = {'name': table.name, 'schema': table.schema, 'reflect': True}
+
+        foreign_tables[key] = sql_get_table_foreign_table_keys(table)
+        yield key, encode_schema_cache_record(record)
+
 
 def sql_dump_metadata_file(conf, metadata):
     if not settings.CACHE_METADATA:
@@ -17,14 +185,23 @@ def sql_dump_metadata_file(conf, metadata):
 
     file_path = get_metadata_file_path(conf)
 
+    set_schema_cache_fingerprint(metadata, None)
+
     try:
-        dir_path = os.path.dirname(file_path)
+        # Tables referenced by each table are stored in header to find relationships without reading records
+        foreign_tables = OrderedDict()
+        records = list(sql_get_metadata_file_records(id_short, metadata, foreign_tables))
 
-        if dir_path and not os.path.exists(dir_path):
-            os.makedirs(dir_path)
+        fingerprint = write_schema_cache_file(
+            file_path,
+            'sql',
+            records,
+            schema=metadata.schema,
+            sqlalchemy_version=sqlalchemy.__version__,
+            foreign_tables=foreign_tables
+        )
 
-        with open(file_path, 'wb') as file:
-            pickle.dump(metadata, file)
+        set_schema_cache_fingerprint(metadata, fingerprint)
 
         logger.info('[{}] Saved schema cache for "{}"'.format(id_short, connection_name))
 
@@ -33,6 +210,37 @@ def sql_dump_metadata_file(conf, metadata):
         logger.error('[{}] Failed dumping schema cache for "{}"'.format(id_short, connection_name), exc_info=e)
 
 
+def sql_materialize_metadata_table(id_short, metadata, reader, engine, key):
+    record = reader.read_record(key)
+
+    if not record.get('reflect'):
+        try:
+            return sql_deserialize_table(metadata, record)
+        except Exception as e:
+            logger.warning('[{}] Failed loading table "{}" from schema cache, reflecting it: {}'.format(
+                id_short,
+                key,
+                e
+            ))
+
+            table = dict.get(metadata.tables, key)
+            if table is not None:
+                metadata.remove(table)
+
+    sql_reflect(
+        id_short,
+        metadata,
+        engine,
+        schema=record.get('schema'),
+        only=[record['name']],
+        foreign=True,
+        views=True,
+        resolve_fks=False
+    )
+
+    return dict.get(metadata.tables, key)
+
+
 def sql_load_metadata_file(conf, connection):
     if not settings.CACHE_METADATA:
         return
@@ -49,14 +257,23 @@ def sql_load_metadata_file(conf, connection):
         return
 
     try:
-        with open(file_path, 'rb') as file:
-            metadata = pickle.load(file=file)
-
-        metadata.bind = connection
-
-        return {
-            'file_path': file_path,
-            'metadata': metadata
-        }
+        reader = SchemaCacheReader(file_path, 'sql')
+    except SchemaCacheFormatError as e:
+        logger.info('[{}] Schema cache is outdated for "{}": {}'.format(id_short, connection_name, e))
+        return
     except Exception as e:
         logger.error('[{}] Failed loading schema cache for "{}"'.format(id_short, connection_name), exc_info=e)
+        return
+
+    metadata = MetaData(schema=reader.header.get('schema'), bind=connection)
+    set_schema_cache_fingerprint(metadata, reader.header.get('fingerprint'))
+    engine = connection.engine
+
+    tables = SqlLazyTables()
+    tables.setup(reader, lambda key: sql_materialize_metadata_table(id_short, metadata, reader, engine, key))
+    metadata.tables = tables
+
+    return {
+        'file_path': file_path,
+        'metadata': metadata
+    }
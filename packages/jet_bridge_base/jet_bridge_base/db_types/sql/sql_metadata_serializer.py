@@ -0,0 +1,244 @@
+import importlib
+
+from sqlalchemy import Table, Column, ForeignKeyConstraint, UniqueConstraint, CheckConstraint, Index, Computed, \
+    Identity, Enum, text, util
+from sqlalchemy.schema import DefaultClause
+from sqlalchemy.sql.elements import TextClause
+from sqlalchemy.types import TypeEngine
+
+SQL_TABLE_FLAGS = ['__jet_is_view__', '__jet_auto_pk__']
+SQL_FOREIGN_KEY_OPTIONS = ['onupdate', 'ondelete', 'deferrable', 'initially', 'match']
+SQL_IDENTITY_OPTIONS = ['always', 'on_null', 'start', 'increment', 'minvalue', 'maxvalue', 'cycle', 'cache', 'order']
+SQL_ENUM_OPTIONS = ['name', 'schema', 'native_enum', 'length', 'create_constraint', 'inherit_schema', 'create_type']
+
+
+class SqlSerializeError(Exception):
+    pass
+
+
+def sql_serialize_value(value):
+    if value is None or isinstance(value, (bool, int, float, util.string_types)):
+        return value
+    elif isinstance(value, (list, tuple)):
+        return list(map(lambda x: sql_serialize_value(x), value))
+    elif isinstance(value, TypeEngine):
+        return {'__type__': sql_serialize_type(value)}
+    elif isinstance(value, type) and issubclass(value, TypeEngine):
+        return {'__type__': sql_serialize_type(value())}
+    elif isinstance(value, TextClause):
+        return {'__text__': value.text}
+    else:
+        raise SqlSerializeError('Unsupported value: {}'.format(repr(value)))
+
+
+def sql_deserialize_value(value):
+    if isinstance(value, list):
+        return list(map(lambda x: sql_deserialize_value(x), value))
+    elif isinstance(value, dict) and '__type__' in value:
+        return sql_deserialize_type(value['__type__'])
+    elif isinstance(value, dict) and '__text__' in value:
+        return text(value['__text__'])
+    else:
+        return value
+
+
+def sql_serialize_type(type_):
+    cls = type_.__class__
+    args = []
+    kwargs = {}
+
+    if isinstance(type_, Enum):
+        args = list(type_.enums)
+        names = SQL_ENUM_OPTIONS
+    else:
+        names = util.get_cls_kwargs(cls)
+
+    for name in names:
+        if name.startswith('_') or not hasattr(type_, name):
+            continue
+
+        value = getattr(type_, name)
+
+        if value is None:
+            continue
+
+        kwargs[name] = sql_serialize_value(value)
+
+    return {
+        'module': cls.__module__,
+        'class': cls.__name__,
+        'args': args,
+        'kwargs': kwargs
+    }
+
+
+def sql_deserialize_type(obj):
+    module = importlib.import_module(obj['module'])
+    cls = getattr(module, obj['class'])
+    args = list(map(lambda x: sql_deserialize_value(x), obj.get('args', [])))
+    kwargs = dict(map(lambda x: (x[0], sql_deserialize_value(x[1])), obj.get('kwargs', {}).items()))
+
+    return cls(*args, **kwargs)
+
+
+def sql_serialize_column(column):
+    result = {
+        'name': column.name,
+        'type': sql_serialize_type(column.type),
+        'primary_key': column.primary_key,
+        'nullable': column.nullable,
+        'autoincrement': column.autoincrement,
+        'comment': column.comment
+    }
+
+    server_default = column.server_default
+
+    if isinstance(server_default, Computed):
+        result['computed'] = {
+            'sqltext': str(server_default.sqltext),
+            'persisted': server_default.persisted
+        }
+    elif isinstance(server_default, Identity):
+        result['identity'] = dict(map(
+            lambda x: (x, sql_serialize_value(getattr(server_default, x, None))),
+            SQL_IDENTITY_OPTIONS
+        ))
+    elif isinstance(server_default, DefaultClause):
+        if isinstance(server_default.arg, TextClause):
+            result['server_default'] = server_default.arg.text
+        else:
+            result['server_default'] = str(server_default.arg)
+
+    return result
+
+
+def sql_deserialize_column(obj):
+    args = [obj['name'], sql_deserialize_type(obj['type'])]
+    kwargs = {
+        'primary_key': obj.get('primary_key', False),
+        'nullable': obj.get('nullable', True),
+        'autoincrement': obj.get('autoincrement', 'auto'),
+        'comment': obj.get('comment')
+    }
+
+    if obj.get('computed'):
+        args.append(Computed(obj['computed']['sqltext'], persisted=obj['computed'].get('persisted')))
+    elif obj.get('identity'):
+        args.append(Identity(**dict(filter(lambda x: x[1] is not None, obj['identity'].items()))))
+    elif obj.get('server_default') is not None:
+        kwargs['server_default'] = text(obj['server_default'])
+
+    return Column(*args, **kwargs)
+
+
+def sql_serialize_clause(clause):
+    if isinstance(clause, TextClause):
+        return clause.text
+    else:
+        raise SqlSerializeError('Unsupported expression: {}'.format(repr(clause)))
+
+
+def sql_serialize_check_constraint(constraint):
+    return {
+        'name': constraint.name,
+        'sqltext': sql_serialize_clause(constraint.sqltext)
+    }
+
+
+def sql_serialize_index(index):
+    # Expressions are stored as column names or SQL text for expression indexes
+    expressions = list(map(
+        lambda x: x.name if isinstance(x, Column) else {'sqltext': sql_serialize_clause(x)},
+        index.expressions
+    ))
+
+    return {
+        'name': index.name,
+        'unique': index.unique,
+        'expressions': expressions,
+        'options': dict(map(lambda x: (x[0], sql_serialize_value(x[1])), index.dialect_kwargs.items()))
+    }
+
+
+def sql_serialize_table(table):
+    return {
+        'name': table.name,
+        'schema': table.schema,
+        'comment': table.comment,
+        'info': dict(map(lambda x: (x[0], sql_serialize_value(x[1])), table.info.items())),
+        'flags': list(filter(lambda x: getattr(table, x, False), SQL_TABLE_FLAGS)),
+        'columns': list(map(lambda x: sql_serialize_column(x), table.columns)),
+        'foreign_keys': list(map(lambda x: {
+            'name': x.name,
+            'columns': list(map(lambda c: c.parent.name, x.elements)),
+            'referred_columns': list(map(lambda c: c.target_fullname, x.elements)),
+            'options': dict(filter(
+                lambda o: o[1] is not None,
+                map(lambda o: (o, getattr(x, o, None)), SQL_FOREIGN_KEY_OPTIONS)
+            ))
+        }, sorted(table.foreign_key_constraints, key=lambda x: (x.name or '', x.column_keys)))),
+        'unique_constraints': list(map(lambda x: {
+            'name': x.name,
+            'columns': list(map(lambda c: c.name, x.columns))
+        }, filter(lambda x: isinstance(x, UniqueConstraint), table.constraints))),
+        'check_constraints': list(map(
+            lambda x: sql_serialize_check_constraint(x),
+            filter(lambda x: isinstance(x, CheckConstraint) and not x._type_bound, table.constraints)
+        )),
+        'indexes': list(map(lambda x: sql_serialize_index(x), table.indexes))
+    }
+
+
+def sql_get_table_foreign_table_keys(table):
+    return list(util.unique_list(filter(
+        lambda x: x is not None,
+        map(lambda x: x._table_key(), table.foreign_keys)
+    )))
+
+
+def sql_get_record_foreign_table_keys(obj):
+    return list(util.unique_list(map(
+        lambda x: x.rsplit('.', 1)[0],
+        (column for foreign_key in obj.get('foreign_keys', []) for column in foreign_key['referred_columns'])
+    )))
+
+
+def sql_deserialize_table(metadata, obj):
+    args = list(map(lambda x: sql_deserialize_column(x), obj['columns']))
+
+    for foreign_key in obj.get('foreign_keys', []):
+        args.append(ForeignKeyConstraint(
+            foreign_key['columns'],
+            foreign_key['referred_columns'],
+            name=foreign_key.get('name'),
+            **foreign_key.get('options', {})
+        ))
+
+    for constraint in obj.get('unique_constraints', []):
+        args.append(UniqueConstraint(*constraint['columns'], name=constraint.get('name')))
+
+    for constraint in obj.get('check_constraints', []):
+        args.append(CheckConstraint(text(constraint['sqltext']), name=constraint.get('name')))
+
+    table = Table(
+        obj['name'],
+        metadata,
+        *args,
+        schema=obj.get('schema'),
+        comment=obj.get('comment'),
+        info=dict(map(lambda x: (x[0], sql_deserialize_value(x[1])), obj.get('info', {}).items()))
+    )
+
+    for index in obj.get('indexes', []):
+        expressions = list(map(
+            lambda x: text(x['sqltext']) if isinstance(x, dict) else table.columns[x],
+            index['expressions']
+        ))
+        options = dict(map(lambda x: (x[0], sql_deserialize_value(x[1])), index.get('options', {}).items()))
+
+        Index(index['name'], *expressions, unique=index.get('unique', False), _table=table, **options)
+
+    for flag in obj.get('flags', []):
+        setattr(table, flag, True)
+
+    return table
@@ -1,3 +1,4 @@
+import json
 import time
 
 from sqlalchemy.sql.base import _bind_or_error
@@ -8,8 +9,13 @@ from sqlalchemy import util
 
 from jet_bridge_base import settings
 from jet_bridge_base.logger import logger
+from jet_bridge_base.utils.crypt import get_sha256_hash
 from jet_bridge_base.utils.process import get_memory_usage_human
 
+from .sql_reflect_batch import sql_reflect_prefetch
+
+TABLE_FINGERPRINT_KEY = 'jet_fingerprint'
+
 
 def sql_get_tables(
     insp,
@@ -74,6 +80,26 @@ def sql_get_tables(
     return load, view_names
 
 
+def sql_get_table_fingerprint(insp, table_name, schema=None):
+    """
+    Hash of table catalog definition, used to detect changed tables without building Table objects.
+    Inspector results are cached, so calling it right after table reflection does not query database again.
+    """
+
+    definition = {}
+
+    for method in ['get_columns', 'get_pk_constraint', 'get_foreign_keys', 'get_table_comment']:
+        try:
+            definition[method] = getattr(insp, method)(table_name, schema)
+        except NotImplementedError:
+            definition[method] = None
+
+    try:
+        return get_sha256_hash(json.dumps(definition, sort_keys=True, default=repr))
+    except Exception:
+        return
+
+
 def sql_reflect(
     cid_short,
     metadata,
@@ -117,13 +143,28 @@ def sql_reflect(
         if pending_connection:
             pending_connection['tables_total'] = len(load)
 
+        def on_prefetch_progress(processed):
+            # Batch fetch is reported as the first half of progress, tables are created from fetched data after it
+            if pending_connection:
+                pending_connection['tables_processed'] = processed // 2
+
+        prefetch_names = [name for name in load if name not in ['pg_stat_statements']]
+
+        if settings.DATABASE_MAX_TABLES is not None:
+            prefetch_names = prefetch_names[:settings.DATABASE_MAX_TABLES]
+
+        prefetched = sql_reflect_prefetch(cid_short, bind, insp, prefetch_names, schema, on_prefetch_progress)
+
         i = 0
         for name in load:
             if name in ['pg_stat_statements']:
                 continue
 
             # Wait to allow other threads execution
-            time.sleep(0.01)
+            if prefetched:
+                time.sleep(0)
+            else:
+                time.sleep(0.01)
 
             try:
                 logger.info('[{}] Analyzing table "{}" ({} / {})" (Mem:{})...'.format(cid_short, name, i + 1, len(load), get_memory_usage_human()))
@@ -154,19 +195,20 @@ def sql_reflect(
                     table = Table(name, metadata, *args, **reflect_opts)
                     setattr(table, '__jet_auto_pk__', True)
 
+                table.info[TABLE_FINGERPRINT_KEY] = sql_get_table_fingerprint(insp, name, schema)
 
             except exc.UnreflectableTableError as uerr:
                 util.warn("Skipping table %s: %s" % (name, uerr))
 
             i += 1
 
+            if pending_connection:
+                pending_connection['tables_processed'] = (len(prefetch_names) + i) // 2 if prefetched else i
+
             if settings.DATABASE_MAX_TABLES is not None and i >= settings.DATABASE_MAX_TABLES:
                 logger.warning('[{}] Max tables limit ({}) reached'.format(cid_short, settings.DATABASE_MAX_TABLES))
                 break
 
-            if pending_connection:
-                pending_connection['tables_processed'] = i
-
     """
     Modify END
     """
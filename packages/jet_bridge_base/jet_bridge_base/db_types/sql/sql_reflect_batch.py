@@ -0,0 +1,492 @@
+import re
+import threading
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+
+import sqlalchemy
+from sqlalchemy import inspection
+from sqlalchemy import sql
+from sqlalchemy import util
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.engine import Engine
+from sqlalchemy.sql import sqltypes
+
+from jet_bridge_base import settings
+from jet_bridge_base.logger import logger
+
+POSTGRESQL_FK_ACTIONS = {
+    'r': 'RESTRICT',
+    'c': 'CASCADE',
+    'n': 'SET NULL',
+    'd': 'SET DEFAULT'
+}
+
+
+# SQLAlchemy versions which info_cache key format and dialect internals used by prefetch are known for
+SQLALCHEMY_INFO_CACHE_VERSIONS = [(1, 4)]
+
+
+def is_info_cache_supported():
+    version = tuple(map(int, re.findall(r'\d+', sqlalchemy.__version__)[:2]))
+    return version in SQLALCHEMY_INFO_CACHE_VERSIONS
+
+
+def get_info_cache_key(method, table_name, schema):
+    # Same key format as produced by sqlalchemy.engine.reflection.cache
+    args = (table_name, schema) if schema is not None else (table_name,)
+    return method, args, ()
+
+
+def set_info_cache(info_cache, method, table_name, schema, value):
+    info_cache[get_info_cache_key(method, table_name, schema)] = value
+
+
+def get_reflect_threads(bind):
+    threads = max(settings.DATABASE_REFLECT_THREADS or 1, 1)
+
+    # Do not wait for connections already used by requests
+    if hasattr(bind.pool, 'size') and hasattr(bind.pool, 'checkedout'):
+        threads = min(threads, bind.pool.size() - bind.pool.checkedout())
+
+    return threads
+
+
+def sql_prefetch_parallel(bind, info_cache, schema, names, methods, on_progress=None):
+    """
+    Runs per-table reflection methods on several pooled connections at once, results are stored into
+    the shared inspector info_cache so the following Table() reflection does not query database again.
+    """
+
+    if not isinstance(bind, Engine):
+        return False
+
+    threads = min(get_reflect_threads(bind), len(names))
+
+    if threads <= 1:
+        return False
+
+    chunks = [names[i::threads] for i in range(threads)]
+    progress_lock = threading.Lock()
+    progress = {'processed': 0}
+
+    def prefetch_chunk(chunk):
+        with bind.connect() as connection:
+            insp = inspection.inspect(connection)
+            insp.info_cache = info_cache
+
+            for name in chunk:
+                for method in methods:
+                    try:
+                        getattr(insp, method)(name, schema)
+                    except NotImplementedError:
+                        pass
+                    except Exception as e:
+                        # Error will be raised again during table reflection
+                        logger.debug('Prefetch "{}" failed for table "{}": {}'.format(method, name, e))
+
+                if on_progress:
+                    with progress_lock:
+                        progress['processed'] += 1
+                        on_progress(progress['processed'])
+
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        for _ in executor.map(prefetch_chunk, chunks):
+            pass
+
+    return True
+
+
+def postgresql_fetch_table_oids(connection, names, schema):
+    if schema is not None:
+        schema_where_clause = 'n.nspname = :schema'
+    else:
+        schema_where_clause = 'pg_catalog.pg_table_is_visible(c.oid)'
+
+    query = sql.text('''
+        SELECT c.relname, c.oid
+        FROM pg_catalog.pg_class c
+        LEFT JOIN pg_catalog.pg_namespace n ON n.oid = c.relnamespace
+        WHERE ({})
+        AND c.relname = ANY(:table_names) AND c.relkind in ('r', 'v', 'm', 'f', 'p')
+    '''.format(schema_where_clause))
+    query = query.bindparams(sql.bindparam('table_names', type_=ARRAY(sqltypes.Unicode)))
+    query = query.columns(relname=sqltypes.Unicode, oid=sqltypes.Integer)
+
+    params = {'table_names': list(names)}
+
+    if schema is not None:
+        params['schema'] = schema
+
+    return dict(connection.execute(query, params).fetchall())
+
+
+def postgresql_execute_for_oids(connection, query, table_oids, **columns):
+    query = sql.text(query).bindparams(sql.bindparam('table_oids', type_=ARRAY(sqltypes.Integer)))
+
+    if columns:
+        query = query.columns(**columns)
+
+    return connection.execute(query, {'table_oids': list(table_oids)}).fetchall()
+
+
+def postgresql_prefetch_columns(connection, dialect, info_cache, tables, schema):
+    generated = 'a.attgenerated as generated' if dialect.server_version_info >= (12,) else 'NULL as generated'
+
+    if dialect.server_version_info >= (10,):
+        identity = '''
+            (SELECT json_build_object(
+                'always', a.attidentity = 'a',
+                'start', s.seqstart,
+                'increment', s.seqincrement,
+                'minvalue', s.seqmin,
+                'maxvalue', s.seqmax,
+                'cache', s.seqcache,
+                'cycle', s.seqcycle)
+            FROM pg_catalog.pg_sequence s
+            JOIN pg_catalog.pg_class c on s.seqrelid = c."oid"
+            WHERE c.relkind = 'S'
+            AND a.attidentity != ''
+            AND s.seqrelid = pg_catalog.pg_get_serial_sequence(
+                a.attrelid::regclass::text, a.attname
+            )::regclass::oid
+            ) as identity_options
+        '''
+    else:
+        identity = 'NULL as identity_options'
+
+    rows = postgresql_execute_for_oids(connection, '''
+        SELECT a.attname,
+          pg_catalog.format_type(a.atttypid, a.atttypmod),
+          (
+            SELECT pg_catalog.pg_get_expr(d.adbin, d.adrelid)
+            FROM pg_catalog.pg_attrdef d
+            WHERE d.adrelid = a.attrelid AND d.adnum = a.attnum
+            AND a.atthasdef
+          ) AS DEFAULT,
+          a.attnotnull,
+          a.attrelid as table_oid,
+          pgd.description as comment,
+          {},
+          {}
+        FROM pg_catalog.pg_attribute a
+        LEFT JOIN pg_catalog.pg_description pgd ON (
+            pgd.objoid = a.attrelid AND pgd.objsubid = a.attnum)
+        WHERE a.attrelid = ANY(:table_oids)
+        AND a.attnum > 0 AND NOT a.attisdropped
+        ORDER BY a.attrelid, a.attnum
+    '''.format(generated, identity), tables.values(), attname=sqltypes.Unicode, default=sqltypes.Unicode)
+
+    # Domains and enums are loaded once for all tables instead of once per table
+    domains = dialect._load_domains(connection)
+    enums = dict(
+        ((rec['name'],), rec) if rec['visible'] else ((rec['schema'], rec['name']), rec)
+        for rec in dialect._load_enums(connection, schema='*')
+    )
+
+    columns = defaultdict(list)
+
+    for name, format_type, default, notnull, table_oid, comment, generated, identity in rows:
+        column_info = dialect._get_column_info(
+            name,
+            format_type,
+            default,
+            notnull,
+            domains,
+            enums,
+            schema,
+            comment,
+            generated,
+            identity
+        )
+        columns[table_oid].append(column_info)
+
+    for table_name, table_oid in tables.items():
+        set_info_cache(info_cache, 'get_columns', table_name, schema, columns[table_oid])
+
+
+def postgresql_prefetch_pk_constraints(connection, info_cache, tables, schema):
+    rows = postgresql_execute_for_oids(connection, '''
+        SELECT k.indrelid, a.attname
+        FROM pg_attribute a JOIN (
+            SELECT ix.indrelid,
+                   unnest(ix.indkey) attnum,
+                   generate_subscripts(ix.indkey, 1) ord
+            FROM pg_index ix
+            WHERE ix.indrelid = ANY(:table_oids) AND ix.indisprimary
+            ) k ON a.attrelid = k.indrelid AND a.attnum = k.attnum
+        ORDER BY k.indrelid, k.ord
+    ''', tables.values(), attname=sqltypes.Unicode)
+
+    columns = defaultdict(list)
+
+    for table_oid, column in rows:
+        columns[table_oid].append(column)
+
+    rows = postgresql_execute_for_oids(connection, '''
+        SELECT r.conrelid, r.conname
+        FROM pg_catalog.pg_constraint r
+        WHERE r.conrelid = ANY(:table_oids) AND r.contype = 'p'
+        ORDER BY 1, 2
+    ''', tables.values(), conname=sqltypes.Unicode)
+
+    names = {}
+
+    for table_oid, name in rows:
+        names.setdefault(table_oid, name)
+
+    for table_name, table_oid in tables.items():
+        set_info_cache(info_cache, 'get_pk_constraint', table_name, schema, {
+            'constrained_columns': columns[table_oid],
+            'name': names.get(table_oid)
+        })
+
+
+def postgresql_prefetch_foreign_keys(connection, info_cache, tables, schema):
+    # Structured equivalent of parsing pg_get_constraintdef() output done by dialect.get_foreign_keys()
+    rows = postgresql_execute_for_oids(connection, '''
+        SELECT r.conrelid,
+               r.conname,
+               ARRAY(
+                   SELECT a.attname::text
+                   FROM unnest(r.conkey) WITH ORDINALITY k(attnum, ord)
+                   JOIN pg_attribute a ON a.attrelid = r.conrelid AND a.attnum = k.attnum
+                   ORDER BY k.ord
+               ) AS constrained_columns,
+               n.nspname AS conschema,
+               pg_catalog.pg_table_is_visible(c.oid) AS referred_visible,
+               c.relname AS referred_table,
+               ARRAY(
+                   SELECT a.attname::text
+                   FROM unnest(r.confkey) WITH ORDINALITY k(attnum, ord)
+                   JOIN pg_attribute a ON a.attrelid = r.confrelid AND a.attnum = k.attnum
+                   ORDER BY k.ord
+               ) AS referred_columns,
+               r.confupdtype,
+               r.confdeltype,
+               r.confmatchtype,
+               r.condeferrable,
+               r.condeferred
+        FROM pg_catalog.pg_constraint r
+        JOIN pg_catalog.pg_class c ON c.oid = r.confrelid
+        JOIN pg_catalog.pg_namespace n ON n.oid = c.relnamespace
+        WHERE r.conrelid = ANY(:table_oids) AND r.contype = 'f'
+        ORDER BY r.conrelid, r.conname
+    ''', tables.values(), conname=sqltypes.Unicode, conschema=sqltypes.Unicode, referred_table=sqltypes.Unicode)
+
+    fkeys = defaultdict(list)
+
+    for row in rows:
+        (
+            table_oid,
+            name,
+            constrained_columns,
+            conschema,
+            referred_visible,
+            referred_table,
+            referred_columns,
+            onupdate,
+            ondelete,
+            match,
+            deferrable,
+            initially_deferred
+        ) = row
+
+        if not referred_visible:
+            referred_schema = conschema
+        elif schema is not None and schema == conschema:
+            referred_schema = schema
+        else:
+            referred_schema = None
+
+        options = {
+            k: v
+            for k, v in [
+                ('onupdate', POSTGRESQL_FK_ACTIONS.get(onupdate)),
+                ('ondelete', POSTGRESQL_FK_ACTIONS.get(ondelete)),
+                ('initially', 'DEFERRED' if initially_deferred else None),
+                ('deferrable', True if deferrable else None),
+                ('match', 'FULL' if match == 'f' else None)
+            ]
+            if v is not None
+        }
+
+        fkeys[table_oid].append({
+            'name': name,
+            'constrained_columns': list(constrained_columns),
+            'referred_schema': referred_schema,
+            'referred_table': referred_table,
+            'referred_columns': list(referred_columns),
+            'options': options
+        })
+
+    for table_name, table_oid in tables.items():
+        set_info_cache(info_cache, 'get_foreign_keys', table_name, schema, fkeys[table_oid])
+
+
+def postgresql_prefetch_unique_constraints(connection, info_cache, tables, schema):
+    rows = postgresql_execute_for_oids(connection, '''
+        SELECT
+            cons.conrelid as table_oid,
+            cons.conname as name,
+            cons.conkey as key,
+            a.attnum as col_num,
+            a.attname as col_name
+        FROM
+            pg_catalog.pg_constraint cons
+            join pg_attribute a
+              on cons.conrelid = a.attrelid AND
+                a.attnum = ANY(cons.conkey)
+        WHERE
+            cons.conrelid = ANY(:table_oids) AND
+            cons.contype = 'u'
+    ''', tables.values(), col_name=sqltypes.Unicode)
+
+    uniques = defaultdict(lambda: defaultdict(lambda: defaultdict(dict)))
+
+    for row in rows:
+        uc = uniques[row.table_oid][row.name]
+        uc['key'] = row.key
+        uc['cols'][row.col_num] = row.col_name
+
+    for table_name, table_oid in tables.items():
+        set_info_cache(info_cache, 'get_unique_constraints', table_name, schema, [
+            {'name': name, 'column_names': [uc['cols'][i] for i in uc['key']]}
+            for name, uc in uniques[table_oid].items()
+        ])
+
+
+def postgresql_parse_check_constraint(name, src):
+    m = re.match(r'^CHECK *\((.+)\)( NOT VALID)?$', src, flags=re.DOTALL)
+
+    if not m:
+        util.warn('Could not parse CHECK constraint text: %r' % src)
+        sqltext = ''
+    else:
+        sqltext = re.compile(r'^[\s\n]*\((.+)\)[\s\n]*$', flags=re.DOTALL).sub(r'\1', m.group(1))
+
+    entry = {'name': name, 'sqltext': sqltext}
+
+    if m and m.group(2):
+        entry['dialect_options'] = {'not_valid': True}
+
+    return entry
+
+
+def postgresql_prefetch_check_constraints(connection, info_cache, tables, schema):
+    rows = postgresql_execute_for_oids(connection, '''
+        SELECT
+            cons.conrelid as table_oid,
+            cons.conname as name,
+            pg_get_constraintdef(cons.oid) as src
+        FROM
+            pg_catalog.pg_constraint cons
+        WHERE
+            cons.conrelid = ANY(:table_oids) AND
+            cons.contype = 'c'
+    ''', tables.values())
+
+    checks = defaultdict(list)
+
+    for table_oid, name, src in rows:
+        checks[table_oid].append(postgresql_parse_check_constraint(name, src))
+
+    for table_name, table_oid in tables.items():
+        set_info_cache(info_cache, 'get_check_constraints', table_name, schema, checks[table_oid])
+
+
+def postgresql_prefetch_table_comments(connection, info_cache, tables, schema):
+    rows = postgresql_execute_for_oids(connection, '''
+        SELECT
+            pgd.objoid as table_oid,
+            pgd.description as table_comment
+        FROM
+            pg_catalog.pg_description pgd
+        WHERE
+            pgd.objsubid = 0 AND
+            pgd.objoid = ANY(:table_oids)
+    ''', tables.values())
+
+    comments = {}
+
+    for table_oid, comment in rows:
+        comments.setdefault(table_oid, comment)
+
+    for table_name, table_oid in tables.items():
+        set_info_cache(info_cache, 'get_table_comment', table_name, schema, {'text': comments.get(table_oid)})
+
+
+def postgresql_prefetch(bind, insp, names, schema, on_progress=None, indexes=True):
+    connection = insp.bind
+    dialect = insp.dialect
+    info_cache = insp.info_cache
+
+    # Results are written to info_cache directly, other versions would not find them and query every table again
+    if not is_info_cache_supported():
+        return False
+
+    # unnest() WITH ORDINALITY is available since 9.4
+    if dialect.server_version_info < (9, 4):
+        return False
+
+    tables = postgresql_fetch_table_oids(connection, names, schema)
+
+    for table_name, table_oid in tables.items():
+        set_info_cache(info_cache, 'get_table_oid', table_name, schema, table_oid)
+
+    if not tables:
+        return True
+
+    postgresql_prefetch_columns(connection, dialect, info_cache, tables, schema)
+    postgresql_prefetch_pk_constraints(connection, info_cache, tables, schema)
+    postgresql_prefetch_foreign_keys(connection, info_cache, tables, schema)
+    postgresql_prefetch_unique_constraints(connection, info_cache, tables, schema)
+    postgresql_prefetch_check_constraints(connection, info_cache, tables, schema)
+    postgresql_prefetch_table_comments(connection, info_cache, tables, schema)
+
+    if not indexes:
+        return True
+
+    # Index definitions are parsed per table by dialect, fetch them concurrently instead
+    table_names = list(tables.keys())
+    if not sql_prefetch_parallel(bind, info_cache, schema, table_names, ['get_indexes'], on_progress):
+        for i, table_name in enumerate(table_names):
+            insp.get_indexes(table_name, schema)
+
+            if on_progress:
+                on_progress(i + 1)
+
+    return True
+
+
+def mysql_prefetch(bind, insp, names, schema, on_progress=None, indexes=True):
+    # Single SHOW CREATE TABLE per table is parsed and cached by dialect for all reflection methods
+    return sql_prefetch_parallel(bind, insp.info_cache, schema, names, ['get_columns'], on_progress)
+
+
+def sql_reflect_prefetch(cid_short, bind, insp, names, schema, on_progress=None, indexes=True):
+    """
+    Fills inspector info_cache with reflection results for all tables using batched catalog queries.
+    Returns False for dialects without batch support so tables are reflected one by one.
+    """
+
+    engine_name = bind.engine.name
+
+    if engine_name == 'postgresql':
+        prefetch = postgresql_prefetch
+    elif engine_name == 'mysql':
+        prefetch = mysql_prefetch
+    else:
+        return False
+
+    if not names:
+        return False
+
+    try:
+        logger.info('[{}] Fetching schema for {} tables in batch...'.format(cid_short, len(names)))
+        return prefetch(bind, insp, names, schema, on_progress, indexes)
+    except Exception as e:
+        logger.warning('[{}] Batch schema fetch failed, falling back to per table reflection: {}'.format(
+            cid_short,
+            e
+        ))
+        return False
@@ -0,0 +1,92 @@
+import json
+import time
+
+from sqlalchemy import MetaData, inspection
+
+from jet_bridge_base import settings
+from jet_bridge_base.logger import logger
+from jet_bridge_base.utils.conf import get_connection_id, get_connection_schema, get_connection_only_predicate
+
+from .sql_mapped_base import sql_remap_mapped_base
+from .sql_metadata_file import SqlLazyTables
+from .sql_reflect import sql_get_tables, sql_reflect, sql_get_table_fingerprint, TABLE_FINGERPRINT_KEY
+from .sql_reflect_batch import sql_reflect_prefetch
+
+
+def sql_get_tables_fingerprints(id_short, engine, schema, only=None):
+    with inspection.inspect(engine)._inspection_context() as insp:
+        load, _ = sql_get_tables(insp, MetaData(schema=schema), engine, schema, foreign=True, views=True, only=only)
+        load = [name for name in load if name not in ['pg_stat_statements']]
+
+        if settings.DATABASE_MAX_TABLES is not None:
+            load = load[:settings.DATABASE_MAX_TABLES]
+
+        sql_reflect_prefetch(id_short, engine, insp, load, schema, indexes=False)
+
+        return dict(map(lambda x: (x, sql_get_table_fingerprint(insp, x, schema)), load))
+
+
+def sql_refresh_mapped_base(conf, engine, MappedBase):
+    """
+    Re-reflects only tables which catalog definition changed since last reflection.
+    Returns names of changed and removed tables.
+    """
+
+    id_short = get_connection_id(conf)[:4]
+    schema = get_connection_schema(conf)
+    metadata = MappedBase.metadata
+    only = get_connection_only_predicate(conf)
+
+    refresh_start_time = time.time()
+    fingerprints = sql_get_tables_fingerprints(id_short, engine, schema, only)
+
+    tables = metadata.tables
+    pending_tables = {}
+
+    if isinstance(tables, SqlLazyTables):
+        # Tables not loaded from schema cache yet are compared by their records without creating them
+        for key in list(tables.pending.keys()):
+            record = tables.read_pending_record(key)
+            if record is None:
+                continue
+
+            record = json.loads(record.decode('utf-8'))
+            if record.get('schema') == metadata.schema:
+                pending_tables[record['name']] = (key, record.get('info', {}).get(TABLE_FINGERPRINT_KEY))
+
+    existing_tables = dict(map(
+        lambda x: (x.name, x),
+        filter(lambda x: x.schema == metadata.schema, dict.values(tables))
+    ))
+    existing_fingerprints = {
+        **dict(map(lambda x: (x[0], x[1][1]), pending_tables.items())),
+        **dict(map(lambda x: (x[0], x[1].info.get(TABLE_FINGERPRINT_KEY)), existing_tables.items()))
+    }
+
+    changed = list(filter(
+        lambda x: x not in existing_fingerprints or existing_fingerprints[x] != fingerprints[x],
+        fingerprints.keys()
+    ))
+    removed = list(filter(lambda x: x not in fingerprints, existing_fingerprints.keys()))
+
+    if not changed and not removed:
+        logger.info('[{}] Schema is up to date ({} tables checked)'.format(id_short, len(fingerprints)))
+        return []
+
+    logger.info('[{}] Refreshing schema: {} changed, {} removed tables...'.format(id_short, len(changed), len(removed)))
+
+    for name in changed + removed:
+        table = existing_tables.get(name)
+        if table is not None:
+            metadata.remove(table)
+        elif name in pending_tables:
+            tables.discard_pending(pending_tables[name][0])
+
+    if changed:
+        sql_reflect(id_short, metadata, engine, only=changed, foreign=True, views=True)
+
+    sql_remap_mapped_base(MappedBase, changed + removed)
+
+    logger.info('[{}] Refreshed schema in {}s'.format(id_short, round(time.time() - refresh_start_time, 3)))
+
+    return changed + removed
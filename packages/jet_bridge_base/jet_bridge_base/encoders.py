@@ -8,6 +8,33 @@ import uuid
 import six
 from bson import ObjectId
 
+from jet_bridge_base import settings
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+JSON_BACKEND_AUTO = 'auto'
+JSON_BACKEND_ORJSON = 'orjson'
+JSON_BACKEND_JSON = 'json'
+
+JSON_BACKENDS = [
+    JSON_BACKEND_AUTO,
+    JSON_BACKEND_ORJSON,
+    JSON_BACKEND_JSON
+]
+
+
+def clean_obj(obj):
+    if isinstance(obj, float) and (math.isnan(obj) or math.isinf(obj)):
+        return None
+    elif isinstance(obj, dict):
+        return {k: clean_obj(v) for k, v in obj.items()}
+    elif isinstance(obj, (list, tuple, set)):
+        return [clean_obj(v) for v in obj]
+    return obj
+
 
 class JSONEncoder(json.JSONEncoder):
 
@@ -15,14 +42,17 @@ class JSONEncoder(json.JSONEncoder):
         return value.utcoffset() is not None
 
     def encode(self, o):
-        def clean_obj(obj):
-            if isinstance(obj, float) and (math.isnan(obj) or math.isinf(obj)):
-                return None
-            elif isinstance(obj, dict):
-                return {k: clean_obj(v) for k, v in obj.items()}
-            elif isinstance(obj, (list, tuple, set)):
-                return [clean_obj(v) for v in obj]
-            return obj
+        # Data is encoded in a single pass without copying, NaN and Infinity are rare and raise ValueError here,
+        # only then data is copied with them replaced by None
+        allow_nan = self.allow_nan
+        self.allow_nan = False
+
+        try:
+            return super(JSONEncoder, self).encode(o)
+        except ValueError:
+            pass
+        finally:
+            self.allow_nan = allow_nan
 
         return super(JSONEncoder, self).encode(clean_obj(o))
 
@@ -42,7 +72,8 @@ class JSONEncoder(json.JSONEncoder):
         elif isinstance(obj, datetime.timedelta):
             return six.text_type(obj.total_seconds())
         elif isinstance(obj, decimal.Decimal):
-            return float(obj)
+            # NaN and Infinity are encoded as null the same way as floats
+            return float(obj) if obj.is_finite() else None
         elif isinstance(obj, uuid.UUID):
             return six.text_type(obj)
         elif isinstance(obj, ObjectId) or type(obj) is ObjectId:
@@ -59,3 +90,71 @@ class JSONEncoder(json.JSONEncoder):
         elif hasattr(obj, '__iter__'):
             return tuple(item for item in obj)
         return super(JSONEncoder, self).default(obj)
+
+
+class JSONBackend(object):
+    name = JSON_BACKEND_JSON
+    item_separator = ', '
+    key_separator = ': '
+    ensure_ascii = True
+
+    def dumps(self, obj, encoder_class=JSONEncoder):
+        return json.dumps(
+            obj,
+            cls=encoder_class,
+            separators=(self.item_separator, self.key_separator),
+            ensure_ascii=self.ensure_ascii
+        )
+
+
+class CompactJSONBackend(JSONBackend):
+    item_separator = ','
+    key_separator = ':'
+    ensure_ascii = False
+
+
+class OrjsonBackend(JSONBackend):
+    """
+    C-accelerated encoding with orjson, types not supported natively are converted with encoder_class.default,
+    datetimes are passed through to keep their representation. NaN and Infinity are encoded as null by orjson.
+    Output is compact and not ASCII-escaped. Data orjson fails to encode (integers over 64 bits, nesting deeper
+    than 254 levels) is encoded with the standard backend using the same separators and escaping.
+    """
+
+    name = JSON_BACKEND_ORJSON
+    item_separator = ','
+    key_separator = ':'
+
+    def __init__(self):
+        self.option = orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_PASSTHROUGH_DATACLASS
+        self.fallback = CompactJSONBackend()
+
+    def dumps(self, obj, encoder_class=JSONEncoder):
+        try:
+            return orjson.dumps(obj, default=encoder_class().default, option=self.option).decode('utf-8')
+        except TypeError:
+            return self.fallback.dumps(obj, encoder_class=encoder_class)
+
+
+json_backends = {}
+
+
+def get_json_backend(name=None):
+    name = name or settings.JSON_BACKEND or JSON_BACKEND_JSON
+
+    if name not in JSON_BACKENDS:
+        raise ValueError('Unknown JSON backend "{}", available: {}'.format(name, ', '.join(JSON_BACKENDS)))
+
+    if name == JSON_BACKEND_AUTO:
+        name = JSON_BACKEND_ORJSON if orjson is not None else JSON_BACKEND_JSON
+    elif name == JSON_BACKEND_ORJSON and orjson is None:
+        raise ValueError('JSON backend "{}" requires orjson package to be installed'.format(name))
+
+    if name not in json_backends:
+        json_backends[name] = OrjsonBackend() if name == JSON_BACKEND_ORJSON else JSONBackend()
+
+    return json_backends[name]
+
+
+def json_dumps(obj, encoder_class=JSONEncoder):
+    return get_json_backend().dumps(obj, encoder_class=encoder_class)
@@ -9,6 +9,7 @@ class ArrayField(Field):
     field_error_messages = {
         'invalid': 'not a valid array'
     }
+    representation_identity = True
 
     def to_internal_value_item(self, value):
         internal_value = None
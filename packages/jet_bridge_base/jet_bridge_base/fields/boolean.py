@@ -18,6 +18,7 @@ class BooleanField(Field):
         '0', 0, 0.0,
         False
     }
+    representation_identity = True
 
     def to_internal_value_item(self, value):
         if value in self.TRUE_VALUES:
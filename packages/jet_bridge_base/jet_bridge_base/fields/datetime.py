@@ -13,15 +13,19 @@ def get_timezone_from_str(value):
     return datetime.datetime.strptime(value.replace(':', ''), '%z').tzinfo
 
 
+def datetime_apply_timezone(value, timezone):
+    if value.tzinfo is not None or not timezone:
+        return value
+
+    return value.replace(tzinfo=timezone)
+
+
 def datetime_apply_default_timezone(value, request):
     if value.tzinfo is not None:
         return value
 
     default_timezone = get_default_timezone(request) if request else None
-    if default_timezone:
-        return value.replace(tzinfo=default_timezone)
-
-    return value
+    return datetime_apply_timezone(value, default_timezone)
 
 
 class DateTimeField(Field):
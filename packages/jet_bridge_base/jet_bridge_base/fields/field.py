@@ -21,6 +21,8 @@ class empty:
 class Field(object):
     creation_counter = 0
     field_name = None
+    # to_representation_item returns value as is, serializers skip calling it
+    representation_identity = False
     field_error_messages = {
         'required': 'this field is required',
         'null': 'this field may not be null'
@@ -7,6 +7,7 @@ class IntegerField(Field):
     field_error_messages = {
         'invalid': 'not a valid integer'
     }
+    representation_identity = True
 
     def to_internal_value_item(self, value):
         if value is None:
@@ -10,6 +10,7 @@ class JSONField(Field):
     field_error_messages = {
         'invalid': 'not a valid JSON'
     }
+    representation_identity = True
 
     def __init__(self, *args, **kwargs):
         if 'allow_many' not in kwargs:
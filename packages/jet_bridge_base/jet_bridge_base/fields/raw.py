@@ -2,6 +2,7 @@ from jet_bridge_base.fields.field import Field
 
 
 class RawField(Field):
+    representation_identity = True
 
     def to_internal_value_item(self, value):
         return value
@@ -0,0 +1,81 @@
+import time
+from collections import OrderedDict
+
+from jet_bridge_base.db_types import get_queryset_keyset, apply_keyset_cursor, encode_keyset_cursor
+from jet_bridge_base.exceptions.missing_argument_error import MissingArgumentError
+from jet_bridge_base.paginators.pagination import Pagination
+from jet_bridge_base.responses.json import JSONResponse
+from jet_bridge_base.utils.http import replace_query_param
+
+
+class CursorPagination(Pagination):
+    """
+    Keyset pagination: next page is requested with cursor containing ordering and primary key values
+    of the last row, so database does not need to skip previous rows.
+    """
+
+    default_page_size = 25
+    cursor_query_param = '_cursor'
+    page_size_query_param = '_per_page'
+    max_page_size = 10000
+
+    cursor = None
+    next_cursor = None
+    has_more = None
+    page_size = None
+    data_query_time = None
+
+    def paginate_queryset(self, request, queryset, handler):
+        page_size = self.get_page_size(request, handler)
+        Model = handler.get_model(request)
+        keyset = get_queryset_keyset(Model, queryset)
+
+        self.cursor = request.get_argument(self.cursor_query_param, None)
+
+        if self.cursor:
+            queryset = apply_keyset_cursor(queryset, keyset, self.cursor)
+
+        data_query_start = time.time()
+        # One more row is fetched to know whether next page exists
+        result = list(queryset.limit(page_size + 1))
+        data_query_end = time.time()
+
+        self.data_query_time = round(data_query_end - data_query_start, 3)
+        self.has_more = len(result) > page_size
+        self.page_size = page_size
+
+        result = result[:page_size]
+        self.next_cursor = encode_keyset_cursor(keyset, result[-1]) if self.has_more else None
+
+        return result
+
+    def get_paginated_response(self, request, data):
+        return JSONResponse(OrderedDict([
+            ('next', self.get_next_link(request)),
+            ('cursor', self.next_cursor),
+            ('results', data),
+            ('per_page', self.page_size),
+            ('has_more', self.has_more),
+            ('data_query_time', self.data_query_time),
+        ]))
+
+    def get_page_size(self, request, handler):
+        if self.page_size_query_param:
+            try:
+                result = int(request.get_argument(self.page_size_query_param))
+                result = max(result, 1)
+
+                if self.max_page_size:
+                    result = min(result, self.max_page_size)
+
+                return result
+            except (MissingArgumentError, ValueError):
+                pass
+
+        return self.default_page_size
+
+    def get_next_link(self, request):
+        if not self.next_cursor:
+            return None
+        url = request.full_url()
+        return replace_query_param(url, self.cursor_query_param, self.next_cursor)
@@ -2,7 +2,8 @@ import time
 from collections import OrderedDict
 import math
 
-from jet_bridge_base.db_types import queryset_count_optimized
+from jet_bridge_base.db import submit_request_count_query, cancel_request_count_query
+from jet_bridge_base.db_types import queryset_count_strategy, get_count_cache_scope
 from jet_bridge_base.exceptions.missing_argument_error import MissingArgumentError
 from jet_bridge_base.paginators.pagination import Pagination
 from jet_bridge_base.responses.json import JSONResponse
@@ -13,9 +14,11 @@ class PageNumberPagination(Pagination):
     default_page_size = 25
     page_query_param = 'page'
     page_size_query_param = '_per_page'
+    count_strategy_query_param = '_count'
     max_page_size = 10000
 
     count = None
+    count_exact = None
     count_query_time = None
     page_number = None
     page_size = None
@@ -31,20 +34,42 @@ class PageNumberPagination(Pagination):
         if not page_size:
             return None
 
-        data_query_start = time.time()
-        result = list(queryset.offset((page_number - 1) * page_size).limit(page_size))
-        data_query_end = time.time()
+        count_strategy = request.get_argument(self.count_strategy_query_param, None)
+        count_cache_scope = get_count_cache_scope(request)
+
+        def count_query(session):
+            count_query_start = time.time()
+            count, count_exact = queryset_count_strategy(
+                session,
+                queryset,
+                strategy=count_strategy,
+                cache_scope=count_cache_scope
+            )
+            count_query_end = time.time()
+
+            return count, count_exact, round(count_query_end - count_query_start, 3)
+
+        count_future = submit_request_count_query(request, count_query)
+
+        try:
+            data_query_start = time.time()
+            result = list(queryset.offset((page_number - 1) * page_size).limit(page_size))
+            data_query_end = time.time()
+        except Exception:
+            cancel_request_count_query(count_future)
+            raise
 
         self.data_query_time = round(data_query_end - data_query_start, 3)
 
-        count_query_start = time.time()
         if page_number == 1 and len(result) < page_size:
             self.count = len(result)
+            self.count_exact = True
+            self.count_query_time = 0.0
+            cancel_request_count_query(count_future)
+        elif count_future is not None:
+            self.count, self.count_exact, self.count_query_time = count_future.result()
         else:
-            self.count = queryset_count_optimized(request.session, queryset)
-        count_query_end = time.time()
-
-        self.count_query_time = round(count_query_end - count_query_start, 3)
+            self.count, self.count_exact, self.count_query_time = count_query(request.session)
 
         self.page_number = page_number
         self.page_size = page_size
@@ -58,6 +83,7 @@ class PageNumberPagination(Pagination):
     def get_paginated_response(self, request, data):
         return JSONResponse(OrderedDict([
             ('count', self.count),
+            ('count_exact', self.count_exact),
             ('next', self.get_next_link(request, data)),
             ('previous', self.get_previous_link(request)),
             ('results', data),
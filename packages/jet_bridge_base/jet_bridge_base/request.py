@@ -1,17 +1,14 @@
 import json
-import os
-import tempfile
 import time
 from json import JSONDecodeError
 
+from jet_bridge_base.db_types.rls import apply_session_rls
 from jet_bridge_base.exceptions.request_error import RequestError
 from jet_bridge_base.exceptions.validation_error import ValidationError
 from jet_bridge_base.utils.conf import get_conf
-from jet_bridge_base.utils.crypt import get_sha256_hash
 from jet_bridge_base.utils.process import get_memory_usage
 from six import string_types
 
-from jet_bridge_base import settings
 from jet_bridge_base.exceptions.missing_argument_error import MissingArgumentError
 
 _ARG_DEFAULT = object()
@@ -21,6 +18,11 @@ class Request(object):
 
     session = None
     bridge_settings = None
+    conf = None
+    connection = None
+    session_connection = None
+    session_detached = False
+    paginator = None
     project = None
     environment = None
     resource_token = None
@@ -161,50 +163,11 @@ class Request(object):
         if not bridge_settings_encoded:
             return
 
-        from jet_bridge_base.utils.crypt import decrypt
-
-        try:
-            secret_key = settings.TOKEN.replace('-', '').lower()
-            decrypted = decrypt(bridge_settings_encoded, secret_key)
-
-            self.bridge_settings = {
-                **json.loads(decrypted),
-                'raw': bridge_settings_encoded
-            }
-        except Exception:
-            return
-
-        database_ssl_ca = self.bridge_settings.get('database_ssl_ca')
-        database_ssl_cert = self.bridge_settings.get('database_ssl_cert')
-        database_ssl_key = self.bridge_settings.get('database_ssl_key')
-
-        temp_dir = os.path.join(tempfile.gettempdir(), 'ssl')
-
-        try:
-            os.makedirs(temp_dir)
-        except OSError:
-            pass
-
-        if database_ssl_ca:
-            self.bridge_settings['database_ssl_ca'] = self.save_file(temp_dir, '{}-ca.pem', database_ssl_ca)
-
-        if database_ssl_cert:
-            self.bridge_settings['database_ssl_cert'] = self.save_file(temp_dir, '{}-cert.pem', database_ssl_cert)
-
-        if database_ssl_key:
-            self.bridge_settings['database_ssl_key'] = self.save_file(temp_dir, '{}-key.pem', database_ssl_key)
+        from jet_bridge_base.utils.bridge_settings import decrypt_bridge_settings
 
+        self.bridge_settings = decrypt_bridge_settings(bridge_settings_encoded)
         return self.bridge_settings
 
-    def save_file(self, dir_path, name, content):
-        file_hash = get_sha256_hash(content)
-        file_path = os.path.join(dir_path, name.format(file_hash))
-
-        with open(file_path, 'w') as f:
-            f.write(content)
-
-        return f.name
-
     def start_track(self):
         self.track_start_time = time.time()
         self.track_start_memory_usage = get_memory_usage()
@@ -219,12 +182,12 @@ class Request(object):
             return
         return get_memory_usage() - self.track_start_memory_usage
 
-    def apply_rls_if_enabled(self):
+    def get_rls_key(self):
         conf = get_conf(self)
 
         if conf.get('rls_type') == 'supabase' and conf.get('rls_sso'):
             shared_data = (self.sso_shared_data or {}).get(conf['rls_sso'], {})
-            user_id = shared_data.get('user_id')
+            return conf['rls_type'], shared_data.get('user_id')
 
-            self.session.execute('SET ROLE authenticated')
-            self.session.execute('SELECT set_config(\'request.jwt.claim.sub\', :uid, TRUE)', {'uid': user_id})
+    def apply_rls_if_enabled(self, session=None):
+        apply_session_rls(session or self.session, self.get_rls_key())
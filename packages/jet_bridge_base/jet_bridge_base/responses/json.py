@@ -1,5 +1,4 @@
 from __future__ import absolute_import
-import json
 
 from jet_bridge_base import encoders
 from jet_bridge_base.responses.base import Response
@@ -22,8 +21,5 @@ class JSONResponse(Response):
         if self.data is None:
             return
 
-        self.rendered_data = json.dumps(
-            self.data,
-            cls=self.encoder_class
-        )
+        self.rendered_data = encoders.json_dumps(self.data, encoder_class=self.encoder_class)
         return self.rendered_data
@@ -0,0 +1,60 @@
+from __future__ import absolute_import
+
+from jet_bridge_base import encoders
+from jet_bridge_base.responses.streaming import StreamingResponse
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+
+class MsgpackResponse(StreamingResponse):
+    """
+    MessagePack response written as a sequence of objects: header with all data keys except `data`,
+    followed by one array of rows for each batch in `data`. Callable data values are resolved after
+    all batches are written and packed as trailer object. Types not supported
+    by MessagePack are converted the same way as in JSON responses.
+    """
+
+    encoder_class = encoders.JSONEncoder
+    data_key = 'data'
+
+    def __init__(self, *args, **kwargs):
+        self.rendered_data = None
+        super(MsgpackResponse, self).__init__(*args, **kwargs)
+
+    @classmethod
+    def is_available(cls):
+        return msgpack is not None
+
+    def default_headers(self):
+        return {'Content-Type': 'application/msgpack'}
+
+    def render_chunks(self):
+        try:
+            if self.data is None:
+                return
+
+            packer = msgpack.Packer(default=self.encoder_class().default, use_bin_type=True)
+            header = dict(filter(lambda x: x[0] != self.data_key and not callable(x[1]), self.data.items()))
+
+            yield packer.pack(header)
+
+            for batch in self.data.get(self.data_key, []):
+                yield packer.pack(batch)
+
+            trailer = dict(map(
+                lambda x: (x[0], x[1]()),
+                filter(lambda x: x[0] != self.data_key and callable(x[1]), self.data.items())
+            ))
+
+            if len(trailer):
+                yield packer.pack(trailer)
+        finally:
+            self.close()
+
+    def render(self):
+        if self.rendered_data is None:
+            self.rendered_data = b''.join(self.render_chunks()) if self.data is not None else None
+        return self.rendered_data
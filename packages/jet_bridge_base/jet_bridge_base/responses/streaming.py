@@ -0,0 +1,27 @@
+from __future__ import absolute_import
+
+from jet_bridge_base.responses.base import Response
+
+
+class StreamingResponse(Response):
+    """
+    Response written by chunks returned from render_chunks. `on_close` is called when rendering is finished
+    or interrupted.
+    """
+
+    def __init__(self, *args, **kwargs):
+        self.on_close = kwargs.pop('on_close', None)
+        super(StreamingResponse, self).__init__(*args, **kwargs)
+
+    def render_chunks(self):
+        raise NotImplementedError
+
+    def __iter__(self):
+        return self.render_chunks()
+
+    def close(self):
+        on_close = self.on_close
+        self.on_close = None
+
+        if on_close is not None:
+            on_close()
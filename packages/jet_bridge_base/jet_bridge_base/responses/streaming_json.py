@@ -0,0 +1,90 @@
+from __future__ import absolute_import
+
+from jet_bridge_base import encoders, settings
+from jet_bridge_base.responses.json import JSONResponse
+from jet_bridge_base.responses.streaming import StreamingResponse
+
+
+class StreamingJSONResponse(StreamingResponse, JSONResponse):
+    """
+    JSON response written by chunks. Iterators inside data are rendered as JSON arrays while being consumed,
+    so only one chunk of items is kept in memory.
+    """
+
+    def __init__(self, *args, **kwargs):
+        self.chunk_size = kwargs.pop('chunk_size', None) or settings.STREAM_CHUNK_SIZE
+        super(StreamingJSONResponse, self).__init__(*args, **kwargs)
+
+    def is_iterator(self, value):
+        return hasattr(value, '__next__') and not isinstance(value, (str, bytes, dict, list, tuple))
+
+    def is_streamed(self, value):
+        # Lazy values and iterators can't be passed to JSON backend, so dicts containing them are rendered by keys
+        if callable(value) or self.is_iterator(value):
+            return True
+        elif isinstance(value, dict):
+            return any(map(lambda x: self.is_streamed(x), value.values()))
+        else:
+            return False
+
+    def render_iterator_chunks(self, backend, value):
+        separator = backend.item_separator
+        chunk = []
+        first = True
+
+        yield '['
+
+        for item in value:
+            chunk.append(backend.dumps(item, encoder_class=self.encoder_class))
+
+            if len(chunk) >= self.chunk_size:
+                yield ('' if first else separator) + separator.join(chunk)
+                chunk = []
+                first = False
+
+        if len(chunk):
+            yield ('' if first else separator) + separator.join(chunk)
+
+        yield ']'
+
+    def render_value_chunks(self, backend, value):
+        if callable(value):
+            # Lazy values are resolved when reached, after iterators rendered before them are consumed
+            value = value()
+
+        if self.is_iterator(value):
+            for chunk in self.render_iterator_chunks(backend, value):
+                yield chunk
+        elif isinstance(value, dict) and self.is_streamed(value):
+            yield '{'
+
+            for i, (key, item) in enumerate(value.items()):
+                yield '{}{}{}'.format(
+                    backend.item_separator if i > 0 else '',
+                    backend.dumps(str(key)),
+                    backend.key_separator
+                )
+
+                for chunk in self.render_value_chunks(backend, item):
+                    yield chunk
+
+            yield '}'
+        else:
+            yield backend.dumps(value, encoder_class=self.encoder_class)
+
+    def render_chunks(self):
+        try:
+            if self.data is None:
+                return
+
+            backend = encoders.get_json_backend()
+
+            for chunk in self.render_value_chunks(backend, self.data):
+                yield chunk
+        finally:
+            self.close()
+
+    def render(self):
+        if self.rendered_data is None:
+            self.rendered_data = ''.join(self.render_chunks()) if self.data is not None else None
+        return self.rendered_data
@@ -1,8 +1,9 @@
+from jet_bridge_base.db import request_connection_cache, MODEL_SERIALIZERS_CACHE_KEY
 from jet_bridge_base.db_types import inspect_uniform
 from jet_bridge_base.serializers.model_serializer import ModelSerializer
 
 
-def get_model_serializer(Model):
+def create_model_serializer(Model):
     mapper = inspect_uniform(Model)
 
     class CustomModelSerializer(ModelSerializer):
@@ -11,3 +12,24 @@ def get_model_serializer(Model):
             model_fields = list(map(lambda x: x.key, mapper.columns))
 
     return CustomModelSerializer
+
+
+def get_model_serializer(Model, request=None):
+    if request is None:
+        return create_model_serializer(Model)
+
+    # Serializer classes are cached per connection and cleared when mapped base is reloaded
+    with request_connection_cache(request) as cache:
+        serializers = cache.get(MODEL_SERIALIZERS_CACHE_KEY)
+
+        if serializers is None:
+            serializers = {}
+            cache[MODEL_SERIALIZERS_CACHE_KEY] = serializers
+
+        serializer_class = serializers.get(Model)
+
+        if serializer_class is None:
+            serializer_class = create_model_serializer(Model)
+            serializers[Model] = serializer_class
+
+        return serializer_class
@@ -66,21 +66,37 @@ class ModelSerializer(Serializer):
         self.session = kwargs.get('context', {}).get('session', None)
         self.model = self.meta.model
 
-    def get_fields(self):
-        result = super(ModelSerializer, self).get_fields()
-
-        if hasattr(self.meta, 'model_fields'):
-            mapper = inspect_uniform(self.meta.model)
+    @classmethod
+    def get_model_fields_types(cls):
+        # Resolved once per serializer class, model serializer classes are cached per connection
+        result = cls.__dict__.get('_model_fields_types')
+
+        if result is None:
+            meta = getattr(cls, 'Meta', None)
+            mapper = inspect_uniform(meta.model)
             columns = dict(map(lambda x: (x.key, x), mapper.columns))
+            result = []
 
-            for field_name in self.meta.model_fields:
+            for field_name in meta.model_fields:
                 column = columns.get(field_name)
                 data_type = get_column_data_type(column)
-                kwargs = {'context': {**(self.context or {}), 'model_field': column}, 'serializer': self}
-
                 # if column.primary_key and column.autoincrement:
                 #     kwargs['read_only'] = True
-                if column.autoincrement or column.default or column.server_default or column.nullable:
+                required = not (column.autoincrement or column.default or column.server_default or column.nullable)
+                result.append((field_name, column, data_type, required))
+
+            cls._model_fields_types = result
+
+        return result
+
+    def get_fields(self):
+        result = super(ModelSerializer, self).get_fields()
+
+        if hasattr(self.meta, 'model_fields'):
+            for field_name, column, data_type, required in self.get_model_fields_types():
+                kwargs = {'context': {**(self.context or {}), 'model_field': column}, 'serializer': self}
+
+                if not required:
                     kwargs['required'] = False
 
                 field = data_type(**kwargs)
@@ -1,5 +1,6 @@
 from jet_bridge_base import fields
-from jet_bridge_base.db import get_mapped_base, reload_request_graphql_schema, get_request_connection
+from jet_bridge_base.db import get_mapped_base, reload_request_graphql_schema, get_request_connection, \
+    reload_request_model_descriptions_cache
 from jet_bridge_base.db_types import inspect_uniform
 from jet_bridge_base.exceptions.validation_error import ValidationError
 from jet_bridge_base.models.model_relation_override import ModelRelationOverrideModel
@@ -103,3 +104,4 @@ class ModelDescriptionRelationOverridesSerializer(Serializer):
                         session.delete(override)
 
         reload_request_graphql_schema(request, draft)
+        reload_request_model_descriptions_cache(request, list(map(lambda x: x['model'], self.validated_data)))
@@ -4,6 +4,8 @@ try:
 except ImportError:
     from collections import OrderedDict, Mapping, Iterable
 
+from functools import partial
+
 import six
 
 from jet_bridge_base.exceptions.validation_error import ValidationError
@@ -39,6 +41,7 @@ class Serializer(Field):
     validated_data = None
     fields = []
     errors = None
+    representation_plan = None
 
     def __init__(self, *args, **kwargs):
         self.instance = kwargs.pop('instance', None)
@@ -50,6 +53,7 @@ class Serializer(Field):
 
     def update_fields(self):
         self.fields = self.get_fields()
+        self.representation_plan = None
 
     def get_fields(self):
         result = []
@@ -134,22 +138,38 @@ class Serializer(Field):
 
         return result
 
+    def get_representation_plan(self):
+        # (field_name, converter, required) for readable fields, converter is None if value is represented as is
+        if self.representation_plan is None:
+            self.representation_plan = list(map(
+                lambda x: (
+                    x.field_name,
+                    None if x.representation_identity and not x.many else x.to_representation,
+                    x.required
+                ),
+                self.readable_fields
+            ))
+
+        return self.representation_plan
+
     def to_representation_item(self, value):
         result = OrderedDict()
 
-        for field in self.readable_fields:
-            if isinstance(value, Mapping):
-                field_value = value.get(field.field_name, empty)
-            else:
-                field_value = getattr(value, field.field_name, empty)
+        if isinstance(value, Mapping):
+            get_value = value.get
+        else:
+            get_value = partial(getattr, value)
+
+        for field_name, converter, required in self.get_representation_plan():
+            field_value = get_value(field_name, empty)
 
             if field_value is empty:
-                if not field.required:
+                if not required:
                     continue
                 else:
                     field_value = None
 
-            result[field.field_name] = field.to_representation(field_value)
+            result[field_name] = converter(field_value) if converter is not None else field_value
 
         return result
 
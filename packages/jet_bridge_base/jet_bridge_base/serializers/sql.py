@@ -1,24 +1,138 @@
 import datetime
 import time
 
-from sqlalchemy import text, select, column, func, desc, or_, cast
+from sqlalchemy import text, select, column, desc, or_, cast
 from sqlalchemy import sql
 from sqlalchemy.sql import sqltypes, quoted_name
 from sqlalchemy.exc import SQLAlchemyError
 
-from jet_bridge_base import fields
-from jet_bridge_base.db import get_type_code_to_sql_type
+from jet_bridge_base import fields, settings
+from jet_bridge_base.encoders import json_dumps
+from jet_bridge_base.db import get_type_code_to_sql_type, get_default_timezone, submit_request_count_query, \
+    cancel_request_count_query, map_request_batch_queries
 from jet_bridge_base.db_types import get_session_engine, apply_session_timezone, get_sql_aggregate_func_by_name, \
-    get_sql_group_func_lookup
-from jet_bridge_base.fields.datetime import datetime_apply_default_timezone
+    get_sql_group_func_lookup, queryset_count_strategy, get_count_cache_scope, apply_session_search_path, \
+    create_pool_session, apply_session_rls, COUNT_STRATEGIES
+from jet_bridge_base.fields.datetime import datetime_apply_timezone
 from jet_bridge_base.exceptions.sql import SqlError
 from jet_bridge_base.exceptions.validation_error import ValidationError
 from jet_bridge_base.fields.sql_params import SqlParamsSerializers
 from jet_bridge_base.filters import lookups
 from jet_bridge_base.filters.filter import EMPTY_VALUES
 from jet_bridge_base.filters.filter_for_dbfield import filter_for_data_type
+from jet_bridge_base.responses.msgpack import MsgpackResponse
 from jet_bridge_base.serializers.serializer import Serializer
+from jet_bridge_base.utils.conf import get_conf
 from jet_bridge_base.utils.db_types import map_to_sql_type, sql_to_map_type
+from jet_bridge_base.utils.sql_cache import get_sql_cache_key, get_sql_cache_scope, get_sql_cache_generation, \
+    get_cached_sql_response, set_cached_sql_response, invalidate_sql_cache, is_read_only_query
+
+# List of rows, each row is a list of values
+SQL_FORMAT_ROWS = 'rows'
+# List of columns, each column is a list of values
+SQL_FORMAT_COLUMNS = 'columns'
+# MessagePack header object followed by arrays of rows for each fetched batch,
+# streamed results end with {"row_count": ..., "truncated": ...} object
+SQL_FORMAT_MSGPACK = 'msgpack'
+
+SQL_FORMATS = [
+    SQL_FORMAT_ROWS,
+    SQL_FORMAT_COLUMNS,
+    SQL_FORMAT_MSGPACK
+]
+
+
+def fetch_result_batches(result, size):
+    while True:
+        rows = result.fetchmany(size)
+
+        if not rows:
+            break
+
+        yield rows
+
+
+# Rows of each fetched batch encoded to estimate JSON size of the whole batch
+SQL_SIZE_SAMPLE_ROWS = 10
+
+
+def estimate_rows_size(rows):
+    """
+    Approximate JSON encoded size of rows extrapolated from evenly spaced sample rows,
+    so rows are not encoded twice only to be measured.
+    """
+
+    if len(rows) <= SQL_SIZE_SAMPLE_ROWS:
+        return len(json_dumps(rows))
+
+    step = len(rows) / SQL_SIZE_SAMPLE_ROWS
+    sample = list(map(lambda i: rows[int(i * step)], range(SQL_SIZE_SAMPLE_ROWS)))
+
+    return int(len(json_dumps(sample)) * len(rows) / SQL_SIZE_SAMPLE_ROWS)
+
+
+def get_rows_within_size(rows, max_size):
+    """
+    Returns rows which JSON encoded size is within max_size and their size.
+    """
+
+    size = 0
+
+    for i, row in enumerate(rows):
+        row_size = len(json_dumps(row)) + 1
+
+        if size + row_size > max_size:
+            return rows[:i], size
+
+        size += row_size
+
+    return rows, size
+
+
+def fetch_result_batches_limited(result, size, map_row, max_rows=None, max_size=None, state=None):
+    """
+    Yields batches of mapped rows until max_rows rows or about max_size bytes of JSON encoded rows are fetched.
+    Batch sizes are estimated from sample rows, rows are encoded one by one only when limit is close.
+    state['rows'] is increased by the number of returned rows, state['truncated'] is set when result had
+    more rows than were returned.
+    """
+
+    rows_count = 0
+    rows_size = 0
+
+    for rows in fetch_result_batches(result, size):
+        rows = list(map(map_row, rows))
+        truncated = False
+
+        if max_rows and rows_count + len(rows) > max_rows:
+            rows = rows[:max_rows - rows_count]
+            truncated = True
+
+        if max_size:
+            batch_size = estimate_rows_size(rows)
+
+            if rows_size + batch_size > max_size:
+                batch_rows_count = len(rows)
+                rows, batch_size = get_rows_within_size(rows, max_size - rows_size)
+                truncated = truncated or len(rows) < batch_rows_count
+
+            rows_size += batch_size
+
+        rows_count += len(rows)
+
+        if state is not None:
+            state['rows'] = state.get('rows', 0) + len(rows)
+
+        if len(rows):
+            yield rows
+
+        if truncated:
+            if state is not None:
+                state['truncated'] = True
+
+            # Rest of the rows are not fetched from server-side cursor
+            result.close()
+            break
 
 
 class ColumnSerializer(Serializer):
@@ -60,6 +174,8 @@ class SqlSerializer(Serializer):
     limit = fields.IntegerField(required=False)
     order_by = fields.CharField(many=True, required=False)
     count = fields.BooleanField(default=False)
+    count_strategy = fields.CharField(required=False)
+    format = fields.CharField(required=False)
     columns = ColumnSerializer(many=True, required=False)
     filters = FilterItemSerializer(many=True, required=False)
     aggregate = AggregateSerializer(required=False)
@@ -90,6 +206,14 @@ class SqlSerializer(Serializer):
                 attrs['query'] = attrs['query'].replace('%s', ':param_{}'.format(i), 1)
                 i += 1
 
+        if attrs.get('count_strategy') and attrs['count_strategy'] not in COUNT_STRATEGIES:
+            raise ValidationError({'count_strategy': 'unknown count strategy'})
+
+        if attrs.get('format') and attrs['format'] not in SQL_FORMATS:
+            raise ValidationError({'format': 'unknown format, available: {}'.format(', '.join(SQL_FORMATS))})
+        elif attrs.get('format') == SQL_FORMAT_MSGPACK and not MsgpackResponse.is_available():
+            raise ValidationError({'format': 'msgpack package is not installed'})
+
         if 'limit' in attrs:
             if attrs['limit'] > 1000:
                 attrs['limit'] = 1000
@@ -158,10 +282,8 @@ class SqlSerializer(Serializer):
         else:
             return queryset.group_by(*x_lookup_names).order_by(*x_lookup_names)
 
-    def filter_queryset(self, queryset, data):
+    def filter_queryset(self, queryset, data, session):
         filters_instances = []
-        request = self.context.get('request')
-        session = request.session
 
         for item in data.get('columns', []):
             query_type = map_to_sql_type(item['data_type'])()
@@ -264,11 +386,69 @@ class SqlSerializer(Serializer):
 
         return queryset
 
-    def execute(self, data):
+    def get_execute_state(self, request):
+        """
+        Request dependent values used while executing query. They are captured on request thread,
+        so cache refresh can execute query after request is finished without accessing it.
+        """
+
+        return {
+            'conf': get_conf(request),
+            'rls_key': request.get_rls_key(),
+            'count_cache_scope': get_count_cache_scope(request),
+            'count_concurrent': True,
+            'default_timezone': get_default_timezone(request),
+            'type_code_to_sql_type': get_type_code_to_sql_type(request)
+        }
+
+    def execute_cached(self, data, cache_key, session=None, state=None):
         request = self.context.get('request')
-        session = request.session
+        engine = (session or request.session).get_bind()
+        scope = get_sql_cache_scope(request)
+        state = state or self.get_execute_state(request)
+
+        def execute_query(query_session=None, query_state=None):
+            generation = get_sql_cache_generation(scope)
+            response = self.execute(data, session=query_session, use_cache=False, state=query_state or state)
+            set_cached_sql_response(cache_key, scope, generation, data['query'], response)
+            return response
+
+        def refresh():
+            # Request session can already be used by another request, refresh runs on new session from engine
+            refresh_session = create_pool_session(engine)
+
+            if refresh_session is None:
+                return
+
+            try:
+                # Count is not submitted with request, it is executed on refresh session
+                execute_query(refresh_session, dict(state, count_concurrent=False))
+            finally:
+                refresh_session.close()
+
+        response = get_cached_sql_response(cache_key, refresh)
+
+        if response is not None:
+            return response
+
+        return execute_query(session)
+
+    def execute(self, data, stream=False, session=None, use_cache=True, state=None):
+        request = self.context.get('request')
+        state = state or self.get_execute_state(request)
+
+        if use_cache and data.get('format') != SQL_FORMAT_MSGPACK:
+            cache_key = get_sql_cache_key(request, data)
+
+            if cache_key is not None:
+                # Cached responses are stored fully fetched, so they are not streamed
+                return self.execute_cached(data, cache_key, session, state)
+
+        session = session or request.session
+        streamed = False
 
         query = data['query']
+        result_format = data.get('format') or SQL_FORMAT_ROWS
 
         if data['v'] >= 2:
             params = data.get('params_obj', {})
@@ -284,33 +464,50 @@ class SqlSerializer(Serializer):
 
         if 'schema' in data:
             try:
-                session.execute('SET search_path TO :schema', {'schema': data['schema']})
+                apply_session_search_path(session, data['schema'])
             except SQLAlchemyError:
                 session.rollback()
                 pass
 
-        request.apply_rls_if_enabled()
+        apply_session_rls(session, state['rls_key'])
 
         subquery = text(query).columns().subquery('__jet_q2')
         count_rows = None
+        count_exact = None
         count_query_time = None
+        count_future = None
+        count_cache_scope = state['count_cache_scope']
 
-        if data['count']:
+        def count_query(count_session):
             try:
-                count_queryset = select([func.count()]).select_from(subquery)
-                count_queryset = self.filter_queryset(count_queryset, data)
+                count_queryset = select(['*']).select_from(subquery)
+                count_queryset = self.filter_queryset(count_queryset, data, count_session)
 
                 count_query_start = time.time()
-                count_result = session.execute(count_queryset, params)
-                count_rows = count_result.all()[0][0]
+                count_result, count_result_exact = queryset_count_strategy(
+                    count_session,
+                    count_queryset,
+                    strategy=data.get('count_strategy'),
+                    params=params,
+                    cache_scope=count_cache_scope
+                )
                 count_query_end = time.time()
 
-                count_query_time = round(count_query_end - count_query_start, 3)
+                return count_result, count_result_exact, round(count_query_end - count_query_start, 3)
             except SQLAlchemyError:
-                session.rollback()
+                count_session.rollback()
             except Exception:
                 pass
 
+            return None, None, None
+
+        if data['count']:
+            if state['count_concurrent']:
+                count_future = submit_request_count_query(request, count_query, session)
+
+            if count_future is None:
+                count_rows, count_exact, count_query_time = count_query(session)
+
         try:
             if 'aggregate' in data:
                 queryset = self.aggregate_queryset(subquery, data, session)
@@ -321,7 +518,7 @@ class SqlSerializer(Serializer):
             else:
                 queryset = text(query)
 
-            queryset = self.filter_queryset(queryset, data)
+            queryset = self.filter_queryset(queryset, data, session)
 
             if 'aggregate' not in data and 'group' not in data and 'groups' not in data:
                 queryset = self.paginate_queryset(queryset, data)
@@ -330,13 +527,21 @@ class SqlSerializer(Serializer):
                 queryset = self.sort_queryset(queryset, data, session)
 
             data_query_start = time.time()
-            result = session.execute(queryset, params)
+            if is_read_only_query(query):
+                # Server-side cursor, rows are fetched by batches instead of loading whole result into memory
+                result = session.execute(queryset, params, execution_options={'stream_results': True})
+            else:
+                result = session.execute(queryset, params)
             data_query_end = time.time()
 
             data_query_time = round(data_query_end - data_query_start, 3)
 
+            if count_future is not None:
+                count_rows, count_exact, count_query_time = count_future.result()
+
             if not result.returns_rows:
                 session.commit()
+                invalidate_sql_cache(request)
 
                 response = {
                     "row_count": result.rowcount,
@@ -356,13 +561,22 @@ class SqlSerializer(Serializer):
                         except UnicodeDecodeError:
                             return x.hex()
                     elif isinstance(x, datetime.datetime):
-                        x = datetime_apply_default_timezone(x, request)
+                        x = datetime_apply_timezone(x, state['default_timezone'])
                         return x
                     else:
                         return x
 
                 def map_row(row):
-                    return list(map(lambda x: map_row_column(row[x]), row.keys()))
+                    return list(map(map_row_column, row))
+
+                def map_columns(batches):
+                    columns = list(map(lambda x: [], column_names))
+
+                    for rows in batches:
+                        for i, values in enumerate(zip(*rows)):
+                            columns[i].extend(values)
+
+                    return columns
 
                 column_names = result.keys()
 
@@ -370,13 +584,45 @@ class SqlSerializer(Serializer):
                     column_names = list(map(lambda x: 'group' if x == 'group_1' else x, column_names))
 
                 cursor_description = result.cursor.description
+                conf = state['conf']
+                fetch_state = {'rows': 0, 'truncated': False}
+                batches = fetch_result_batches_limited(
+                    result,
+                    settings.STREAM_CHUNK_SIZE,
+                    map_row,
+                    max_rows=conf.get('sql_max_rows'),
+                    max_size=conf.get('sql_max_response_size'),
+                    state=fetch_state
+                )
+
+                if result_format == SQL_FORMAT_COLUMNS:
+                    response_data = map_columns(batches)
+                elif result_format == SQL_FORMAT_MSGPACK:
+                    response_data = batches
+                else:
+                    response_data = (row for rows in batches for row in rows)
+
+                if stream and result_format != SQL_FORMAT_COLUMNS:
+                    # Rows are fetched while response is written, session is closed by response
+                    streamed = True
+                    # Known only after all rows are written, so they are rendered after data
+                    row_count = lambda: fetch_state['rows']
+                    truncated = lambda: fetch_state['truncated']
+                else:
+                    response_data = list(response_data)
+                    row_count = fetch_state['rows']
+                    truncated = fetch_state['truncated']
+
+                # Driver rowcount is not known for server-side cursors, returned rows are counted instead.
+                # Lazy values should follow data to be rendered after it
                 response = {
-                    "row_count": result.rowcount,
-                    'data': list(map(map_row, result)),
+                    'data': response_data,
+                    "row_count": row_count,
+                    'truncated': truncated,
                     'columns': list(map(map_column, column_names))
                 }
 
-                type_code_to_sql_type = get_type_code_to_sql_type(request)
+                type_code_to_sql_type = state['type_code_to_sql_type']
                 if type_code_to_sql_type:
                     def map_column_description(column):
                         name = column.name if hasattr(column, 'name') else ''
@@ -390,6 +636,7 @@ class SqlSerializer(Serializer):
 
             if count_rows is not None:
                 response['count'] = count_rows
+                response['count_exact'] = count_exact
 
             if hasattr(queryset, '_limit'):
                 response['limit'] = queryset._limit
@@ -408,19 +655,39 @@ class SqlSerializer(Serializer):
         except Exception as e:
             raise SqlError(e)
         finally:
-            session.close()
+            # Count is not awaited when data query fails, it should not keep running after request
+            cancel_request_count_query(count_future)
+
+            if not streamed:
+                session.close()
 
 
 class SqlsSerializer(Serializer):
     queries = SqlSerializer(many=True)
 
+    def validate(self, attrs):
+        if any(map(lambda x: x.get('format') == SQL_FORMAT_MSGPACK, attrs['queries'])):
+            raise ValidationError({'queries': 'msgpack format is supported only for single query'})
+
+        return attrs
+
     def execute(self, data):
+        request = self.context.get('request')
         serializer = SqlSerializer(context=self.context)
+        # Captured once on request thread, queries are executed on pooled sessions in other threads
+        state = serializer.get_execute_state(request)
+
+        def map_query(session, query):
+            query_start = time.time()
 
-        def map_query(query):
             try:
-                return serializer.execute(query)
+                result = serializer.execute(query, session=session, state=state)
             except SqlError as e:
-                return {'error': str(e.detail)}
+                result = {'error': str(e.detail)}
+
+            query_end = time.time()
+            result['query_time'] = round(query_end - query_start, 3)
+
+            return result
 
-        return list(map(map_query, data['queries']))
+        return map_request_batch_queries(request, data['queries'], map_query)
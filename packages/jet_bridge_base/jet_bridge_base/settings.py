@@ -43,7 +43,13 @@ DATABASE_TIMEZONE = None
 DATABASE_RLS_TYPE = None
 DATABASE_RLS_SSO = None
 DATABASE_RLS_USER_PROPERTY = None
+DATABASE_SQL_MAX_ROWS = 1000000
+DATABASE_SQL_MAX_RESPONSE_SIZE = 256 * 1024 * 1024
 DATABASE_REFLECT_MAX_RECORDS = None
+DATABASE_REFLECT_THREADS = None
+DATABASE_REFLECT_SAMPLE = True
+DATABASE_BULK_WRITE_SIZE = None
+DATABASE_LAZY_MAPPING = False
 
 DATABASE_SSL_CA = None
 DATABASE_SSL_CERT = None
@@ -64,6 +70,33 @@ STORE_PATH = None
 CACHE_METADATA = False
 CACHE_METADATA_PATH = None
 CACHE_MODEL_DESCRIPTIONS = False
+CACHE_GRAPHQL_SCHEMA = False
+
+BRIDGE_SETTINGS_CACHE_SIZE = 1000
+BRIDGE_SETTINGS_CACHE_TTL = 300
+
+COUNT_STRATEGY = 'auto'
+COUNT_CAP = 10000
+COUNT_CACHE_SIZE = 1000
+COUNT_CACHE_TTL = 60
+COUNT_CONCURRENT = False
+
+STREAM_RESPONSES = False
+STREAM_CHUNK_SIZE = 1000
+
+JSON_BACKEND = 'json'
+GRAPHQL_LAZY_SCHEMA = False
+GRAPHQL_DOCUMENTS_CACHE_SIZE = 1000
+GRAPHQL_PERSISTED_QUERIES = False
+GRAPHQL_PERSISTED_QUERIES_CACHE_SIZE = 1000
+
+SQL_BATCH_CONCURRENCY = 0
+SQL_CACHE_TTL = 0
+SQL_CACHE_STALE_TTL = 60
+SQL_CACHE_SIZE = 1000
+SQL_CACHE_MAX_MEMORY = 64 * 1024 * 1024
+
+COALESCE_REQUESTS = False
 
 SSO_APPLICATIONS = {}
 
@@ -80,6 +113,9 @@ TRACK_QUERY_SLOW_TIME = None
 TRACK_QUERY_HIGH_MEMORY = None
 
 RELEASE_INACTIVE_GRAPHQL_SCHEMAS_TIMEOUT = None
+RELEASE_INACTIVE_CONNECTIONS_TIMEOUT = None
+CONNECTIONS_LIMIT = None
+CONNECTIONS_MEMORY_LIMIT = None
 
 DISABLE_AUTH = None
 
@@ -0,0 +1,94 @@
+import json
+import os
+import tempfile
+import threading
+
+from jet_bridge_base import settings
+from jet_bridge_base.utils.cache import TTLCache
+from jet_bridge_base.utils.crypt import decrypt, get_sha256_hash
+
+bridge_settings_cache = TTLCache(
+    max_size=lambda: settings.BRIDGE_SETTINGS_CACHE_SIZE,
+    ttl=lambda: settings.BRIDGE_SETTINGS_CACHE_TTL
+)
+saved_ssl_files = set()
+saved_ssl_files_lock = threading.Lock()
+
+
+def is_bridge_settings_cache_enabled():
+    return bool(settings.BRIDGE_SETTINGS_CACHE_SIZE)
+
+
+def get_bridge_settings_cache_key(bridge_settings_encoded, secret_key):
+    return get_sha256_hash('{}:{}'.format(secret_key, bridge_settings_encoded))
+
+
+def save_ssl_file(dir_path, name, content):
+    file_hash = get_sha256_hash(content)
+    file_path = os.path.join(dir_path, name.format(file_hash))
+
+    with saved_ssl_files_lock:
+        if file_path in saved_ssl_files and os.path.exists(file_path):
+            return file_path
+
+        with open(file_path, 'w') as f:
+            f.write(content)
+
+        saved_ssl_files.add(file_path)
+
+    return file_path
+
+
+def save_bridge_settings_ssl_files(bridge_settings):
+    database_ssl_ca = bridge_settings.get('database_ssl_ca')
+    database_ssl_cert = bridge_settings.get('database_ssl_cert')
+    database_ssl_key = bridge_settings.get('database_ssl_key')
+
+    if not database_ssl_ca and not database_ssl_cert and not database_ssl_key:
+        return
+
+    temp_dir = os.path.join(tempfile.gettempdir(), 'ssl')
+
+    try:
+        os.makedirs(temp_dir)
+    except OSError:
+        pass
+
+    if database_ssl_ca:
+        bridge_settings['database_ssl_ca'] = save_ssl_file(temp_dir, '{}-ca.pem', database_ssl_ca)
+
+    if database_ssl_cert:
+        bridge_settings['database_ssl_cert'] = save_ssl_file(temp_dir, '{}-cert.pem', database_ssl_cert)
+
+    if database_ssl_key:
+        bridge_settings['database_ssl_key'] = save_ssl_file(temp_dir, '{}-key.pem', database_ssl_key)
+
+
+def decrypt_bridge_settings(bridge_settings_encoded):
+    if not settings.TOKEN:
+        return
+
+    secret_key = settings.TOKEN.replace('-', '').lower()
+    cache_enabled = is_bridge_settings_cache_enabled()
+    cache_key = get_bridge_settings_cache_key(bridge_settings_encoded, secret_key) if cache_enabled else None
+
+    if cache_enabled:
+        cached = bridge_settings_cache.get(cache_key)
+        if cached is not None:
+            return dict(cached)
+
+    try:
+        decrypted = decrypt(bridge_settings_encoded, secret_key)
+        bridge_settings = {
+            **json.loads(decrypted),
+            'raw': bridge_settings_encoded
+        }
+    except Exception:
+        return
+
+    save_bridge_settings_ssl_files(bridge_settings)
+
+    if cache_enabled:
+        bridge_settings_cache.set(cache_key, bridge_settings)
+
+    return dict(bridge_settings)
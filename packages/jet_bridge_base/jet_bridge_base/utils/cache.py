@@ -0,0 +1,134 @@
+import threading
+import time
+from collections import OrderedDict
+
+
+def resolve_option(value):
+    if callable(value):
+        return value()
+    return value
+
+
+class TTLCache(object):
+    """
+    Thread-safe LRU cache with optional per-item TTL.
+
+    `max_size`, `max_memory` and `ttl` can be callables, so limits are read from settings
+    at access time and not at import time. `max_memory` limits sum of item sizes passed to `set`.
+    """
+
+    def __init__(self, max_size=None, ttl=None, max_memory=None):
+        self.max_size = max_size
+        self.max_memory = max_memory
+        self.ttl = ttl
+        self.items = OrderedDict()
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.memory = 0
+
+    def get_max_size(self):
+        return resolve_option(self.max_size)
+
+    def get_max_memory(self):
+        return resolve_option(self.max_memory)
+
+    def get_ttl(self):
+        return resolve_option(self.ttl)
+
+    def is_expired(self, item, now):
+        return item['expires'] is not None and item['expires'] <= now
+
+    def get(self, key, default=None):
+        now = time.time()
+
+        with self.lock:
+            item = self.items.get(key)
+
+            if item is not None and self.is_expired(item, now):
+                self.pop_item(key)
+                item = None
+
+            if item is None:
+                self.misses += 1
+                return default
+
+            self.items.move_to_end(key)
+            self.hits += 1
+            return item['value']
+
+    def pop_item(self, key=None):
+        if key is None:
+            key, item = self.items.popitem(last=False)
+        else:
+            item = self.items.pop(key, None)
+
+        if item is not None:
+            self.memory -= item['memory']
+
+        return item
+
+    def set(self, key, value, ttl=None, memory=None):
+        ttl = ttl if ttl is not None else self.get_ttl()
+        max_size = self.get_max_size()
+        max_memory = self.get_max_memory()
+        expires = time.time() + ttl if ttl else None
+
+        with self.lock:
+            self.pop_item(key)
+            self.items[key] = {'value': value, 'expires': expires, 'memory': memory or 0}
+            self.memory += memory or 0
+
+            if max_size is not None:
+                while len(self.items) > max(max_size, 0):
+                    self.pop_item()
+                    self.evictions += 1
+
+            if max_memory is not None:
+                while len(self.items) and self.memory > max_memory:
+                    self.pop_item()
+                    self.evictions += 1
+
+    def delete(self, key):
+        with self.lock:
+            return self.pop_item(key) is not None
+
+    def delete_matching(self, predicate):
+        with self.lock:
+            keys = list(map(
+                lambda x: x[0],
+                filter(lambda x: predicate(x[0], x[1]['value']), self.items.items())
+            ))
+
+            for key in keys:
+                self.pop_item(key)
+
+            return len(keys)
+
+    def clear(self):
+        with self.lock:
+            self.items.clear()
+            self.memory = 0
+
+    def __len__(self):
+        return len(self.items)
+
+    def get_stats(self):
+        with self.lock:
+            requests = self.hits + self.misses
+            stats = {
+                'size': len(self.items),
+                'max_size': self.get_max_size(),
+                'ttl': self.get_ttl(),
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'hit_ratio': round(self.hits / requests, 3) if requests else None
+            }
+
+            if self.max_memory is not None:
+                stats['memory'] = self.memory
+                stats['max_memory'] = self.get_max_memory()
+
+            return stats
@@ -85,9 +85,16 @@ def any_type_sorter(value):
 
 def unique(arr):
     result = []
+    seen = set()
     for item in arr:
-        if item not in result:
-            result.append(item)
+        try:
+            if item in seen:
+                continue
+            seen.add(item)
+        except TypeError:
+            if item in result:
+                continue
+        result.append(item)
     return result
 
 
@@ -27,6 +27,8 @@ def get_settings_conf():
         'rls_type': settings.DATABASE_RLS_TYPE,
         'rls_sso': settings.DATABASE_RLS_SSO,
         'rls_user_property': settings.DATABASE_RLS_USER_PROPERTY,
+        'sql_max_rows': settings.DATABASE_SQL_MAX_ROWS,
+        'sql_max_response_size': settings.DATABASE_SQL_MAX_RESPONSE_SIZE,
         'ssl_ca': settings.DATABASE_SSL_CA,
         'ssl_cert': settings.DATABASE_SSL_CERT,
         'ssl_key': settings.DATABASE_SSL_KEY,
@@ -63,6 +65,11 @@ def get_request_conf(request):
         'rls_type': bridge_settings.get('database_rls_type'),
         'rls_sso': bridge_settings.get('database_rls_sso'),
         'rls_user_property': bridge_settings.get('database_rls_user_property'),
+        'sql_max_rows': bridge_settings.get('database_sql_max_rows', settings.DATABASE_SQL_MAX_ROWS),
+        'sql_max_response_size': bridge_settings.get(
+            'database_sql_max_response_size',
+            settings.DATABASE_SQL_MAX_RESPONSE_SIZE
+        ),
         'ssl_ca': bridge_settings.get('database_ssl_ca'),
         'ssl_cert': bridge_settings.get('database_ssl_cert'),
         'ssl_key': bridge_settings.get('database_ssl_key'),
@@ -76,12 +83,17 @@ def get_request_conf(request):
 
 
 def get_conf(request):
+    if request.conf is not None:
+        return request.conf
+
     request_conf = get_request_conf(request)
 
     if request_conf:
-        return request_conf
+        request.conf = request_conf
     else:
-        return get_settings_conf()
+        request.conf = get_settings_conf()
+
+    return request.conf
 
 
 def get_connection_id(conf):
@@ -1,22 +1,35 @@
 import re
+import threading
 import time
+import weakref
+from collections import OrderedDict
+from datetime import datetime
+
 import graphene
+from graphql import parse
+from graphql.language import ast
+from graphql.utils.build_ast_schema import build_ast_schema
+from graphql.utils.schema_printer import print_schema
 from jet_bridge_base.utils.base62 import utf8_to_base62
 from sqlalchemy.engine import Row
 from sqlalchemy.orm import MANYTOONE, ONETOMANY, Query
 
-from jet_bridge_base.db import get_mapped_base, get_engine, get_request_connection
-from jet_bridge_base.db_types import desc_uniform, inspect_uniform, get_session_engine, queryset_count_optimized, \
-    apply_default_ordering, queryset_search, queryset_group, aliased_uniform, MongoQueryset
+from jet_bridge_base.db import get_mapped_base, get_engine, get_request_connection, submit_request_count_query, \
+    get_connection_id_short
+from jet_bridge_base.db_types import desc_uniform, inspect_uniform, get_session_engine, queryset_count_strategy, \
+    apply_default_ordering, queryset_search, queryset_group, aliased_uniform, MongoQueryset, get_queryset_keyset, \
+    apply_keyset_cursor, encode_keyset_cursor, get_count_cache_scope
 from jet_bridge_base.db_types.sql import sql_load_database_table
 from jet_bridge_base.filters import lookups
 from jet_bridge_base.filters.filter import EMPTY_VALUES
 from jet_bridge_base.filters.filter_for_dbfield import filter_for_column
+from jet_bridge_base.logger import logger
 from jet_bridge_base.models.model_relation_override import ModelRelationOverrideModel
 from jet_bridge_base.serializers.model import get_model_serializer
 from jet_bridge_base.store import store
-from jet_bridge_base.utils.common import get_set_first, any_type_sorter, unique, flatten
+from jet_bridge_base.utils.common import get_set_first, any_type_sorter, unique, flatten, get_random_string
 from jet_bridge_base.utils.gql import RawScalar
+from jet_bridge_base.utils.process import get_memory_usage, get_memory_usage_human
 from jet_bridge_base.utils.relations import parse_relationship_direction
 from jet_bridge_base.utils.tables import get_table_name
 
@@ -61,6 +74,8 @@ class PaginationType(graphene.InputObjectType):
     page = graphene.Int()
     offset = graphene.Int()
     limit = graphene.Int()
+    cursor = graphene.String()
+    countStrategy = graphene.String()
 
 
 class SearchType(graphene.InputObjectType):
@@ -82,9 +97,11 @@ class AggregateType(graphene.InputObjectType):
 
 class PaginationResponseType(graphene.ObjectType):
     count = graphene.Int()
+    countExact = graphene.Boolean(required=False)
     limit = graphene.Int()
     offset = graphene.Int(required=False)
     page = graphene.Int(required=False)
+    cursor = graphene.String(required=False)
     hasMore = graphene.Boolean(required=False)
 
 
@@ -154,23 +171,55 @@ def apply_dynamic_type(func, *arg, **kwargs):
     return DynamicInstance()
 
 
-def loose_in(value, values):
-    for item in values:
-        try:
-            if value == item:
-                return True
-            elif str(value) == str(item):
-                return True
-            elif float(value) == float(item):
-                return True
-        except (ValueError, TypeError):
-            pass
-    return False
+def get_loose_keys(value):
+    # Values equal by value, string or float representation share at least one key
+    keys = [('str', str(value))]
+
+    try:
+        hash(value)
+        keys.append(('value', value))
+    except TypeError:
+        pass
+
+    try:
+        keys.append(('float', float(value)))
+    except (ValueError, TypeError, OverflowError):
+        pass
+
+    return keys
+
+
+def create_loose_index(items, get_value):
+    index = {}
+
+    for i, item in enumerate(items):
+        for key in get_loose_keys(get_value(item)):
+            positions = index.setdefault(key, [])
+            if not len(positions) or positions[-1] != i:
+                positions.append(i)
+
+    return index
+
+
+def get_loose_index_positions(index, values):
+    positions = set()
+
+    for value in values:
+        for key in get_loose_keys(value):
+            positions.update(index.get(key, ()))
+
+    return sorted(positions)
 
 
 class GraphQLSchemaGenerator(object):
-    def __init__(self, base62=False):
+    def __init__(self, base62=False, lazy=False):
         self.base62 = base62
+        self.lazy = lazy
+        self.relationships_overrides = dict()
+        self.engine = None
+        self.types_registry = weakref.WeakValueDictionary()
+        self.created_types = None
+        self.query_models = dict()
         self.relationships_by_name = dict()
         self.relationships_by_clean_name = dict()
         self.model_filters_types = dict()
@@ -201,6 +250,34 @@ class GraphQLSchemaGenerator(object):
         pairs = map(lambda x: [self.clean_name(x[0]), x[1]], obj.items())
         return dict(pairs)
 
+    def create_type(self, cls_name, bases, attrs):
+        # Graphene requires unique type names, types released from caches but still used by other types are reused
+        cls = self.types_registry.get(cls_name)
+
+        if cls is None:
+            cls = type(cls_name, bases, attrs)
+            self.types_registry[cls_name] = cls
+
+        if self.created_types is not None:
+            self.created_types.append(cls_name)
+
+        return cls
+
+    def release_types(self, cls_names):
+        types_caches = [
+            self.model_filters_types,
+            self.model_filters_field_types,
+            self.model_filters_relationship_types,
+            self.model_lookups_types,
+            self.model_lookups_field_types,
+            self.model_lookups_relationship_types,
+            self.model_sort_types
+        ]
+
+        for cls_name in cls_names:
+            for types_cache in types_caches:
+                types_cache.pop(cls_name, None)
+
     def get_queryset(self, request, Model, only_columns=None):
         mapper = inspect_uniform(Model)
         pks = mapper.primary_key
@@ -226,8 +303,7 @@ class GraphQLSchemaGenerator(object):
 
         return queryset
 
-    def get_relationships(self, request, MappedBase, draft):
-        result = {}
+    def get_relationships_overrides(self, request, draft):
         relationships_overrides = {}
 
         if store.is_ok():
@@ -244,88 +320,112 @@ class GraphQLSchemaGenerator(object):
                         relationships_overrides[override.model] = []
                     relationships_overrides[override.model].append(override)
 
-        for Model in MappedBase.classes:
-            model_relationships = {}
+        return relationships_overrides
 
-            mapper = inspect_uniform(Model)
-            name = get_table_name(MappedBase.metadata, mapper.selectable)
+    def get_model_relationships_info(self, MappedBase, Model, model_relationships_overrides, engine):
+        model_relationships = {}
+        mapper = inspect_uniform(Model)
 
-            model_relationships_overrides = relationships_overrides.get(name, [])
+        for override in model_relationships_overrides:
+            direction = parse_relationship_direction(override.direction)
+            local_column = getattr(Model, override.local_field, None)
 
-            for override in model_relationships_overrides:
-                direction = parse_relationship_direction(override.direction)
-                local_column = getattr(Model, override.local_field, None)
+            if local_column is None:
+                continue
 
-                if local_column is None:
-                    continue
+            related_name = override.related_model
+            related_model = MappedBase.classes.get(related_name)
 
-                related_name = override.related_model
-                related_model = MappedBase.classes.get(related_name)
+            if not related_model and '.' in related_name:
+                schema, table = related_name.split('.', 1)
+                related_model = sql_load_database_table(engine, MappedBase, schema, table)
 
-                if not related_model and '.' in related_name:
-                    schema, table = related_name.split('.', 1)
-                    engine = get_engine(request)
-                    related_model = sql_load_database_table(engine, MappedBase, schema, table)
+            if not related_model:
+                continue
 
-                if not related_model:
-                    continue
+            related_mapper = inspect_uniform(related_model)
+            related_column = getattr(related_model, override.related_field, None)
 
-                related_mapper = inspect_uniform(related_model)
-                related_column = getattr(related_model, override.related_field, None)
+            if related_column is None:
+                continue
 
-                if related_column is None:
-                    continue
+            model_relationships[override.name] = {
+                'name': override.name,
+                'direction': direction,
+                'local_column': local_column,
+                'local_column_name': override.local_field,
+                'related_model': related_model,
+                'related_mapper': related_mapper,
+                'related_column': related_column,
+                'related_column_name': override.related_field
+            }
+
+        for relationship in mapper.relationships.values():
+            local_column = get_set_first(relationship.local_columns)
+            relation_column = get_set_first(relationship.remote_side)
+
+            if relationship.direction == MANYTOONE:
+                table = relationship.mapper.tables[0]
+                related_name = get_table_name(MappedBase.metadata, table)
+                related_model = MappedBase.classes.get(related_name)
 
-                model_relationships[override.name] = {
-                    'name': override.name,
-                    'direction': direction,
+                model_relationships[relationship.key] = {
+                    'name': relationship.key,
+                    'direction': relationship.direction,
                     'local_column': local_column,
-                    'local_column_name': override.local_field,
+                    'local_column_name': local_column.name if local_column is not None else None,
                     'related_model': related_model,
-                    'related_mapper': related_mapper,
-                    'related_column': related_column,
-                    'related_column_name': override.related_field
+                    'related_mapper': relationship.mapper,
+                    'related_column': relation_column,
+                    'related_column_name': relation_column.name if relation_column is not None else None
                 }
+            elif relationship.direction == ONETOMANY:
+                table = relationship.mapper.tables[0]
+                related_name = get_table_name(MappedBase.metadata, table)
+                related_model = MappedBase.classes.get(related_name)
 
-            for relationship in mapper.relationships.values():
-                local_column = get_set_first(relationship.local_columns)
-                relation_column = get_set_first(relationship.remote_side)
-
-                if relationship.direction == MANYTOONE:
-                    table = relationship.mapper.tables[0]
-                    related_name = get_table_name(MappedBase.metadata, table)
-                    related_model = MappedBase.classes.get(related_name)
-
-                    model_relationships[relationship.key] = {
-                        'name': relationship.key,
-                        'direction': relationship.direction,
-                        'local_column': local_column,
-                        'local_column_name': local_column.name if local_column is not None else None,
-                        'related_model': related_model,
-                        'related_mapper': relationship.mapper,
-                        'related_column': relation_column,
-                        'related_column_name': relation_column.name if relation_column is not None else None
-                    }
-                elif relationship.direction == ONETOMANY:
-                    table = relationship.mapper.tables[0]
-                    related_name = get_table_name(MappedBase.metadata, table)
-                    related_model = MappedBase.classes.get(related_name)
-
-                    model_relationships[relationship.key] = {
-                        'name': relationship.key,
-                        'direction': relationship.direction,
-                        'local_column': local_column,
-                        'local_column_name': local_column.name if local_column is not None else None,
-                        'related_model': related_model,
-                        'related_mapper': relationship.mapper,
-                        'related_column': relation_column,
-                        'related_column_name': relation_column.name if relation_column is not None else None
-                    }
-
-            result[name] = model_relationships
+                model_relationships[relationship.key] = {
+                    'name': relationship.key,
+                    'direction': relationship.direction,
+                    'local_column': local_column,
+                    'local_column_name': local_column.name if local_column is not None else None,
+                    'related_model': related_model,
+                    'related_mapper': relationship.mapper,
+                    'related_column': relation_column,
+                    'related_column_name': relation_column.name if relation_column is not None else None
+                }
+
+        return model_relationships
+
+    def get_relationships(self, request, MappedBase, draft):
+        result = {}
+        relationships_overrides = self.get_relationships_overrides(request, draft)
+        engine = get_engine(request)
+
+        for Model in MappedBase.classes:
+            mapper = inspect_uniform(Model)
+            name = get_table_name(MappedBase.metadata, mapper.selectable)
+            model_relationships_overrides = relationships_overrides.get(name, [])
+            result[name] = self.get_model_relationships_info(MappedBase, Model, model_relationships_overrides, engine)
 
         return result
 
+    def load_relationships_overrides(self, request, draft):
+        self.relationships_overrides = self.get_relationships_overrides(request, draft)
+        self.engine = get_engine(request)
+
+    def load_model_relationships(self, MappedBase, name):
+        Model = MappedBase.classes.get(name)
+
+        if Model is not None:
+            model_relationships_overrides = self.relationships_overrides.get(name, [])
+            model_relationships = self.get_model_relationships_info(MappedBase, Model, model_relationships_overrides, self.engine)
+        else:
+            model_relationships = {}
+
+        self.relationships_by_clean_name[name] = dict(map(lambda x: (self.clean_name(x[0]), x[1]), model_relationships.items()))
+        self.relationships_by_name[name] = model_relationships
+
     def clean_relationships_by_name(self, relationships):
         def map_model_relations(x):
             return self.clean_name(x[0]), x[1]
@@ -342,15 +442,23 @@ class GraphQLSchemaGenerator(object):
         return dict(map(lambda x: (self.clean_name(x), getattr(Model, x)), mapper.columns.keys()))
 
     def get_model_relationships(self, MappedBase, mapper):
-        name = get_table_name(MappedBase.metadata, mapper.selectable)
-        return self.relationships_by_name.get(name, {}).values()
+        return self.get_model_relationships_by_name(MappedBase, mapper).values()
 
     def get_model_relationships_by_name(self, MappedBase, mapper):
         name = get_table_name(MappedBase.metadata, mapper.selectable)
+
+        # Relationships are loaded only for models used by lazy schema
+        if self.lazy and name not in self.relationships_by_name:
+            self.load_model_relationships(MappedBase, name)
+
         return self.relationships_by_name.get(name, {})
 
     def get_model_relationships_by_clean_name(self, MappedBase, mapper):
         name = get_table_name(MappedBase.metadata, mapper.selectable)
+
+        if self.lazy and name not in self.relationships_by_clean_name:
+            self.load_model_relationships(MappedBase, name)
+
         return self.relationships_by_clean_name.get(name, {})
 
     def filter_queryset(self, request, MappedBase, queryset, mapper, filters, parent_relations=None, exclude=False):
@@ -468,27 +576,65 @@ class GraphQLSchemaGenerator(object):
 
         return result
 
+    def get_lookup_columns_names(self, MappedBase, mapper, lookup_item):
+        columns_by_clean_name = self.get_model_columns_by_clean_name(MappedBase, mapper)
+        relationships_by_clean_name = self.get_model_relationships_by_clean_name(MappedBase, mapper)
+        result = []
+
+        for lookup_name in dict(lookup_item).keys():
+            relationship = relationships_by_clean_name.get(lookup_name)
+            column = columns_by_clean_name.get(lookup_name)
+
+            if relationship is not None:
+                result.append(relationship['local_column'].name)
+            elif column is not None:
+                result.append(column.name)
+
+        return result
+
+    def get_lookup_related_models(self, request, MappedBase, relation_mapper, relation_column, lookup_values, lookup_item):
+        # Only columns used by nested lookups are fetched instead of whole related records
+        columns_names = set(self.get_lookup_columns_names(MappedBase, relation_mapper, lookup_item))
+        columns_names.add(relation_column.name)
+        columns = list(filter(lambda x: x.name in columns_names, relation_mapper.columns))
+
+        related_models = request.session\
+            .query(*columns)\
+            .filter(relation_column.in_(lookup_values))
+        return list(related_models)
+
+    def create_lookup_result(self, lookup_data, models, Model, mapper, source_column):
+        model_values = list(map(lambda x: {'instance': x, 'value': getattr(x, source_column.name)}, models))
+
+        return {
+            'return': lookup_data.get('return', False),
+            'return_list': lookup_data.get('returnList', False),
+            'Model': Model,
+            'mapper': mapper,
+            'model_values': model_values,
+            'source_column': source_column.name,
+            # Instances are matched with parent values through hash index built once per page
+            'model_values_index': create_loose_index(model_values, lambda x: x['value'])
+        }
+
     def get_models_lookup(self, lookup_item, request, MappedBase, models, Model, mapper):
         result = {}
 
         lookup_item_dict = dict(lookup_item)
+        columns_by_clean_name = self.get_model_columns_by_clean_name(MappedBase, mapper)
+        relationships_by_clean_name = self.get_model_relationships_by_clean_name(MappedBase, mapper)
 
         for lookup_name, lookup_data in lookup_item_dict.items():
-            columns_by_clean_name = self.get_model_columns_by_clean_name(MappedBase, mapper)
             column = columns_by_clean_name.get(lookup_name)
-            relationship = self.get_model_relationships_by_clean_name(MappedBase, mapper).get(lookup_name)
+            relationship = relationships_by_clean_name.get(lookup_name)
 
             if relationship is not None:
-                lookup_result = {}
                 local_column = relationship['local_column']
-                lookup_values = sorted(unique(flatten(map(lambda x: getattr(x, local_column.name), models))), key=any_type_sorter)
-
-                lookup_result['return'] = lookup_data.get('return', False)
-                lookup_result['return_list'] = lookup_data.get('returnList', False)
-                lookup_result['Model'] = Model
-                lookup_result['mapper'] = mapper
-                lookup_result['model_values'] = list(map(lambda x: {'instance': x, 'value': getattr(x, local_column.name)}, models))
-                lookup_result['source_column'] = local_column.name
+                lookup_result = self.create_lookup_result(lookup_data, models, Model, mapper, local_column)
+                lookup_values = sorted(
+                    unique(flatten(map(lambda x: x['value'], lookup_result['model_values']))),
+                    key=any_type_sorter
+                )
 
                 if 'aggregate' in lookup_data:
                     relation_model = relationship['related_model']
@@ -518,9 +664,9 @@ class GraphQLSchemaGenerator(object):
                         groups_dict = dict(map(lambda x: (x['group'], x['y_func']), groups))
 
                         lookup_result['aggregated_values'] = list(map(lambda x: {
-                            'instance': x,
-                            'value': groups_dict.get(getattr(x, local_column.name), 0)
-                        }, models))
+                            'instance': x['instance'],
+                            'value': groups_dict.get(x['value'], 0)
+                        }, lookup_result['model_values']))
                         lookup_result['related_column'] = relation_column.name
 
                 if 'relation' in lookup_data:
@@ -528,11 +674,14 @@ class GraphQLSchemaGenerator(object):
                     relation_mapper = relationship['related_mapper']
                     relation_column = relationship['related_column']
 
-                    related_models = request.session\
-                        .query(relation_model)\
-                        .filter(relation_column.in_(lookup_values))\
-                        .all()
-                    related_models = list(related_models)
+                    related_models = self.get_lookup_related_models(
+                        request,
+                        MappedBase,
+                        relation_mapper,
+                        relation_column,
+                        lookup_values,
+                        lookup_data['relation']
+                    )
 
                     lookup_result['related'] = self.get_models_lookup(
                         lookup_data['relation'],
@@ -543,18 +692,18 @@ class GraphQLSchemaGenerator(object):
                         relation_mapper
                     )
                     lookup_result['related_column'] = relation_column.name
+                    lookup_result['related_index'] = self.get_related_lookup_index(
+                        lookup_result['related'],
+                        relation_column.name
+                    )
 
                 result[lookup_name] = lookup_result
             elif column is not None:
-                lookup_result = {}
-                lookup_values = sorted(unique(flatten(map(lambda x: getattr(x, column.name), models))), key=any_type_sorter)
-
-                lookup_result['return'] = lookup_data.get('return', False)
-                lookup_result['return_list'] = lookup_data.get('returnList', False)
-                lookup_result['Model'] = Model
-                lookup_result['mapper'] = mapper
-                lookup_result['model_values'] = list(map(lambda x: {'instance': x, 'value': getattr(x, column.name)}, models))
-                lookup_result['source_column'] = column.name
+                lookup_result = self.create_lookup_result(lookup_data, models, Model, mapper, column)
+                lookup_values = sorted(
+                    unique(flatten(map(lambda x: x['value'], lookup_result['model_values']))),
+                    key=any_type_sorter
+                )
 
                 if 'relation' in lookup_data:
                     for relationship in self.get_model_relationships(MappedBase, mapper):
@@ -565,11 +714,14 @@ class GraphQLSchemaGenerator(object):
                         relation_model = relationship['related_model']
                         relation_column = relationship['related_column']
 
-                        related_models = request.session\
-                            .query(relation_model)\
-                            .filter(relation_column.in_(lookup_values))\
-                            .all()
-                        related_models = list(related_models)
+                        related_models = self.get_lookup_related_models(
+                            request,
+                            MappedBase,
+                            relation_mapper,
+                            relation_column,
+                            lookup_values,
+                            lookup_data['relation']
+                        )
 
                         lookup_result['related'] = self.get_models_lookup(
                             lookup_data['relation'],
@@ -580,13 +732,25 @@ class GraphQLSchemaGenerator(object):
                             relation_mapper
                         )
                         lookup_result['related_column'] = relation_column.name
+                        lookup_result['related_index'] = self.get_related_lookup_index(
+                            lookup_result['related'],
+                            relation_column.name
+                        )
                         break
 
                 result[lookup_name] = lookup_result
 
         return result
 
-    def filter_lookup_models(self, lookup, instance_predicate=None):
+    def get_related_lookup_index(self, related_lookup, related_column_name):
+        # Related lookups share models list, so any of them can be used to index models by related column
+        for lookup_data in related_lookup.values():
+            return create_loose_index(
+                lookup_data['model_values'],
+                lambda x: getattr(x['instance'], related_column_name, None)
+            )
+
+    def filter_lookup_models(self, lookup, positions=None):
         result = {}
 
         for lookup_name, lookup_data in lookup.items():
@@ -594,8 +758,8 @@ class GraphQLSchemaGenerator(object):
 
             model_values = lookup_data['model_values']
 
-            if instance_predicate:
-                model_values = list(filter(lambda x: instance_predicate(x['instance']), model_values))
+            if positions is not None:
+                model_values = list(map(lambda x: model_values[x], positions))
 
             values = list(flatten(map(lambda x: x['value'], model_values)))
 
@@ -606,17 +770,17 @@ class GraphQLSchemaGenerator(object):
                     item_result['value'] = values[0] if len(values) else None
 
             if 'related' in lookup_data:
+                related_index = lookup_data.get('related_index')
                 item_result['related'] = self.filter_lookup_models(
                     lookup_data['related'],
-                    lambda x: loose_in(getattr(x, lookup_data['related_column'], None), values)
+                    get_loose_index_positions(related_index, values) if related_index is not None else []
                 )
 
             if 'aggregated_values' in lookup_data:
-                model_values = list(filter(
-                    lambda x: loose_in(getattr(x['instance'], lookup_data['source_column'], None), values),
-                    lookup_data['aggregated_values']
-                ))
-                item_result['aggregated'] = model_values[0]['value'] if len(model_values) else 0
+                aggregated_positions = get_loose_index_positions(lookup_data['model_values_index'], values)
+                aggregated_values = lookup_data['aggregated_values']
+                item_result['aggregated'] = aggregated_values[aggregated_positions[0]]['value'] \
+                    if len(aggregated_positions) else 0
 
             result[lookup_name] = item_result
 
@@ -669,7 +833,10 @@ class GraphQLSchemaGenerator(object):
     def paginate_queryset(self, queryset, pagination):
         limit = self.get_pagination_limit(pagination)
 
-        if 'offset' in pagination:
+        if 'cursor' in pagination:
+            # One more row is fetched to know whether next page exists
+            return queryset.limit(limit + 1)
+        elif 'offset' in pagination:
             queryset = queryset.offset(pagination['offset'])
         elif 'page' in pagination:
             queryset = queryset.offset((pagination['page'] - 1) * limit)
@@ -703,7 +870,7 @@ class GraphQLSchemaGenerator(object):
 
         attrs['_not_'] = apply_dynamic_type(get_model_filters_type_not_type, self, MappedBase, mapper, with_relations, depth)
 
-        cls = type(cls_name, (ModelFiltersType,), attrs)
+        cls = self.create_type(cls_name, (ModelFiltersType,), attrs)
         self.model_filters_types[cls_name] = cls
         return graphene.List(cls)
 
@@ -736,7 +903,7 @@ class GraphQLSchemaGenerator(object):
         if relationship:
             attrs['relation'] = apply_dynamic_type(get_model_field_filters_type_relation_type, self, MappedBase, relationship, with_relations, depth)
 
-        cls = type(cls_name, (ModelFiltersFieldType,), attrs)
+        cls = self.create_type(cls_name, (ModelFiltersFieldType,), attrs)
         self.model_filters_field_types[cls_name] = cls
         return cls
 
@@ -754,7 +921,7 @@ class GraphQLSchemaGenerator(object):
         lookups_type = self.get_model_filters_type(MappedBase, relationship['related_mapper'], depth + 1)
         attrs['relation'] = lookups_type
 
-        cls = type(cls_name, (ModelFiltersRelationshipType,), attrs)
+        cls = self.create_type(cls_name, (ModelFiltersRelationshipType,), attrs)
         self.model_filters_relationship_types[cls_name] = cls
         return cls
 
@@ -781,7 +948,7 @@ class GraphQLSchemaGenerator(object):
             attr_name = self.clean_name(relationship['name'])
             attrs[attr_name] = apply_dynamic_type(get_model_lookups_type_relation_type, self, MappedBase, mapper, relationship, with_relations, depth)
 
-        cls = type(cls_name, (ModelLookupsType,), attrs)
+        cls = self.create_type(cls_name, (ModelLookupsType,), attrs)
         self.model_lookups_types[cls_name] = cls
         return cls
 
@@ -811,7 +978,7 @@ class GraphQLSchemaGenerator(object):
         if relationship:
             attrs['relation'] = apply_dynamic_type(get_model_field_lookups_type_relation_type, self, MappedBase, mapper, column_name, with_relations, depth)
 
-        cls = type(cls_name, (ModelLookupsFieldType,), attrs)
+        cls = self.create_type(cls_name, (ModelLookupsFieldType,), attrs)
         self.model_lookups_field_types[cls_name] = cls
         return cls
 
@@ -830,7 +997,7 @@ class GraphQLSchemaGenerator(object):
 
         attrs['relation'] = get_model_relationship_lookups_type_relation_type(self, MappedBase, relationship, with_relations, depth)
 
-        cls = type(cls_name, (ModelLookupsRelationshipType,), attrs)
+        cls = self.create_type(cls_name, (ModelLookupsRelationshipType,), attrs)
         self.model_lookups_relationship_types[cls_name] = cls
         return cls
 
@@ -848,7 +1015,7 @@ class GraphQLSchemaGenerator(object):
             attr_name = self.clean_name(column.name)
             attrs[attr_name] = FieldSortType()
 
-        cls = type(cls_name, (ModelSortType,), attrs)
+        cls = self.create_type(cls_name, (ModelSortType,), attrs)
         self.model_sort_types[cls_name] = cls
         return graphene.List(cls)
 
@@ -861,7 +1028,7 @@ class GraphQLSchemaGenerator(object):
             attr_name = self.clean_name(column.name)
             attrs[attr_name] = RawScalar()
 
-        return type('Model{}RecordAttrsType'.format(name), (ModelAttrsType,), attrs)
+        return self.create_type('Model{}RecordAttrsType'.format(name), (ModelAttrsType,), attrs)
 
     def get_selections(self, info, path):
         i = 0
@@ -896,49 +1063,98 @@ class GraphQLSchemaGenerator(object):
             only_columns = list(filter(lambda x: x is not None, map(lambda x: model_attrs.get(x), field_names))) \
                 if len(field_names) and 'allAttrs' not in data_names else None
 
+            if only_columns is not None and 'lookups' in data_names:
+                # Lookups are computed from page rows, so their source columns should be fetched as well
+                only_columns_names = list(map(lambda x: x.name, only_columns))
+                lookups_columns_names = unique(flatten(map(
+                    lambda x: self.get_lookup_columns_names(MappedBase, mapper, x),
+                    lookups
+                )))
+                only_columns.extend(map(
+                    lambda x: getattr(Model, x),
+                    filter(lambda x: x not in only_columns_names, lookups_columns_names)
+                ))
+
+            if 'cursor' in pagination:
+                # Cursor is built from ordering columns which can be not selected
+                only_columns = None
+
             queryset = self.get_queryset(request, Model, only_columns)
 
             queryset = self.filter_queryset(request, MappedBase, queryset, mapper, filters)
             queryset = self.search_queryset(queryset, mapper, search)
             queryset = self.sort_queryset(queryset, MappedBase, mapper, sort)
+            queryset_unpaginated = queryset
+            next_cursor = None
+
+            pagination_selections = self.get_selections(info, ['pagination']) or []
+            pagination_names = list(map(lambda x: x.name.value, pagination_selections))
+            count_cache_scope = get_count_cache_scope(request)
+            count_future = None
+
+            def count_query(session):
+                count_query_start = time.time()
+                count, count_exact = queryset_count_strategy(
+                    session,
+                    queryset_unpaginated,
+                    strategy=pagination.get('countStrategy'),
+                    cache_scope=count_cache_scope
+                )
+                count_query_end = time.time()
+
+                return count, count_exact, round(count_query_end - count_query_start, 3)
+
+            if 'count' in pagination_names or 'countExact' in pagination_names \
+                    or ('hasMore' in pagination_names and 'cursor' not in pagination):
+                count_future = submit_request_count_query(request, count_query)
+
+            if 'cursor' in pagination:
+                keyset = get_queryset_keyset(Model, queryset)
+
+                if pagination['cursor']:
+                    queryset = apply_keyset_cursor(queryset, keyset, pagination['cursor'])
 
             data_query_start = time.time()
             queryset_page = list(self.paginate_queryset(queryset, pagination))
             data_query_end = time.time()
 
+            if 'cursor' in pagination:
+                limit = self.get_pagination_limit(pagination)
+
+                if len(queryset_page) > limit:
+                    queryset_page = queryset_page[:limit]
+                    next_cursor = encode_keyset_cursor(keyset, queryset_page[-1])
+
             request.context['graphql_data_query_time'] = round(data_query_end - data_query_start, 3)
 
-            serializer_class = get_model_serializer(Model)
-            serializer_context = {**info.context}
+            serializer_class = get_model_serializer(Model, request)
+            # One serializer for all rows, its fields and row plan are built once
+            serializer = serializer_class(context={**info.context})
 
             queryset_page_lookups = self.get_models_lookups(request, MappedBase, queryset_page, Model, mapper, lookups)
 
-            def map_queryset_page_item(row):
+            def map_queryset_page_item(i, row):
                 if isinstance(row, Row):
                     data = dict(row)
                 else:
                     data = dict(map(lambda x: (self.clean_name(x.name), getattr(row, x.name)), mapper.columns))
 
-                serializer = serializer_class(instance=data, context=serializer_context)
-                serialized = serializer.representation_data
+                serialized = serializer.to_representation(data)
                 serialized = self.clean_keys(serialized)
 
                 return {
                     'attrs': serialized,
                     'allAttrs': serialized,
                     'lookups': list(map(
-                        lambda x: self.filter_lookup_models(x, lambda instance: instance == row),
+                        lambda x: self.filter_lookup_models(x, [i]),
                         queryset_page_lookups
                     ))
                 }
 
             result = {
-                'data': list(map(map_queryset_page_item, queryset_page))
+                'data': list(map(lambda x: map_queryset_page_item(*x), enumerate(queryset_page)))
             }
 
-            pagination_selections = self.get_selections(info, ['pagination']) or []
-            pagination_names = list(map(lambda x: x.name.value, pagination_selections))
-
             if len(pagination_names):
                 limit = self.get_pagination_limit(pagination)
                 offset = pagination.get('offset')
@@ -950,16 +1166,32 @@ class GraphQLSchemaGenerator(object):
                     'page': page
                 }
 
-                if 'count' in pagination_names or 'hasMore' in pagination_names:
-                    count_query_start = time.time()
+                if 'cursor' in pagination:
+                    result['pagination']['cursor'] = next_cursor
+                    result['pagination']['hasMore'] = next_cursor is not None
+
+                    if 'count' in pagination_names or 'countExact' in pagination_names:
+                        if count_future is not None:
+                            count, count_exact, count_query_time = count_future.result()
+                        else:
+                            count, count_exact, count_query_time = count_query(request.session)
+
+                        result['pagination']['count'] = count
+                        result['pagination']['countExact'] = count_exact
+
+                        request.context['graphql_count_query_time'] = count_query_time
+                elif 'count' in pagination_names or 'countExact' in pagination_names or 'hasMore' in pagination_names:
                     if offset == 0 and len(queryset_page) < limit:
-                        count = len(queryset_page)
+                        count, count_exact, count_query_time = len(queryset_page), True, 0.0
                     elif page == 1 and len(queryset_page) < limit:
-                        count = len(queryset_page)
+                        count, count_exact, count_query_time = len(queryset_page), True, 0.0
+                    elif count_future is not None:
+                        count, count_exact, count_query_time = count_future.result()
                     else:
-                        count = queryset_count_optimized(request.session, queryset)
+                        count, count_exact, count_query_time = count_query(request.session)
+
                     result['pagination']['count'] = count
-                    count_query_end = time.time()
+                    result['pagination']['countExact'] = count_exact
 
                     if offset is not None:
                         result['pagination']['hasMore'] = offset + limit < count
@@ -970,12 +1202,59 @@ class GraphQLSchemaGenerator(object):
                         # count may be inaccurate
                         result['pagination']['hasMore'] = True
 
-                    request.context['graphql_count_query_time'] = round(count_query_end - count_query_start, 3)
+                    request.context['graphql_count_query_time'] = count_query_time
 
             return result
         except Exception as e:
             raise e
 
+    def get_model_query_field(self, MappedBase, Model, mapper):
+        table = mapper.tables[0]
+        name = self.clean_name(get_table_name(MappedBase.metadata, table))
+
+        FiltersType = self.get_model_filters_type(MappedBase, mapper)
+        LookupsType = self.get_model_lookups_type(MappedBase, mapper)
+        SortType = self.get_model_sort_type(MappedBase, mapper)
+        ModelAttrsType = self.get_model_attrs_type(MappedBase, mapper)
+        ModelType = self.create_type('Model{}ModelType'.format(name), (graphene.ObjectType,), {
+            'attrs': graphene.Field(ModelAttrsType),
+            'allAttrs': graphene.Field(RawScalar),
+            'lookups': graphene.List(RawScalar)
+        })
+        ModelListType = self.create_type('Model{}ModelListType'.format(name), (graphene.ObjectType,), {
+            'data': graphene.List(ModelType),
+            'pagination': graphene.Field(PaginationResponseType)
+        })
+
+        return graphene.Field(
+            ModelListType,
+            filters=FiltersType,
+            lookups=graphene.List(LookupsType),
+            sort=SortType,
+            pagination=PaginationType(),
+            search=SearchType()
+        )
+
+    def get_model_query_resolver(self, MappedBase, Model, mapper, before_resolve=None):
+        def resolver(parent, info, filters=None, lookups=None, sort=None, pagination=None, search=None):
+            request = info.context.get('request')
+
+            if before_resolve is not None:
+                before_resolve(request=request, mapper=mapper)
+
+            return self.resolve_model_list(
+                MappedBase,
+                Model,
+                mapper,
+                info,
+                filters=filters,
+                lookups=lookups,
+                sort=sort,
+                pagination=pagination,
+                search=search
+            )
+        return resolver
+
     def get_query_type(self, request, draft, before_resolve=None, on_progress_updated=None):
         MappedBase = get_mapped_base(request)
 
@@ -1002,49 +1281,9 @@ class GraphQLSchemaGenerator(object):
             if on_progress_updated:
                 on_progress_updated(name, i, total)
 
-            FiltersType = self.get_model_filters_type(MappedBase, mapper)
-            LookupsType = self.get_model_lookups_type(MappedBase, mapper)
-            SortType = self.get_model_sort_type(MappedBase, mapper)
-            ModelAttrsType = self.get_model_attrs_type(MappedBase, mapper)
-            ModelType = type('Model{}ModelType'.format(name), (graphene.ObjectType,), {
-                'attrs': graphene.Field(ModelAttrsType),
-                'allAttrs': graphene.Field(RawScalar),
-                'lookups': graphene.List(RawScalar)
-            })
-            ModelListType = type('Model{}ModelListType'.format(name), (graphene.ObjectType,), {
-                'data': graphene.List(ModelType),
-                'pagination': graphene.Field(PaginationResponseType)
-            })
-
-            def create_list_resolver(Model, mapper):
-                def resolver(parent, info, filters=None, lookups=None, sort=None, pagination=None, search=None):
-                    request = info.context.get('request')
-
-                    if before_resolve is not None:
-                        before_resolve(request=request, mapper=mapper)
-
-                    return self.resolve_model_list(
-                        MappedBase,
-                        Model,
-                        mapper,
-                        info,
-                        filters=filters,
-                        lookups=lookups,
-                        sort=sort,
-                        pagination=pagination,
-                        search=search
-                    )
-                return resolver
-
-            query_attrs[name] = graphene.Field(
-                ModelListType,
-                filters=FiltersType,
-                lookups=graphene.List(LookupsType),
-                sort=SortType,
-                pagination=PaginationType(),
-                search=SearchType()
-            )
-            query_attrs['resolve_{}'.format(name)] = create_list_resolver(Model, mapper)
+            query_attrs[name] = self.get_model_query_field(MappedBase, Model, mapper)
+            query_attrs['resolve_{}'.format(name)] = self.get_model_query_resolver(MappedBase, Model, mapper, before_resolve)
+            self.query_models[name] = get_table_name(MappedBase.metadata, table)
 
             i += 1
 
@@ -1056,3 +1295,308 @@ class GraphQLSchemaGenerator(object):
     def get_schema(self, request, draft, before_resolve=None, on_progress_updated=None):
         Query = self.get_query_type(request, draft, before_resolve, on_progress_updated)
         return graphene.Schema(query=Query, auto_camelcase=False)
+
+    def get_schema_artifact(self, schema):
+        return {
+            'sdl': print_schema(schema),
+            'resolvers': dict(self.query_models)
+        }
+
+    def get_artifact_resolver(self, MappedBase, table_name, before_resolve=None):
+        def resolver(parent, info, **kwargs):
+            # Models are looked up on first query, loading artifact does not map tables
+            Model = MappedBase.classes.get(table_name)
+
+            if Model is None:
+                raise Exception('Table "{}" not found'.format(table_name))
+
+            mapper = inspect_uniform(Model)
+            model_resolver = self.get_model_query_resolver(MappedBase, Model, mapper, before_resolve)
+            return model_resolver(parent, info, **kwargs)
+        return resolver
+
+    def get_artifact_schema(self, request, artifact, before_resolve=None):
+        MappedBase = get_mapped_base(request)
+        schema = build_ast_schema(parse(artifact['sdl']))
+
+        # Types built from SDL have no implementation, graphene scalars and enums are bound back to them
+        for scalar_type in [RawScalar]:
+            schema_type = schema.get_type(scalar_type._meta.name)
+
+            if schema_type is None:
+                continue
+
+            schema_type.serialize = scalar_type.serialize
+            schema_type.parse_value = scalar_type.parse_value
+            schema_type.parse_literal = scalar_type.parse_literal
+
+        for enum_type in [AggregateFuncType]:
+            schema_type = schema.get_type(enum_type._meta.name)
+
+            if schema_type is None:
+                continue
+
+            for value in schema_type.values:
+                value.value = getattr(enum_type, value.name).value
+
+        query_type = schema.get_query_type()
+
+        for name, table_name in artifact['resolvers'].items():
+            field = query_type.fields.get(name)
+            if field is not None:
+                field.resolver = self.get_artifact_resolver(MappedBase, table_name, before_resolve)
+
+        return schema
+
+
+def create_query_schema(query_attrs):
+    Query = type('Query', (graphene.ObjectType,), query_attrs)
+    return graphene.Schema(query=Query, auto_camelcase=False)
+
+
+def get_document_root_fields(document):
+    fragments = dict(map(
+        lambda x: (x.name.value, x),
+        filter(lambda x: isinstance(x, ast.FragmentDefinition), document.definitions)
+    ))
+    result = set()
+    visited_fragments = set()
+
+    def add_selections(selection_set):
+        if selection_set is None:
+            return
+
+        for selection in selection_set.selections:
+            if isinstance(selection, ast.Field):
+                result.add(selection.name.value)
+            elif isinstance(selection, ast.InlineFragment):
+                add_selections(selection.selection_set)
+            elif isinstance(selection, ast.FragmentSpread):
+                fragment_name = selection.name.value
+                fragment = fragments.get(fragment_name)
+
+                if fragment is not None and fragment_name not in visited_fragments:
+                    visited_fragments.add(fragment_name)
+                    add_selections(fragment.selection_set)
+
+    for definition in document.definitions:
+        if isinstance(definition, ast.OperationDefinition):
+            add_selections(definition.selection_set)
+
+    return result
+
+
+class GraphQLLazySchema(object):
+    introspection_fields = ['__schema', '__type']
+    query_schemas_cache_size = 32
+
+    def __init__(self, request, draft, base62=False, before_resolve=None):
+        self.id = get_random_string(32)
+        self.id_short = get_connection_id_short(request)
+        self.MappedBase = get_mapped_base(request)
+        self.before_resolve = before_resolve
+        self.generator = GraphQLSchemaGenerator(base62=base62, lazy=True)
+        self.generator.load_relationships_overrides(request, draft)
+        self.models_names = self.get_models_names()
+        self.models = dict()
+        self.query_schemas = OrderedDict()
+        self.lock = threading.RLock()
+
+    def get_models_names(self):
+        metadata = self.MappedBase.metadata
+        metadata_tables = dict.values(metadata.tables) if isinstance(metadata.tables, dict) else metadata.tables
+        # Table names are taken from metadata, lazily mapped base does not map tables until requested
+        table_names = map(lambda x: get_table_name(metadata, x), metadata_tables)
+        return dict(map(lambda x: (self.generator.clean_name(x), x), table_names))
+
+    def create_model(self, name):
+        Model = self.MappedBase.classes.get(self.models_names[name])
+
+        if Model is None:
+            return
+
+        logger.info('[{}] Generating GraphQL model "{}" (Mem:{})...'.format(
+            self.id_short,
+            name,
+            get_memory_usage_human()
+        ))
+
+        memory_usage_before = get_memory_usage()
+        get_schema_start = time.time()
+
+        self.generator.created_types = []
+
+        try:
+            mapper = inspect_uniform(Model)
+            query_attrs = {
+                name: self.generator.get_model_query_field(self.MappedBase, Model, mapper),
+                'resolve_{}'.format(name): self.generator.get_model_query_resolver(
+                    self.MappedBase,
+                    Model,
+                    mapper,
+                    self.before_resolve
+                )
+            }
+            # Building model schema resolves dynamic relation types, so they are accounted to this model
+            schema = create_query_schema(query_attrs)
+            types = self.generator.created_types
+        finally:
+            self.generator.created_types = None
+
+        get_schema_end = time.time()
+
+        return {
+            'name': name,
+            'query_attrs': query_attrs,
+            'schema': schema,
+            'types': types,
+            'get_schema_time': round(get_schema_end - get_schema_start, 3),
+            'memory_usage_approx': get_memory_usage() - memory_usage_before,
+            'last_used': datetime.now()
+        }
+
+    def get_model(self, name):
+        model = self.models.get(name)
+
+        if model is not None:
+            return model
+
+        with self.lock:
+            model = self.models.get(name)
+
+            if model is None:
+                model = self.create_model(name)
+
+                if model is not None:
+                    self.models[name] = model
+
+            return model
+
+    def get_query_models_names(self, document):
+        root_fields = get_document_root_fields(document)
+
+        if any(map(lambda x: x in root_fields, self.introspection_fields)):
+            return sorted(self.models_names.keys())
+
+        names = sorted(filter(lambda x: x in self.models_names, root_fields))
+
+        if not len(names) and len(self.models_names):
+            # Schema should have at least one field to validate query
+            names = [min(self.models_names.keys())]
+
+        return names
+
+    def get_query_schema(self, names):
+        if not len(self.models_names):
+            raise Exception('No tables found')
+
+        models = list(filter(lambda x: x is not None, map(lambda x: self.get_model(x), names)))
+
+        if not len(models):
+            raise Exception('No tables found')
+
+        now = datetime.now()
+        for model in models:
+            model['last_used'] = now
+
+        if len(models) == 1:
+            return models[0]['schema']
+
+        key = tuple(map(lambda x: x['name'], models))
+
+        with self.lock:
+            schema = self.query_schemas.get(key)
+
+            if schema is not None:
+                self.query_schemas.move_to_end(key)
+                return schema
+
+            query_attrs = {}
+            for model in models:
+                query_attrs.update(model['query_attrs'])
+
+            schema = create_query_schema(query_attrs)
+            self.query_schemas[key] = schema
+
+            while len(self.query_schemas) > self.query_schemas_cache_size:
+                self.query_schemas.popitem(last=False)
+
+            return schema
+
+    def release_model(self, name):
+        with self.lock:
+            model = self.models.pop(name, None)
+
+            if model is None:
+                return
+
+            self.generator.release_types(model['types'])
+
+            for key in list(self.query_schemas.keys()):
+                if name in key:
+                    del self.query_schemas[key]
+
+            return model
+
+    def reload_models(self, tables):
+        """
+        Releases models of changed tables and models which types depend on them, other models are kept.
+        """
+
+        with self.lock:
+            generator = self.generator
+            metadata = self.MappedBase.metadata
+            invalidate = set(tables)
+
+            def is_related(name):
+                return any(map(
+                    lambda x: get_table_name(metadata, x['related_mapper'].tables[0]) in invalidate,
+                    generator.relationships_by_name[name].values()
+                ))
+
+            # Relation types are shared between models, so dependent models are released transitively
+            while True:
+                related = set(filter(
+                    lambda x: x not in invalidate and is_related(x),
+                    list(generator.relationships_by_name.keys())
+                ))
+
+                if not len(related):
+                    break
+
+                invalidate.update(related)
+
+            for name in list(self.models.keys()):
+                if self.models_names.get(name) not in invalidate:
+                    continue
+
+                model = self.release_model(name)
+
+                if model is not None:
+                    # Types of previous table definition should not be reused by registry
+                    for cls_name in model['types']:
+                        generator.types_registry.pop(cls_name, None)
+
+            for name in invalidate:
+                generator.relationships_by_name.pop(name, None)
+                generator.relationships_by_clean_name.pop(name, None)
+
+            self.models_names = self.get_models_names()
+
+    def release_inactive_models(self, timeout):
+        result = []
+        now = datetime.now()
+
+        for name, model in list(self.models.items()):
+            if (now - model['last_used']).total_seconds() <= timeout:
+                continue
+
+            released_model = self.release_model(name)
+
+            if released_model is not None:
+                result.append(released_model)
+
+        return result
+
+    def get_memory_usage_approx(self):
+        return sum(map(lambda x: max(x['memory_usage_approx'] or 0, 0), list(self.models.values())))
@@ -0,0 +1,76 @@
+import json
+import os
+import threading
+
+import graphene
+
+from jet_bridge_base.db_types.schema_cache_file import get_schema_cache_fingerprint
+from jet_bridge_base.utils.conf import get_metadata_file_path
+from jet_bridge_base.utils.crypt import get_sha256_hash
+
+GRAPHQL_ARTIFACT_FORMAT = 'jet_graphql_schema'
+GRAPHQL_ARTIFACT_VERSION = 1
+
+
+def get_graphql_artifact_path(conf, schema_key):
+    # Artifacts are stored next to metadata cache file of the same connection
+    metadata_file_path = get_metadata_file_path(conf)
+    return '{}_{}.json'.format(os.path.splitext(metadata_file_path)[0], schema_key)
+
+
+def get_graphql_artifact_fingerprint(metadata, relationships_overrides, base62):
+    metadata_fingerprint = get_schema_cache_fingerprint(metadata)
+
+    # Metadata is not in sync with schema cache file, artifact can't be matched with it
+    if metadata_fingerprint is None:
+        return
+
+    overrides = sorted(map(
+        lambda x: [x.model, x.name, x.direction, x.local_field, x.related_model, x.related_field],
+        [override for model_overrides in relationships_overrides.values() for override in model_overrides]
+    ), key=lambda x: list(map(str, x)))
+
+    return get_sha256_hash(json.dumps([
+        GRAPHQL_ARTIFACT_VERSION,
+        graphene.__version__,
+        metadata_fingerprint,
+        bool(base62),
+        overrides
+    ], default=str))
+
+
+def dump_graphql_artifact(file_path, fingerprint, artifact):
+    dir_path = os.path.dirname(file_path)
+
+    if dir_path and not os.path.exists(dir_path):
+        os.makedirs(dir_path)
+
+    data = {
+        'format': GRAPHQL_ARTIFACT_FORMAT,
+        'version': GRAPHQL_ARTIFACT_VERSION,
+        'fingerprint': fingerprint,
+        **artifact
+    }
+
+    # File is replaced atomically so other workers never read partially written artifact
+    temp_file_path = '{}.tmp{}'.format(file_path, threading.get_ident())
+
+    with open(temp_file_path, 'w') as file:
+        json.dump(data, file)
+
+    os.replace(temp_file_path, file_path)
+
+
+def load_graphql_artifact(file_path, fingerprint):
+    if not os.path.exists(file_path):
+        return
+
+    with open(file_path, 'r') as file:
+        data = json.load(file)
+
+    if not isinstance(data, dict) or data.get('format') != GRAPHQL_ARTIFACT_FORMAT:
+        return
+    elif data.get('version') != GRAPHQL_ARTIFACT_VERSION or data.get('fingerprint') != fingerprint:
+        return
+
+    return data
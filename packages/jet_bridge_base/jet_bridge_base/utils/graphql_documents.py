@@ -0,0 +1,74 @@
+from graphql import parse
+from graphql.validation import validate
+
+from jet_bridge_base import settings
+from jet_bridge_base.utils.cache import TTLCache
+from jet_bridge_base.utils.crypt import get_sha256_hash
+
+# Documents are keyed by schema id, replaced schema gets new id and its documents are evicted as unused
+graphql_documents_cache = TTLCache(max_size=lambda: settings.GRAPHQL_DOCUMENTS_CACHE_SIZE)
+
+graphql_persisted_queries_cache = TTLCache(max_size=lambda: settings.GRAPHQL_PERSISTED_QUERIES_CACHE_SIZE)
+
+
+class PersistedQueryNotFound(Exception):
+    pass
+
+
+def get_graphql_query_hash(query):
+    return get_sha256_hash(query)
+
+
+def get_graphql_document(schema_id, query, query_hash=None):
+    if not settings.GRAPHQL_DOCUMENTS_CACHE_SIZE:
+        return {'ast': parse(query), 'validation_errors': None}
+
+    key = (schema_id, query_hash or get_graphql_query_hash(query))
+    document = graphql_documents_cache.get(key)
+
+    if document is None:
+        document = {'ast': parse(query), 'validation_errors': None}
+        graphql_documents_cache.set(key, document)
+
+    return document
+
+
+def validate_graphql_document(schema, document):
+    # Schemas with the same id have the same types, so validation result is stored with document
+    if document['validation_errors'] is None:
+        document['validation_errors'] = validate(schema, document['ast'])
+
+    return document['validation_errors']
+
+
+def get_persisted_query_hash(extensions):
+    if not isinstance(extensions, dict):
+        return
+
+    persisted_query = extensions.get('persistedQuery')
+
+    if not isinstance(persisted_query, dict):
+        return
+
+    return persisted_query.get('sha256Hash')
+
+
+def get_persisted_query(query, query_hash):
+    """
+    Automatic persisted queries: client sends query hash only and sends full query
+    with hash again when query is not found.
+    """
+
+    if query is None:
+        query = graphql_persisted_queries_cache.get(query_hash)
+
+        if query is None:
+            raise PersistedQueryNotFound('PersistedQueryNotFound')
+
+        return query
+
+    if get_graphql_query_hash(query) != query_hash:
+        raise PersistedQueryNotFound('provided sha does not match query')
+
+    graphql_persisted_queries_cache.set(query_hash, query)
+    return query
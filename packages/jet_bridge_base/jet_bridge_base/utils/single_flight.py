@@ -0,0 +1,94 @@
+import json
+import threading
+
+from jet_bridge_base.utils.conf import get_conf, get_connection_id
+from jet_bridge_base.utils.crypt import get_sha256_hash
+
+
+class SingleFlight(object):
+    """
+    Executes function once for concurrent calls with the same key, other callers wait
+    for the first call and receive its result or exception.
+    """
+
+    def __init__(self):
+        self.calls = {}
+        self.lock = threading.Lock()
+        self.leaders = 0
+        self.followers = 0
+        self.errors = 0
+
+    def do(self, key, func):
+        with self.lock:
+            call = self.calls.get(key)
+
+            if call is None:
+                call = {'event': threading.Event(), 'result': None, 'error': None}
+                self.calls[key] = call
+                self.leaders += 1
+                leader = True
+            else:
+                self.followers += 1
+                leader = False
+
+        if not leader:
+            call['event'].wait()
+
+            if call['error'] is not None:
+                raise call['error']
+
+            return call['result']
+
+        try:
+            call['result'] = func()
+            return call['result']
+        except Exception as e:
+            call['error'] = e
+            with self.lock:
+                self.errors += 1
+            raise
+        finally:
+            with self.lock:
+                self.calls.pop(key, None)
+            call['event'].set()
+
+    def get_stats(self):
+        with self.lock:
+            calls = self.leaders + self.followers
+
+            return {
+                'in_flight': len(self.calls),
+                'leaders': self.leaders,
+                'followers': self.followers,
+                'errors': self.errors,
+                'hit_ratio': round(self.followers / calls, 3) if calls else None
+            }
+
+
+requests_single_flight = SingleFlight()
+
+
+def get_request_single_flight_key(request, view, action):
+    """
+    Requests share result only when they are identical for the same connection and permission scope.
+    """
+
+    conf = get_conf(request)
+    query_arguments = dict(map(
+        lambda x: (x[0], list(map(lambda v: v.decode('utf-8') if isinstance(v, bytes) else v, x[1]))),
+        request.query_arguments.items()
+    ))
+
+    return get_sha256_hash(json.dumps([
+        get_connection_id(conf),
+        request.project,
+        request.environment,
+        request.admin,
+        request.get_rls_key(),
+        view.__class__.__name__,
+        action,
+        request.method,
+        request.path_kwargs,
+        query_arguments,
+        request.data
+    ], sort_keys=True, default=str))
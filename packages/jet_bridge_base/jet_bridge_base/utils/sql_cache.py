@@ -0,0 +1,149 @@
+import json
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from jet_bridge_base import settings
+from jet_bridge_base.encoders import json_dumps
+from jet_bridge_base.logger import logger
+from jet_bridge_base.utils.cache import TTLCache
+from jet_bridge_base.utils.conf import get_conf, get_connection_id
+from jet_bridge_base.utils.crypt import get_sha256_hash
+
+SQL_CACHE_READ_STATEMENTS = ['select', 'with']
+# Queries containing any of these words are never cached, even when keyword is used in other meaning
+SQL_CACHE_WRITE_KEYWORDS = [
+    'insert', 'update', 'delete', 'merge', 'upsert', 'replace', 'truncate', 'drop', 'alter', 'create', 'grant',
+    'revoke', 'call', 'exec', 'execute', 'copy', 'lock', 'into', 'nextval', 'setval'
+]
+
+sql_cache = TTLCache(
+    max_size=lambda: settings.SQL_CACHE_SIZE,
+    max_memory=lambda: settings.SQL_CACHE_MAX_MEMORY
+)
+sql_cache_refresh_executor = ThreadPoolExecutor(thread_name_prefix='jet_sql_cache_refresh')
+sql_cache_refreshing = set()
+sql_cache_refreshing_lock = threading.Lock()
+# Incremented on invalidation, so refresh started before write doesn't store outdated result
+sql_cache_generations = {}
+
+
+def get_query_words(query):
+    return re.findall(r'[a-z_][a-z0-9_$]*', query.lower())
+
+
+def is_read_only_query(query):
+    words = get_query_words(query)
+
+    if not len(words) or words[0] not in SQL_CACHE_READ_STATEMENTS:
+        return False
+
+    return not any(map(lambda x: x in SQL_CACHE_WRITE_KEYWORDS, words))
+
+
+def normalize_query(query):
+    # Whitespaces inside query are not collapsed as they can be part of string literals
+    return query.strip().rstrip(';').strip()
+
+
+def get_sql_cache_scope(request):
+    conf = get_conf(request)
+    return get_connection_id(conf)
+
+
+def get_sql_cache_key(request, data):
+    """
+    Returns cache key for query or None if query result should not be cached.
+    Key includes every query option (params, filters, pagination, timezone, schema) and RLS identity.
+    """
+
+    if not settings.SQL_CACHE_TTL or not is_read_only_query(data['query']):
+        return
+
+    options = dict(filter(lambda x: x[0] != 'query', data.items()))
+
+    return get_sha256_hash(json.dumps([
+        get_sql_cache_scope(request),
+        request.get_rls_key(),
+        normalize_query(data['query']),
+        options
+    ], sort_keys=True, default=str))
+
+
+def get_sql_cache_generation(scope):
+    return sql_cache_generations.get(scope, 0)
+
+
+def get_cached_sql_response(key, refresh):
+    """
+    Returns cached response with its age or None if it is missing.
+    Stale response is still returned while refresh() is executed once in background.
+    """
+
+    entry = sql_cache.get(key)
+
+    if entry is None:
+        return
+
+    age = time.time() - entry['created']
+
+    if age >= settings.SQL_CACHE_TTL:
+        submit_sql_cache_refresh(key, refresh)
+
+    return {
+        **entry['response'],
+        'cache_age': round(age, 3)
+    }
+
+
+def set_cached_sql_response(key, scope, generation, query, response):
+    if generation != get_sql_cache_generation(scope):
+        return
+
+    memory = len(json_dumps(response))
+    max_memory = settings.SQL_CACHE_MAX_MEMORY
+
+    if max_memory is not None and memory > max_memory:
+        return
+
+    sql_cache.set(key, {
+        'response': response,
+        'created': time.time(),
+        'scope': scope,
+        'words': set(get_query_words(query))
+    }, ttl=settings.SQL_CACHE_TTL + settings.SQL_CACHE_STALE_TTL, memory=memory)
+
+
+def submit_sql_cache_refresh(key, refresh):
+    with sql_cache_refreshing_lock:
+        if key in sql_cache_refreshing:
+            return
+        sql_cache_refreshing.add(key)
+
+    def execute():
+        try:
+            refresh()
+        except Exception as e:
+            logger.warning('SQL cache refresh failed: {}'.format(e))
+        finally:
+            with sql_cache_refreshing_lock:
+                sql_cache_refreshing.discard(key)
+
+    sql_cache_refresh_executor.submit(execute)
+
+
+def invalidate_sql_cache(request, table_name=None):
+    """
+    Removes cached results of connection queries referencing table_name or all connection results.
+    """
+
+    scope = get_sql_cache_scope(request)
+    table_name = table_name.lower() if table_name else None
+
+    with sql_cache_refreshing_lock:
+        sql_cache_generations[scope] = get_sql_cache_generation(scope) + 1
+
+    return sql_cache.delete_matching(
+        lambda key, value: value['scope'] == scope and (table_name is None or table_name in value['words'])
+    )
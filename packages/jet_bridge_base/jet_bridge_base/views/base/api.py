@@ -6,18 +6,20 @@ import six
 
 from jet_bridge_base import settings
 from jet_bridge_base.configuration import configuration
-from jet_bridge_base.db import create_session
+from jet_bridge_base.db import create_session, close_session
 from jet_bridge_base.exceptions.api import APIException
 from jet_bridge_base.exceptions.not_found import NotFound
 from jet_bridge_base.exceptions.permission_denied import PermissionDenied
 from jet_bridge_base.exceptions.sql import SqlError
 from jet_bridge_base.exceptions.validation_error import ValidationError
+from jet_bridge_base.responses.base import Response
 from jet_bridge_base.responses.json import JSONResponse
 from jet_bridge_base.responses.template import TemplateResponse
 from jet_bridge_base.logger import logger
 from jet_bridge_base.utils.common import format_size
 from jet_bridge_base.utils.conf import get_connection_name, get_conf, get_connection_schema, get_connection_id
 from jet_bridge_base.utils.exceptions import serialize_validation_error
+from jet_bridge_base.utils.single_flight import requests_single_flight, get_request_single_flight_key
 
 
 class BaseAPIView(object):
@@ -25,6 +27,8 @@ class BaseAPIView(object):
     # session = None
     permission_classes = []
     track_queries = False
+    # Identical concurrent requests to these actions are executed once when COALESCE_REQUESTS is enabled
+    coalesced_actions = []
 
     def log_request(self, request):
         params = {'IP': request.get_ip(), 'SID': request.get_stick_session()}
@@ -194,9 +198,31 @@ class BaseAPIView(object):
 
                 return TemplateResponse('500.html', status=500)
 
+    def is_coalesced_action(self, request, action):
+        return settings.COALESCE_REQUESTS and action in self.coalesced_actions
+
+    def dispatch_coalesced(self, action, request, *args, **kwargs):
+        def execute():
+            response = getattr(self, action)(request, *args, **kwargs)
+            # Rendered once, so that streaming responses can be shared too
+            return {
+                'rendered': response.render(),
+                'status': response.status,
+                'headers': dict(response.header_items())
+            }
+
+        key = get_request_single_flight_key(request, self, action)
+        result = requests_single_flight.do(key, execute)
+
+        return Response(result['rendered'], status=result['status'], headers=result['headers'])
+
     def dispatch(self, action, request, *args, **kwargs):
         if not hasattr(self, action):
             raise NotFound()
+
+        if self.is_coalesced_action(request, action):
+            return self.dispatch_coalesced(action, request, *args, **kwargs)
+
         return getattr(self, action)(request, *args, **kwargs)
 
     # def build_absolute_uri(self, request, url):
@@ -215,7 +241,4 @@ class APIView(BaseAPIView):
 
     def after_dispatch(self, request):
         super(APIView, self).after_dispatch(request)
-
-        if request.session is not None:
-            request.session.close()
-            request.session = None
+        close_session(request)
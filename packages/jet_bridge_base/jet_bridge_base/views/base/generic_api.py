@@ -12,7 +12,6 @@ class GenericAPIView(APIView):
     serializer_class = None
     filter_class = None
     pagination_class = PageNumberPagination
-    _paginator = None
     lookup_url_kwarg = None
 
     def get_model(self, request):
@@ -86,24 +85,28 @@ class GenericAPIView(APIView):
             queryset = filter_instance.filter_queryset(request, queryset)
         return queryset
 
-    @property
-    def paginator(self):
-        if not self._paginator:
-            if self.pagination_class is None:
-                self._paginator = None
-            else:
-                self._paginator = self.pagination_class()
-        return self._paginator
+    def get_pagination_class(self, request):
+        return self.pagination_class
+
+    def get_paginator(self, request):
+        # Paginator keeps page state, so it is created per request as view instance is shared
+        if request.paginator is None:
+            pagination_class = self.get_pagination_class(request)
+            if pagination_class is not None:
+                request.paginator = pagination_class()
+        return request.paginator
 
     def paginate_queryset(self, request, queryset):
-        if self.paginator is None:
+        paginator = self.get_paginator(request)
+        if paginator is None:
             return None
-        return self.paginator.paginate_queryset(request, queryset, self)
+        return paginator.paginate_queryset(request, queryset, self)
 
     def get_paginated_response(self, request, data):
-        if self.paginator is None:
+        paginator = self.get_paginator(request)
+        if paginator is None:
             raise AssertionError()
-        return self.paginator.get_paginated_response(request, data)
+        return paginator.get_paginated_response(request, data)
 
     def get_serializer(self, request, *args, **kwargs):
         serializer_class = self.get_serializer_class(request)
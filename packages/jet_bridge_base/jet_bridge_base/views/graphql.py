@@ -3,14 +3,21 @@ import time
 from datetime import timedelta
 
 from graphql import GraphQLError
+from graphql.execution import execute
 
+from jet_bridge_base import settings
 from jet_bridge_base.db import request_connection_cache, get_mapped_base, get_connection_id_short
 from jet_bridge_base.exceptions.permission_denied import PermissionDenied
 from jet_bridge_base.logger import logger
 from jet_bridge_base.permissions import HasProjectPermissions
 from jet_bridge_base.responses.json import JSONResponse
 from jet_bridge_base.utils.common import get_random_string
-from jet_bridge_base.utils.graphql import GraphQLSchemaGenerator
+from jet_bridge_base.utils.conf import get_conf
+from jet_bridge_base.utils.graphql import GraphQLSchemaGenerator, GraphQLLazySchema
+from jet_bridge_base.utils.graphql_artifact import get_graphql_artifact_path, get_graphql_artifact_fingerprint, \
+    dump_graphql_artifact, load_graphql_artifact
+from jet_bridge_base.utils.graphql_documents import get_graphql_document, validate_graphql_document, \
+    get_persisted_query_hash, get_persisted_query, PersistedQueryNotFound
 from jet_bridge_base.utils.process import get_memory_usage_human, get_memory_usage
 from jet_bridge_base.utils.tables import get_table_name
 from jet_bridge_base.utils.track_database import track_database_async
@@ -57,7 +64,7 @@ class GraphQLView(APIView):
             cached_schema = cache.get(schema_key)
             if cached_schema and cached_schema['instance']:
                 logger.info('[{}] Found GraphQL schema "{}"'.format(id_short, wait_schema['id']))
-                return cached_schema['instance']
+                return cached_schema
             else:
                 logger.info('[{}] Not found GraphQL schema "{}"'.format(id_short, wait_schema['id']))
 
@@ -73,6 +80,60 @@ class GraphQLView(APIView):
             'generated': new_schema_generated
         }
 
+    def before_resolve(self, request, mapper, *args, **kwargs):
+        MappedBase = get_mapped_base(request)
+        request.context['model'] = get_table_name(MappedBase.metadata, mapper.selectable)
+        self.check_permissions(request)
+
+    def get_schema_artifact_params(self, request, schema_key, draft, base62):
+        if not settings.CACHE_METADATA or not settings.CACHE_GRAPHQL_SCHEMA:
+            return None, None
+
+        MappedBase = get_mapped_base(request)
+        relationships_overrides = GraphQLSchemaGenerator().get_relationships_overrides(request, draft)
+        artifact_path = get_graphql_artifact_path(get_conf(request), schema_key)
+        artifact_fingerprint = get_graphql_artifact_fingerprint(MappedBase.metadata, relationships_overrides, base62)
+
+        if artifact_fingerprint is None:
+            return None, None
+
+        return artifact_path, artifact_fingerprint
+
+    def load_schema_artifact(self, request, new_schema, artifact_path, artifact_fingerprint, draft, base62):
+        if artifact_path is None:
+            return
+
+        id_short = get_connection_id_short(request)
+
+        try:
+            artifact = load_graphql_artifact(artifact_path, artifact_fingerprint)
+
+            if artifact is None:
+                logger.info('[{}] GraphQL schema artifact not found for "{}"'.format(id_short, new_schema['id']))
+                return
+
+            generator = GraphQLSchemaGenerator(base62=base62, lazy=True)
+            generator.load_relationships_overrides(request, draft)
+            schema = generator.get_artifact_schema(request, artifact, before_resolve=self.before_resolve)
+
+            logger.info('[{}] Loaded GraphQL schema "{}" from artifact'.format(id_short, new_schema['id']))
+
+            return schema
+        except Exception as e:
+            logger.error('[{}] Failed loading GraphQL schema artifact "{}"'.format(id_short, new_schema['id']), exc_info=e)
+
+    def dump_schema_artifact(self, request, new_schema, artifact_path, artifact_fingerprint, generator, schema):
+        if artifact_path is None:
+            return
+
+        id_short = get_connection_id_short(request)
+
+        try:
+            dump_graphql_artifact(artifact_path, artifact_fingerprint, generator.get_schema_artifact(schema))
+            logger.info('[{}] Saved GraphQL schema artifact "{}"'.format(id_short, new_schema['id']))
+        except Exception as e:
+            logger.error('[{}] Failed saving GraphQL schema artifact "{}"'.format(id_short, new_schema['id']), exc_info=e)
+
     def create_schema(self, request, schema_key, new_schema, draft, base62):
         id_short = get_connection_id_short(request)
         memory_usage_before = get_memory_usage()
@@ -80,11 +141,6 @@ class GraphQLView(APIView):
         try:
             logger.info('[{}] Generating GraphQL schema "{}"...'.format(id_short, new_schema['id']))
 
-            def before_resolve(request, mapper, *args, **kwargs):
-                MappedBase = get_mapped_base(request)
-                request.context['model'] = get_table_name(MappedBase.metadata, mapper.selectable)
-                self.check_permissions(request)
-
             def on_progress_updated(request, new_schema, current_name, i, total):
                 if current_name is not None:
                     logger.info('[{}] Generating GraphQL schema "{}" ({} / {}) (Mem:{})...'.format(
@@ -103,12 +159,20 @@ class GraphQLView(APIView):
                         cache[schema_key] = new_schema
 
             get_schema_start = time.time()
-            schema = GraphQLSchemaGenerator(base62=base62).get_schema(
-                request,
-                draft,
-                before_resolve=before_resolve,
-                on_progress_updated=lambda name, i, total: on_progress_updated(request, new_schema, name, i, total)
-            )
+            artifact_path, artifact_fingerprint = self.get_schema_artifact_params(request, schema_key, draft, base62)
+            schema = self.load_schema_artifact(request, new_schema, artifact_path, artifact_fingerprint, draft, base62)
+            artifact = schema is not None
+
+            if schema is None:
+                generator = GraphQLSchemaGenerator(base62=base62)
+                schema = generator.get_schema(
+                    request,
+                    draft,
+                    before_resolve=self.before_resolve,
+                    on_progress_updated=lambda name, i, total: on_progress_updated(request, new_schema, name, i, total)
+                )
+                self.dump_schema_artifact(request, new_schema, artifact_path, artifact_fingerprint, generator, schema)
+
             get_schema_end = time.time()
             get_schema_time = round(get_schema_end - get_schema_start, 3)
             memory_usage_approx = get_memory_usage() - memory_usage_before
@@ -120,6 +184,7 @@ class GraphQLView(APIView):
                     new_schema = {
                         **cached_schema,
                         'instance': schema,
+                        'artifact': artifact,
                         'get_schema_time': get_schema_time,
                         'memory_usage_approx': memory_usage_approx
                     }
@@ -137,7 +202,7 @@ class GraphQLView(APIView):
                         cached_schema.get('id') if cached_schema else None
                     ))
 
-            return schema
+            return {**new_schema, 'instance': schema}
         except Exception as e:
             with request_connection_cache(request) as cache:
                 cached_schema = cache.get(schema_key)
@@ -151,19 +216,47 @@ class GraphQLView(APIView):
             with generated_condition:
                 generated_condition.notify_all()
 
-    def get_schema(self, request, draft, base62):
+    def get_schema_key(self, draft, base62):
         if base62:
-            schema_key = 'graphql_schema_base62_draft' if draft else 'graphql_schema_base62'
+            return 'graphql_schema_base62_draft' if draft else 'graphql_schema_base62'
         else:
-            schema_key = 'graphql_schema_draft' if draft else 'graphql_schema'
+            return 'graphql_schema_draft' if draft else 'graphql_schema'
 
-        wait_schema = None
+    def get_lazy_schema(self, request, draft, base62):
+        schema_key = self.get_schema_key(draft, base62)
 
         with request_connection_cache(request) as cache:
             cached_schema = cache.get(schema_key)
 
-            if cached_schema and cached_schema['instance']:
+            if cached_schema and cached_schema.get('lazy') and cached_schema['instance']:
                 return cached_schema['instance']
+
+        lazy_schema = GraphQLLazySchema(request, draft, base62=base62, before_resolve=self.before_resolve)
+
+        with request_connection_cache(request) as cache:
+            cached_schema = cache.get(schema_key)
+
+            # Other request could create lazy schema in the meantime
+            if cached_schema and cached_schema.get('lazy') and cached_schema['instance']:
+                return cached_schema['instance']
+
+            cache[schema_key] = {
+                **self.create_schema_object(),
+                'instance': lazy_schema,
+                'lazy': True
+            }
+
+        return lazy_schema
+
+    def get_schema(self, request, draft, base62):
+        schema_key = self.get_schema_key(draft, base62)
+        wait_schema = None
+
+        with request_connection_cache(request) as cache:
+            cached_schema = cache.get(schema_key)
+
+            if cached_schema and cached_schema['instance'] and not cached_schema.get('lazy'):
+                return cached_schema
             elif cached_schema and not cached_schema['instance']:
                 wait_schema = cached_schema
             else:
@@ -184,6 +277,35 @@ class GraphQLView(APIView):
     def get(self, request, *args, **kwargs):
         return self.post(request, *args, **kwargs)
 
+    def get_query(self, request):
+        query = request.data.get('query')
+
+        if not settings.GRAPHQL_PERSISTED_QUERIES:
+            return query, None
+
+        query_hash = get_persisted_query_hash(request.data.get('extensions'))
+
+        if query_hash is None:
+            return query, None
+
+        return get_persisted_query(query, query_hash), query_hash
+
+    def get_query_document(self, request, query, query_hash, draft, base62):
+        if settings.GRAPHQL_LAZY_SCHEMA:
+            lazy_schema = self.get_lazy_schema(request, draft, base62)
+            document = get_graphql_document(lazy_schema.id, query, query_hash)
+
+            if 'models_names' not in document:
+                document['models_names'] = lazy_schema.get_query_models_names(document['ast'])
+
+            schema = lazy_schema.get_query_schema(document['models_names'])
+        else:
+            schema_object = self.get_schema(request, draft, base62)
+            schema = schema_object['instance']
+            document = get_graphql_document(schema_object['id'], query, query_hash)
+
+        return schema, document
+
     def post(self, request, *args, **kwargs):
         track_database_async(request)
 
@@ -191,24 +313,36 @@ class GraphQLView(APIView):
         validate = bool(request.data.get('validate', True))
         base62 = bool(request.data.get('base62', False))
 
-        if 'query' not in request.data:
+        try:
+            query, query_hash = self.get_query(request)
+        except PersistedQueryNotFound as e:
+            return JSONResponse({'errors': [str(e)]})
+
+        if query is None:
             return JSONResponse({})
 
         try:
-            schema = self.get_schema(request, draft, base62)
+            schema, document = self.get_query_document(request, query, query_hash, draft, base62)
+        except GraphQLError as e:
+            return JSONResponse({'errors': [self.map_gql_error(e)]})
         except Exception as e:
             return JSONResponse({'errors': ['Failed to get table schema: {}'.format(e)]})
 
-        query = request.data.get('query')
+        if validate:
+            validation_errors = validate_graphql_document(schema, document)
+
+            if len(validation_errors):
+                return JSONResponse({'errors': map(lambda x: self.map_gql_error(x), validation_errors)})
+
         context_value = {
             'request': request,
             'session': request.session
         }
-        result = schema.execute(
-            query,
-            variables={},
+        result = execute(
+            schema,
+            document['ast'],
             context_value=context_value,
-            validate=validate
+            variable_values={}
         )
 
         if result.errors is not None and len(result.errors):
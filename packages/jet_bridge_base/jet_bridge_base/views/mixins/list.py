@@ -1,7 +1,12 @@
+from itertools import islice
+
 from sqlalchemy.exc import SQLAlchemyError
 
-from jet_bridge_base.db_types import get_queryset_limit
+from jet_bridge_base import settings
+from jet_bridge_base.db import detach_session
+from jet_bridge_base.db_types import get_queryset_limit, MongoQueryset
 from jet_bridge_base.responses.json import JSONResponse
+from jet_bridge_base.responses.streaming_json import StreamingJSONResponse
 from jet_bridge_base.utils.track_database import track_database_async
 
 
@@ -30,6 +35,9 @@ class ListAPIViewMixin(object):
         if get_queryset_limit(queryset) is None:
             queryset = queryset.limit(10000)
 
+        if settings.STREAM_RESPONSES:
+            return self.get_streaming_response(request, queryset)
+
         try:
             instance = list(queryset)
             serializer = self.get_serializer(request, instance=instance, many=True)
@@ -38,3 +46,34 @@ class ListAPIViewMixin(object):
         except SQLAlchemyError:
             request.session.rollback()
             raise
+
+    def get_streaming_response(self, request, queryset):
+        chunk_size = settings.STREAM_CHUNK_SIZE
+
+        if isinstance(queryset, MongoQueryset):
+            rows = iter(queryset)
+        else:
+            rows = iter(queryset.yield_per(chunk_size))
+
+        try:
+            # Query is executed before response is returned, so errors are returned as usual
+            first_chunk = list(islice(rows, chunk_size))
+        except SQLAlchemyError:
+            request.session.rollback()
+            raise
+
+        def serialize_chunks():
+            chunk = first_chunk
+
+            while len(chunk):
+                serializer = self.get_serializer(request, instance=chunk, many=True)
+
+                for item in serializer.representation_data:
+                    yield item
+
+                if len(chunk) < chunk_size:
+                    break
+
+                chunk = list(islice(rows, chunk_size))
+
+        return StreamingJSONResponse(serialize_chunks(), on_close=detach_session(request), chunk_size=chunk_size)
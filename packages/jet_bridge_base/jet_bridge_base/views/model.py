@@ -1,6 +1,7 @@
 from sqlalchemy.orm import Query
 
 from jet_bridge_base import status, fields
+from jet_bridge_base.configuration import configuration
 from jet_bridge_base.exceptions.missing_argument_error import MissingArgumentError
 from jet_bridge_base.exceptions.validation_error import ValidationError
 from jet_bridge_base.utils.exceptions import serialize_validation_error
@@ -10,11 +11,12 @@ from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.engine import Row
 
 from jet_bridge_base.db import get_mapped_base
-from jet_bridge_base.db_types import apply_default_ordering, MongoQueryset
+from jet_bridge_base.db_types import apply_default_ordering, MongoQueryset, MongoSession, MongoBulkWriteError
 from jet_bridge_base.exceptions.not_found import NotFound
 from jet_bridge_base.filters.model import get_model_filter_class
 from jet_bridge_base.filters.model_aggregate import ModelAggregateFilter
 from jet_bridge_base.filters.model_group import ModelGroupFilter
+from jet_bridge_base.paginators.cursor import CursorPagination
 from jet_bridge_base.permissions import HasProjectPermissions, ReadOnly
 from jet_bridge_base.responses.json import JSONResponse
 from jet_bridge_base.router import action
@@ -23,12 +25,14 @@ from jet_bridge_base.serializers.model_group import ModelGroupSerializer
 from jet_bridge_base.serializers.reorder import get_reorder_serializer
 from jet_bridge_base.serializers.reset_order import get_reset_order_serializer
 from jet_bridge_base.utils.siblings import get_model_siblings
+from jet_bridge_base.utils.sql_cache import invalidate_sql_cache
 from jet_bridge_base.views.mixins.model import ModelAPIViewMixin
 
 
 class ModelViewSet(ModelAPIViewMixin):
     permission_classes = (HasProjectPermissions, ReadOnly)
     track_queries = True
+    coalesced_actions = ['list', 'aggregate', 'group']
 
     def before_dispatch(self, request):
         super(ModelViewSet, self).before_dispatch(request)
@@ -36,6 +40,16 @@ class ModelViewSet(ModelAPIViewMixin):
     def on_finish(self):
         super(ModelViewSet, self).on_finish()
 
+    def dispatch(self, action, request, *args, **kwargs):
+        response = super(ModelViewSet, self).dispatch(action, request, *args, **kwargs)
+
+        if action in ['create', 'update', 'partial_update', 'destroy', 'bulk_create', 'reorder', 'reset_order']:
+            # Cached SQL query results referencing changed table are not valid anymore
+            mapper = inspect_uniform(self.get_model(request))
+            invalidate_sql_cache(request, mapper.selectable.name)
+
+        return response
+
     def required_project_permission(self, request):
         model_name = self.get_model_name(request)
         return {
@@ -74,7 +88,7 @@ class ModelViewSet(ModelAPIViewMixin):
 
     def get_serializer_class(self, request):
         Model = self.get_model(request)
-        return get_model_serializer(Model)
+        return get_model_serializer(Model, request)
 
     def get_filter_class(self, request):
         Model = self.get_model(request)
@@ -91,6 +105,11 @@ class ModelViewSet(ModelAPIViewMixin):
 
         return queryset
 
+    def get_pagination_class(self, request):
+        if request.get_argument(CursorPagination.cursor_query_param, None) is not None:
+            return CursorPagination
+        return super(ModelViewSet, self).get_pagination_class(request)
+
     def filter_queryset(self, request, queryset):
         queryset = super(ModelViewSet, self).filter_queryset(request, queryset)
         if request.action == 'list':
@@ -106,6 +125,9 @@ class ModelViewSet(ModelAPIViewMixin):
         self.apply_timezone(request)
         request.apply_rls_if_enabled()
 
+        if isinstance(request.session, MongoSession):
+            return self.bulk_create_mongo(request)
+
         result = []
 
         for item in request.data:
@@ -122,6 +144,46 @@ class ModelViewSet(ModelAPIViewMixin):
 
         return JSONResponse(result, status=status.HTTP_200_OK)
 
+    def bulk_create_mongo(self, request):
+        model = request.path_kwargs['model']
+        result = []
+        instances = []
+
+        # Documents are inserted with bulk writes instead of one request per document
+        with request.session.defer_commit():
+            for item in request.data:
+                serializer = self.get_serializer(request, data=item)
+
+                try:
+                    serializer.is_valid(raise_exception=True)
+                    serializer_instance = serializer.create_instance(serializer.validated_data)
+                    configuration.on_model_pre_create(model, serializer_instance)
+                    instance = serializer.save()
+                    instances.append((len(result), instance))
+                    result.append({'success': True})
+                except ValidationError as e:
+                    result.append({'success': False, 'errors': serialize_validation_error(e)})
+                except Exception as e:
+                    result.append({'success': False, 'errors': {'non_field_errors': str(e)}})
+
+        try:
+            request.session.commit(ordered=False)
+        except MongoBulkWriteError as e:
+            for index, instance in instances:
+                error = e.get_record_error(instance)
+                if error is not None:
+                    result[index] = {'success': False, 'errors': {'non_field_errors': error}}
+        except Exception as e:
+            for index, instance in instances:
+                result[index] = {'success': False, 'errors': {'non_field_errors': str(e)}}
+
+        # Post create hooks are called only for documents which were actually written
+        for index, instance in instances:
+            if result[index]['success']:
+                configuration.on_model_post_create(model, instance)
+
+        return JSONResponse(result, status=status.HTTP_200_OK)
+
     @action(methods=['get'], detail=False)
     def aggregate(self, request, *args, **kwargs):
         self.apply_timezone(request)
@@ -4,8 +4,9 @@ from sqlalchemy import String, Enum, Date
 from sqlalchemy.orm import MANYTOONE, ONETOMANY
 from sqlalchemy.sql.elements import TextClause
 
-from jet_bridge_base import status, settings
-from jet_bridge_base.db import get_mapped_base, get_request_connection, request_connection_cache, MODEL_DESCRIPTIONS_RESPONSE_CACHE_KEY, MODEL_DESCRIPTIONS_HASH_CACHE_KEY
+from jet_bridge_base import encoders, status, settings
+from jet_bridge_base.db import get_mapped_base, get_request_connection, request_connection_cache, MODEL_DESCRIPTIONS_RESPONSE_CACHE_KEY, MODEL_DESCRIPTIONS_HASH_CACHE_KEY, \
+    MODEL_DESCRIPTIONS_CACHE_KEY
 from jet_bridge_base.db_types import inspect_uniform
 from jet_bridge_base.db_types.mongo import MongoColumn
 from jet_bridge_base.models.model_relation_override import ModelRelationOverrideModel
@@ -381,76 +382,172 @@ def map_table(MappedBase, cls, relationships_overrides, hidden):
 class ModelDescriptionView(APIView):
     serializer_class = ModelDescriptionSerializer
     permission_classes = (HasProjectPermissions,)
+    hidden = ['__jet__token']
 
-    def get_queryset(self, request):
-        hidden = ['__jet__token']
+    def get_models_argument(self, request):
+        value = request.get_argument('models', None)
+
+        if not value:
+            return
+
+        return list(filter(lambda x: x, map(lambda x: x.strip(), value.split(','))))
+
+    def get_model_classes(self, request, models=None):
         MappedBase = get_mapped_base(request)
+
+        if models is not None:
+            # Only requested models are looked up, lazily mapped base does not map other tables
+            classes = filter(lambda x: x is not None, map(lambda x: MappedBase.classes.get(x), set(models)))
+        else:
+            classes = MappedBase.classes
+
+        return sorted(
+            map(lambda x: (get_table_name(MappedBase.metadata, inspect_uniform(x).tables[0]), x), classes),
+            key=lambda x: x[0]
+        )
+
+    def get_relationships_overrides(self, request, models=None):
         relationships_overrides = {}
         draft = bool(request.get_argument('draft', False))
 
-        if store.is_ok():
-            connection = get_request_connection(request)
+        if not store.is_ok():
+            return relationships_overrides
 
-            with store.session() as session:
-                overrides = session.query(ModelRelationOverrideModel).filter(
-                    ModelRelationOverrideModel.connection_id == connection['id'],
-                    draft == draft
-                ).all()
+        connection = get_request_connection(request)
 
-                for override in overrides:
-                    if override.model not in relationships_overrides:
-                        relationships_overrides[override.model] = []
-                    relationships_overrides[override.model].append(override)
+        with store.session() as session:
+            queryset = session.query(ModelRelationOverrideModel).filter(
+                ModelRelationOverrideModel.connection_id == connection['id'],
+                draft == draft
+            )
 
-        return sorted(
-            list(map(lambda x: map_table(MappedBase, x, relationships_overrides, hidden), MappedBase.classes)),
-            key=lambda x: x['model']
-        )
+            if models is not None:
+                queryset = queryset.filter(ModelRelationOverrideModel.model.in_(models))
 
-    def get(self, request, *args, **kwargs):
-        queryset = self.get_queryset(request)
-        serializer = self.serializer_class(instance=queryset, many=True)
-        cid = request.get_argument('cid', None)
-        client_cache_enabled = cid is not None
+            for override in queryset.all():
+                if override.model not in relationships_overrides:
+                    relationships_overrides[override.model] = []
+                relationships_overrides[override.model].append(override)
 
-        with request_connection_cache(request) as cache:
-            rendered_data = cache.get(MODEL_DESCRIPTIONS_RESPONSE_CACHE_KEY) \
-                if settings.CACHE_MODEL_DESCRIPTIONS else None
+        return relationships_overrides
+
+    def get_queryset(self, request, classes=None):
+        MappedBase = get_mapped_base(request)
+
+        if classes is None:
+            classes = self.get_model_classes(request)
+
+        relationships_overrides = self.get_relationships_overrides(request, list(map(lambda x: x[0], classes)))
+
+        return list(map(lambda x: map_table(MappedBase, x[1], relationships_overrides, self.hidden), classes))
+
+    def render_description(self, description):
+        serializer = self.serializer_class(instance=description)
+        return encoders.json_dumps(serializer.representation_data)
+
+    def get_description_related_models(self, description):
+        result = set(map(lambda x: x['related_model'], description['relations']))
 
-            if rendered_data is not None:
-                if client_cache_enabled:
-                    rendered_data_hash = cache.get(MODEL_DESCRIPTIONS_HASH_CACHE_KEY, get_sha256_hash(rendered_data))
-                else:
-                    rendered_data_hash = None
+        for field in description['fields']:
+            related_model = (field.get('params') or {}).get('related_model')
+            if related_model:
+                result.add(related_model['model'])
 
-                if client_cache_enabled:
-                    not_modified_response = self.get_not_modified_response(request, rendered_data_hash)
-                    if not_modified_response:
-                        return not_modified_response
+        return result
 
-                response = JSONResponse(rendered_data=rendered_data)
+    def get_rendered_descriptions(self, request, classes):
+        cache_enabled = settings.CACHE_MODEL_DESCRIPTIONS
+        rendered_descriptions = {}
 
-                if client_cache_enabled:
-                    self.set_response_cache_headers(response, rendered_data_hash)
+        if cache_enabled:
+            with request_connection_cache(request) as cache:
+                cached_descriptions = cache.get(MODEL_DESCRIPTIONS_CACHE_KEY) or {}
 
-                return response
-            else:
-                response = JSONResponse(serializer.representation_data)
-                rendered_data = response.render()
+                for name, cls in classes:
+                    cached_description = cached_descriptions.get(name)
+                    if cached_description is not None:
+                        rendered_descriptions[name] = cached_description['rendered']
 
-                cache[MODEL_DESCRIPTIONS_RESPONSE_CACHE_KEY] = rendered_data
+        missing_classes = list(filter(lambda x: x[0] not in rendered_descriptions, classes))
 
-                if client_cache_enabled:
-                    rendered_data_hash = get_sha256_hash(rendered_data)
+        if len(missing_classes):
+            new_descriptions = {}
+
+            for (name, cls), description in zip(missing_classes, self.get_queryset(request, missing_classes)):
+                rendered = self.render_description(description)
+                rendered_descriptions[name] = rendered
+                new_descriptions[name] = {
+                    'rendered': rendered,
+                    'related_models': self.get_description_related_models(description)
+                }
+
+            if cache_enabled:
+                with request_connection_cache(request) as cache:
+                    cached_descriptions = cache.get(MODEL_DESCRIPTIONS_CACHE_KEY)
+
+                    if cached_descriptions is None:
+                        cached_descriptions = {}
+                        cache[MODEL_DESCRIPTIONS_CACHE_KEY] = cached_descriptions
+
+                    cached_descriptions.update(new_descriptions)
+
+        return list(map(lambda x: rendered_descriptions[x[0]], classes))
+
+    def render_descriptions(self, request, models=None):
+        classes = self.get_model_classes(request, models)
+        rendered_descriptions = self.get_rendered_descriptions(request, classes)
+        separator = encoders.get_json_backend().item_separator
+        return '[{}]'.format(separator.join(rendered_descriptions))
+
+    def get_cached_response(self, request):
+        if not settings.CACHE_MODEL_DESCRIPTIONS:
+            return None, None
+
+        with request_connection_cache(request) as cache:
+            rendered_data = cache.get(MODEL_DESCRIPTIONS_RESPONSE_CACHE_KEY)
+            rendered_data_hash = cache.get(MODEL_DESCRIPTIONS_HASH_CACHE_KEY)
+
+            if rendered_data is not None and rendered_data_hash is None:
+                rendered_data_hash = get_sha256_hash(rendered_data)
+                cache[MODEL_DESCRIPTIONS_HASH_CACHE_KEY] = rendered_data_hash
+
+            return rendered_data, rendered_data_hash
+
+    def get(self, request, *args, **kwargs):
+        models = self.get_models_argument(request)
+        hash_only = bool(request.get_argument('hash_only', False))
+        cid = request.get_argument('cid', None)
+        client_cache_enabled = cid is not None
+
+        # Cache is checked before any models are mapped
+        if models is None:
+            rendered_data, rendered_data_hash = self.get_cached_response(request)
+        else:
+            rendered_data, rendered_data_hash = None, None
+
+        if rendered_data is None:
+            rendered_data = self.render_descriptions(request, models)
+            rendered_data_hash = get_sha256_hash(rendered_data)
+
+            if models is None and settings.CACHE_MODEL_DESCRIPTIONS:
+                with request_connection_cache(request) as cache:
+                    cache[MODEL_DESCRIPTIONS_RESPONSE_CACHE_KEY] = rendered_data
                     cache[MODEL_DESCRIPTIONS_HASH_CACHE_KEY] = rendered_data_hash
 
-                    not_modified_response = self.get_not_modified_response(request, rendered_data_hash)
-                    if not_modified_response:
-                        return not_modified_response
+        if client_cache_enabled:
+            not_modified_response = self.get_not_modified_response(request, rendered_data_hash)
+            if not_modified_response:
+                return not_modified_response
+
+        if hash_only:
+            response = JSONResponse({'hash': rendered_data_hash})
+        else:
+            response = JSONResponse(rendered_data=rendered_data)
 
-                    self.set_response_cache_headers(response, rendered_data_hash)
+        if client_cache_enabled:
+            self.set_response_cache_headers(response, rendered_data_hash)
 
-                return response
+        return response
 
     def set_response_cache_headers(self, response, rendered_data_hash):
         response.headers['Cache-Control'] = 'no-cache'
@@ -1,5 +1,6 @@
-from jet_bridge_base.db import dispose_request_connection, get_request_connection
+from jet_bridge_base.db import dispose_request_connection, get_request_connection, refresh_request_mapped_base
 from jet_bridge_base.db_types import remove_metadata_file
+from jet_bridge_base.fields import BooleanField
 from jet_bridge_base.permissions import HasProjectPermissions
 from jet_bridge_base.responses.json import JSONResponse
 from jet_bridge_base.utils.conf import get_conf
@@ -17,6 +18,14 @@ class ReloadView(APIView):
         }
 
     def post(self, request, *args, **kwargs):
+        if request.get_argument('incremental', None) in BooleanField.TRUE_VALUES:
+            changed = refresh_request_mapped_base(request)
+
+            return JSONResponse({
+                'success': True,
+                'changed': changed
+            })
+
         conf = get_conf(request)
         remove_metadata_file(conf)
 
@@ -1,6 +1,11 @@
+from jet_bridge_base import settings
+from jet_bridge_base.db import detach_session
 from jet_bridge_base.permissions import HasProjectPermissions
 from jet_bridge_base.responses.json import JSONResponse
-from jet_bridge_base.serializers.sql import SqlSerializer, SqlsSerializer
+from jet_bridge_base.responses.msgpack import MsgpackResponse
+from jet_bridge_base.responses.streaming_json import StreamingJSONResponse
+from jet_bridge_base.serializers.sql import SqlSerializer, SqlsSerializer, SQL_FORMAT_ROWS, SQL_FORMAT_MSGPACK
+from jet_bridge_base.utils.sql_cache import is_read_only_query
 from jet_bridge_base.utils.track_database import track_database_async
 from jet_bridge_base.views.base.api import APIView
 
@@ -8,6 +13,19 @@ from jet_bridge_base.views.base.api import APIView
 class SqlView(APIView):
     permission_classes = (HasProjectPermissions,)
     track_queries = True
+    coalesced_actions = ['post']
+
+    def is_coalesced_action(self, request, action):
+        if not super(SqlView, self).is_coalesced_action(request, action):
+            return False
+
+        # Writes are never coalesced, identical statements should be executed for each request
+        data = request.data if isinstance(request.data, dict) else {}
+        queries = data.get('queries') if 'queries' in data else [data]
+        return isinstance(queries, list) and all(map(
+            lambda x: isinstance(x, dict) and isinstance(x.get('query'), str) and is_read_only_query(x['query']),
+            queries
+        ))
 
     def post(self, request, *args, **kwargs):
         track_database_async(request)
@@ -18,5 +36,20 @@ class SqlView(APIView):
             serializer = SqlSerializer(data=request.data, context={'request': request})
 
         serializer.is_valid(raise_exception=True)
+
+        if isinstance(serializer, SqlSerializer):
+            result_format = serializer.validated_data.get('format') or SQL_FORMAT_ROWS
+
+            if result_format == SQL_FORMAT_MSGPACK:
+                if settings.STREAM_RESPONSES:
+                    result = serializer.execute(serializer.validated_data, stream=True)
+                    return MsgpackResponse(result, on_close=detach_session(request))
+                else:
+                    result = serializer.execute(serializer.validated_data)
+                    return MsgpackResponse(result)
+            elif result_format == SQL_FORMAT_ROWS and settings.STREAM_RESPONSES:
+                result = serializer.execute(serializer.validated_data, stream=True)
+                return StreamingJSONResponse(result, on_close=detach_session(request))
+
         result = serializer.execute(serializer.validated_data)
         return JSONResponse(result)
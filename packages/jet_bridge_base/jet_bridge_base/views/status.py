@@ -1,26 +1,61 @@
 import time
 
 from jet_bridge_base.configuration import configuration
-from jet_bridge_base.db import connections, pending_connections
-from jet_bridge_base.db_types import inspect_uniform
+from jet_bridge_base.db import connections, pending_connections, get_connection_memory_usage_approx, \
+    get_connections_registry_stats
+from jet_bridge_base.db_types import inspect_uniform, get_loaded_classes, count_cache
 from jet_bridge_base.permissions import AdministratorPermissions
 from jet_bridge_base.responses.json import JSONResponse
 from jet_bridge_base.sentry import sentry_controller
+from jet_bridge_base.utils.bridge_settings import bridge_settings_cache
 from jet_bridge_base.utils.classes import issubclass_safe
 from jet_bridge_base.utils.common import format_size
 from jet_bridge_base.utils.graphql import ModelFiltersType, ModelFiltersFieldType, ModelFiltersRelationshipType, \
     ModelLookupsType, ModelLookupsFieldType, ModelLookupsRelationshipType, ModelSortType, ModelAttrsType
+from jet_bridge_base.utils.graphql_documents import graphql_documents_cache, graphql_persisted_queries_cache
 from jet_bridge_base.utils.process import get_memory_usage
+from jet_bridge_base.utils.single_flight import requests_single_flight
+from jet_bridge_base.utils.sql_cache import sql_cache
 from jet_bridge_base.views.base.api import BaseAPIView
 
 
 class StatusView(BaseAPIView):
     permission_classes = (AdministratorPermissions,)
 
+    def map_connection_lazy_graphql_schema(self, schema):
+        instance = schema['instance']
+        models = list(instance.models.values())
+        memory_usage_approx = instance.get_memory_usage_approx()
+
+        def map_model(model):
+            model_memory_usage_approx = model['memory_usage_approx']
+
+            return {
+                'name': model['name'],
+                'types': len(model['types']),
+                'get_schema_time': model['get_schema_time'],
+                'memory_usage_approx': model_memory_usage_approx,
+                'memory_usage_approx_str': format_size(model_memory_usage_approx) if model_memory_usage_approx else None,
+                'last_used': model['last_used'].isoformat()
+            }
+
+        return {
+            'status': 'lazy',
+            'tables_processed': len(models),
+            'tables_total': len(instance.models_names),
+            'query_schemas': len(instance.query_schemas),
+            'models': list(map(map_model, models)),
+            'memory_usage_approx': memory_usage_approx,
+            'memory_usage_approx_str': format_size(memory_usage_approx) if memory_usage_approx else None
+        }
+
     def map_connection_graphql_schema(self, schema):
         if not schema:
             return {'status': 'no_schema'}
 
+        if schema.get('lazy') and schema.get('instance'):
+            return self.map_connection_lazy_graphql_schema(schema)
+
         instance = schema.get('instance')
         tables_processed = schema.get('tables_processed', 0)
         tables_total = schema.get('tables_total')
@@ -61,6 +96,7 @@ class StatusView(BaseAPIView):
 
             return {
                 'status': 'ok',
+                'artifact': schema.get('artifact', False),
                 'tables_processed': tables_processed,
                 'tables_total': tables_total,
                 'types': types_count,
@@ -96,10 +132,12 @@ class StatusView(BaseAPIView):
     def map_connection(self, connection):
         cache = connection['cache']
         MappedBase = connection['MappedBase']
+        # Only models mapped so far are counted, status should not map all tables in lazy mapping mode
+        models = get_loaded_classes(MappedBase)
         column_count = 0
         relationships_count = 0
 
-        for Model in MappedBase.classes:
+        for Model in models:
             try:
                 mapper = inspect_uniform(Model)
                 column_count += len(mapper.columns)
@@ -116,6 +154,7 @@ class StatusView(BaseAPIView):
         default_timezone_updated = connection.get('default_timezone_updated')
 
         reflect_memory_usage_approx = connection.get('reflect_memory_usage_approx')
+        memory_usage_approx = get_connection_memory_usage_approx(connection)
 
         return {
             'id': connection['id'],
@@ -123,7 +162,7 @@ class StatusView(BaseAPIView):
             'params_id': connection['params_id'],
             'project': connection.get('project'),
             'token': connection.get('token'),
-            'tables': len(MappedBase.classes),
+            'tables': len(models),
             'columns': column_count,
             'relationships': relationships_count,
             'graphql_schema': graphql_schema,
@@ -136,6 +175,9 @@ class StatusView(BaseAPIView):
             'reflect_memory_usage_approx': reflect_memory_usage_approx,
             'reflect_memory_usage_approx_str': format_size(reflect_memory_usage_approx) if reflect_memory_usage_approx else None,
             'reflect_metadata_dump': connection.get('reflect_metadata_dump'),
+            'memory_usage_approx': memory_usage_approx,
+            'memory_usage_approx_str': format_size(memory_usage_approx) if memory_usage_approx else None,
+            'active_requests': connection.get('active_requests'),
             'default_timezone': str(connection['default_timezone']) if connection.get('default_timezone') else None,
             'default_timezone_updated': default_timezone_updated.isoformat() if default_timezone_updated else None,
             'tunnel': tunnel,
@@ -189,6 +231,13 @@ class StatusView(BaseAPIView):
             'pending_connections': map(lambda x: self.map_pending_connection(x), pending_connections.values()),
             'schema_generating_connections': map(lambda x: self.map_connection(x), schema_generating_connections),
             'active_connections': map(lambda x: self.map_connection(x), active_connections),
+            'connections_registry': get_connections_registry_stats(),
+            'bridge_settings_cache': bridge_settings_cache.get_stats(),
+            'count_cache': count_cache.get_stats(),
+            'graphql_documents_cache': graphql_documents_cache.get_stats(),
+            'graphql_persisted_queries_cache': graphql_persisted_queries_cache.get_stats(),
+            'sql_cache': sql_cache.get_stats(),
+            'requests_single_flight': requests_single_flight.get_stats(),
             'memory_used': memory_used,
             'memory_used_str': format_size(memory_used),
             'uptime': uptime
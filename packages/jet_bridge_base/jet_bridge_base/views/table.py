@@ -22,8 +22,8 @@ class TableView(APIView):
         engine = get_engine(request)
         return MappedBase.metadata, engine
 
-    def update_base(self, request):
-        reload_request_mapped_base(request)
+    def update_base(self, request, table_name):
+        reload_request_mapped_base(request, [table_name])
 
     def get_object(self, request):
         metadata, engine = self.get_db(request)
@@ -80,7 +80,7 @@ class TableView(APIView):
             table.create(bind=engine)
 
             metadata._set_parent(table)
-            self.update_base(request)
+            self.update_base(request, table.name)
         except Exception as e:
             metadata.remove(table)
             raise e
@@ -99,4 +99,4 @@ class TableView(APIView):
             raise ValidationError(str(e))
 
         metadata.remove(table)
-        self.update_base(request)
+        self.update_base(request, table.name)
@@ -126,7 +126,7 @@ class TableColumnView(APIView):
         return MappedBase.metadata, engine
 
     def update_base(self, request):
-        reload_request_mapped_base(request)
+        reload_request_mapped_base(request, [request.path_kwargs['table']])
 
     def get_table(self, request):
         metadata, engine = self.get_db(request)
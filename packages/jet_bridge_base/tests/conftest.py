@@ -0,0 +1,72 @@
+import datetime
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from jet_bridge_base.request import Request
+from jet_bridge_base.serializers.sql import SqlSerializer
+
+SQL_ITEMS_COUNT = 100
+
+
+@pytest.fixture
+def sql_items_count():
+    return SQL_ITEMS_COUNT
+
+
+@pytest.fixture
+def sql_engine(tmp_path):
+    engine = create_engine('sqlite:///{}'.format(tmp_path / 'test.sqlite3'))
+
+    with engine.begin() as connection:
+        connection.exec_driver_sql(
+            'CREATE TABLE item (id INTEGER PRIMARY KEY, name TEXT, value NUMERIC, data BLOB, created DATETIME)'
+        )
+
+        for i in range(1, SQL_ITEMS_COUNT + 1):
+            connection.exec_driver_sql('INSERT INTO item VALUES (?, ?, ?, ?, ?)', (
+                i,
+                'item {}'.format(i) if i % 7 else None,
+                i * 1.5,
+                'ü{}'.format(i).encode('utf-8') if i % 2 else b'\xff',
+                datetime.datetime(2020, 1, 1) + datetime.timedelta(hours=i)
+            ))
+
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def sql_request():
+    request = Request(method='POST', action='post')
+    request.conf = {'engine': 'sqlite', 'name': 'test'}
+    return request
+
+
+@pytest.fixture
+def execute_sql(sql_engine, sql_request):
+    """
+    Validates and executes SQL query data with SqlSerializer on a new session,
+    conf options (sql_max_rows, sql_max_response_size) are passed as keyword arguments.
+    """
+
+    Session = sessionmaker(bind=sql_engine)
+
+    def execute(data, stream=False, use_cache=False, **conf):
+        serializer = SqlSerializer(data=data, context={'request': sql_request})
+        serializer.is_valid(raise_exception=True)
+
+        state = {
+            'conf': dict(sql_request.conf, **conf),
+            'rls_key': None,
+            'count_cache_scope': ('test', None),
+            'count_concurrent': False,
+            'default_timezone': None,
+            'type_code_to_sql_type': None
+        }
+        sql_request.session = Session()
+
+        return serializer.execute(serializer.validated_data, stream=stream, use_cache=use_cache, state=state)
+
+    return execute
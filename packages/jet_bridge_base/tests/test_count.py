@@ -0,0 +1,109 @@
+import pytest
+from sqlalchemy import create_engine, Column, Integer
+from sqlalchemy.orm import declarative_base, sessionmaker
+
+from jet_bridge_base import settings
+from jet_bridge_base.db_types import count as count_module
+from jet_bridge_base.db_types.count import queryset_count_strategy, count_cache, get_count_strategy, \
+    COUNT_STRATEGY_EXACT, COUNT_STRATEGY_CAPPED, COUNT_STRATEGY_ESTIMATE, COUNT_STRATEGY_CACHED, \
+    COUNT_STRATEGY_AUTO, COUNT_ESTIMATE_MIN
+from jet_bridge_base.exceptions.validation_error import ValidationError
+
+Base = declarative_base()
+
+
+class Item(Base):
+    __tablename__ = 'item'
+    id = Column(Integer, primary_key=True)
+    value = Column(Integer)
+
+
+@pytest.fixture
+def session():
+    engine = create_engine('sqlite://')
+    Base.metadata.create_all(engine)
+    session = sessionmaker(bind=engine)()
+    session.add_all(map(lambda x: Item(id=x, value=x % 10), range(1, 51)))
+    session.commit()
+    count_cache.clear()
+    yield session
+    count_cache.clear()
+    session.close()
+
+
+def count(session, queryset, strategy, **kwargs):
+    return queryset_count_strategy(session, queryset, strategy, **kwargs)
+
+
+def test_exact(session):
+    assert count(session, session.query(Item), COUNT_STRATEGY_EXACT) == (50, True)
+    assert count(session, session.query(Item).filter(Item.value == 1), COUNT_STRATEGY_EXACT) == (5, True)
+
+
+def test_ordering_and_pagination_ignored_by_count(session):
+    queryset = session.query(Item).order_by(Item.value.desc()).filter(Item.value < 5)
+    assert count(session, queryset, COUNT_STRATEGY_EXACT) == (25, True)
+
+
+def test_capped(session, monkeypatch):
+    monkeypatch.setattr(settings, 'COUNT_CAP', 20)
+
+    assert count(session, session.query(Item), COUNT_STRATEGY_CAPPED) == (20, False)
+    assert count(session, session.query(Item).filter(Item.value < 3), COUNT_STRATEGY_CAPPED) == (15, True)
+
+
+def test_estimate_without_statistics(session):
+    # SQLite has no statistics, capped count is used instead
+    assert count(session, session.query(Item), COUNT_STRATEGY_ESTIMATE) == (50, True)
+
+
+def test_estimate(session, monkeypatch):
+    monkeypatch.setattr(count_module, 'queryset_count_estimate', lambda *args: COUNT_ESTIMATE_MIN * 3)
+    assert count(session, session.query(Item), COUNT_STRATEGY_ESTIMATE) == (COUNT_ESTIMATE_MIN * 3, False)
+
+    # Small estimates are not reliable and are checked
+    monkeypatch.setattr(count_module, 'queryset_count_estimate', lambda *args: 10)
+    assert count(session, session.query(Item), COUNT_STRATEGY_ESTIMATE) == (50, True)
+
+
+def test_auto(session, monkeypatch):
+    monkeypatch.setattr(count_module, 'queryset_count_unfiltered_estimate', lambda *args: COUNT_ESTIMATE_MIN * 2)
+
+    assert count(session, session.query(Item), COUNT_STRATEGY_AUTO) == (COUNT_ESTIMATE_MIN * 2, False)
+    # Statistics are used only for unfiltered tables
+    assert count(session, session.query(Item).filter(Item.value == 1), COUNT_STRATEGY_AUTO) == (5, True)
+
+
+def test_cached(session):
+    queryset = session.query(Item).filter(Item.value == 1)
+
+    assert count(session, queryset, COUNT_STRATEGY_CACHED, cache_scope='a') == (5, True)
+
+    session.add(Item(id=100, value=1))
+    session.commit()
+
+    # Cached count can be stale
+    assert count(session, queryset, COUNT_STRATEGY_CACHED, cache_scope='a') == (5, False)
+    # Other scope (connection or RLS identity) and other filter values are counted separately
+    assert count(session, queryset, COUNT_STRATEGY_CACHED, cache_scope='b') == (6, True)
+    assert count(session, session.query(Item).filter(Item.value == 2), COUNT_STRATEGY_CACHED, cache_scope='a') \
+        == (5, True)
+
+
+def test_cached_ttl(session, monkeypatch):
+    monkeypatch.setattr(settings, 'COUNT_CACHE_TTL', -1)
+    queryset = session.query(Item)
+
+    assert count(session, queryset, COUNT_STRATEGY_CACHED) == (50, True)
+    assert count(session, queryset, COUNT_STRATEGY_CACHED) == (50, True)
+
+
+def test_default_strategy(monkeypatch):
+    monkeypatch.setattr(settings, 'COUNT_STRATEGY', None)
+    assert get_count_strategy() == COUNT_STRATEGY_AUTO
+    assert get_count_strategy(COUNT_STRATEGY_CAPPED) == COUNT_STRATEGY_CAPPED
+
+
+def test_unknown_strategy():
+    with pytest.raises(ValidationError):
+        get_count_strategy('unknown')
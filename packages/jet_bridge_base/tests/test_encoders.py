@@ -0,0 +1,87 @@
+import datetime
+import decimal
+import json
+import uuid
+
+import pytest
+from bson import ObjectId
+
+from jet_bridge_base import encoders, settings
+from jet_bridge_base.encoders import JSONBackend, CompactJSONBackend, OrjsonBackend, get_json_backend
+
+requires_orjson = pytest.mark.skipif(encoders.orjson is None, reason='orjson is not installed')
+
+UTC_PLUS_3 = datetime.timezone(datetime.timedelta(hours=3))
+
+VALUES = [
+    (datetime.datetime(2020, 1, 2, 3, 4, 5, 123456, tzinfo=UTC_PLUS_3), '2020-01-02T03:04:05.123456+03:00'),
+    (datetime.datetime(2020, 1, 2, 3, 4, 5, tzinfo=datetime.timezone.utc), '2020-01-02T03:04:05Z'),
+    (datetime.datetime(2020, 1, 2, 3, 4, 5), '2020-01-02T03:04:05'),
+    (datetime.date(2020, 1, 2), '2020-01-02'),
+    (datetime.time(3, 4, 5, 6), '03:04:05.000006'),
+    (datetime.timedelta(minutes=90, microseconds=5), '5400.000005'),
+    (decimal.Decimal('1.10'), 1.1),
+    (decimal.Decimal('NaN'), None),
+    (decimal.Decimal('-Infinity'), None),
+    (uuid.UUID(int=5), '00000000-0000-0000-0000-000000000005'),
+    (ObjectId('5f1d7a0b2f8fb814b56fa181'), '5f1d7a0b2f8fb814b56fa181'),
+    (b'abc', 'abc'),
+    ({1, 2}, [1, 2]),
+    ((1, 'a'), [1, 'a']),
+    (float('nan'), None),
+    (float('inf'), None),
+    (-float('inf'), None),
+    ({1: 'a', 2: 'b'}, {'1': 'a', '2': 'b'}),
+    (2 ** 70, 2 ** 70),
+    (-2 ** 70, -2 ** 70),
+    ({'a': [float('nan'), 2 ** 65]}, {'a': [None, 2 ** 65]}),
+    ({'a': [1, {'b': None}], 'c': 'ü\u2028'}, {'a': [1, {'b': None}], 'c': 'ü\u2028'}),
+    ([0.1, -0.0, 1.5, 123456.789], [0.1, -0.0, 1.5, 123456.789]),
+]
+
+# Allowed differences between json and orjson backends output: (value, json output, orjson output)
+BACKENDS_DIFFERENCES = [
+    # Separators, orjson output is compact
+    ({'a': [1, 2]}, '{"a": [1, 2]}', '{"a":[1,2]}'),
+    # Non-ASCII characters are escaped only by json
+    ('ü', '"\\u00fc"', '"ü"'),
+    # Float exponent format
+    (1e20, '1e+20', '1e20'),
+    (1e-07, '1e-07', '1e-7'),
+]
+
+
+@pytest.mark.parametrize('value,expected', VALUES)
+def test_json_backend(value, expected):
+    assert json.loads(JSONBackend().dumps(value)) == expected
+
+
+@requires_orjson
+@pytest.mark.parametrize('value,expected', VALUES)
+def test_orjson_backend(value, expected):
+    assert json.loads(OrjsonBackend().dumps(value)) == expected
+
+
+@requires_orjson
+@pytest.mark.parametrize('value,expected', VALUES)
+def test_backends_identical(value, expected):
+    # Same separators and escaping as orjson, values here have no floats with exponent
+    assert OrjsonBackend().dumps(value) == CompactJSONBackend().dumps(value)
+
+
+@requires_orjson
+@pytest.mark.parametrize('value,json_output,orjson_output', BACKENDS_DIFFERENCES)
+def test_backends_differences(value, json_output, orjson_output):
+    assert JSONBackend().dumps(value) == json_output
+    assert OrjsonBackend().dumps(value) == orjson_output
+    assert json.loads(json_output) == json.loads(orjson_output)
+
+
+def test_default_backend(monkeypatch):
+    monkeypatch.setattr(settings, 'JSON_BACKEND', None)
+    assert get_json_backend().name == encoders.JSON_BACKEND_JSON
+
+
+def test_unknown_backend():
+    with pytest.raises(ValueError):
+        get_json_backend('unknown')
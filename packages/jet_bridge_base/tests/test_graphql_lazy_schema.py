@@ -0,0 +1,140 @@
+import datetime
+
+import pytest
+from sqlalchemy import create_engine, MetaData
+
+from jet_bridge_base.automap import automap_base
+from jet_bridge_base.db_types.sql import sql_load_mapped_base
+from jet_bridge_base.request import Request
+from jet_bridge_base.utils import graphql as graphql_module
+from jet_bridge_base.utils.graphql import GraphQLLazySchema
+
+SCHEMA = [
+    'CREATE TABLE author (id INTEGER PRIMARY KEY, name TEXT)',
+    'CREATE TABLE book (id INTEGER PRIMARY KEY, author_id INTEGER NOT NULL REFERENCES author(id), name TEXT)',
+    'CREATE TABLE review (id INTEGER PRIMARY KEY, book_id INTEGER NOT NULL REFERENCES book(id), text TEXT)',
+    'CREATE TABLE tag (id INTEGER PRIMARY KEY, name TEXT)'
+]
+
+
+@pytest.fixture
+def engine():
+    engine = create_engine('sqlite://')
+
+    with engine.begin() as connection:
+        for statement in SCHEMA:
+            connection.exec_driver_sql(statement)
+
+    return engine
+
+
+@pytest.fixture
+def schema(engine, monkeypatch):
+    metadata = MetaData()
+    metadata.reflect(bind=engine)
+    MappedBase = automap_base(metadata=metadata)
+    sql_load_mapped_base(MappedBase)
+
+    monkeypatch.setattr(graphql_module, 'get_mapped_base', lambda request: MappedBase)
+    monkeypatch.setattr(graphql_module, 'get_connection_id_short', lambda request: 'test')
+    monkeypatch.setattr(graphql_module, 'get_engine', lambda request: 'sqlite')
+    monkeypatch.setattr(graphql_module.GraphQLSchemaGenerator, 'get_relationships_overrides', lambda *args: {})
+
+    return GraphQLLazySchema(Request(), draft=False)
+
+
+def load_models(schema, names):
+    for name in names:
+        schema.get_query_schema([name])
+
+
+def test_query_models_names(schema):
+    assert sorted(schema.models_names.keys()) == ['author', 'book', 'review', 'tag']
+    assert schema.models == {}
+
+    load_models(schema, ['book'])
+
+    assert list(schema.models.keys()) == ['book']
+
+
+def test_combined_query_schema_cached(schema):
+    combined = schema.get_query_schema(['author', 'book'])
+
+    assert sorted(schema.models.keys()) == ['author', 'book']
+    assert schema.get_query_schema(['author', 'book']) is combined
+    assert schema.get_query_schema(['author']) is schema.models['author']['schema']
+
+
+def test_release_model(schema):
+    schema.get_query_schema(['author', 'book'])
+    schema.get_query_schema(['author', 'tag'])
+    types = schema.models['book']['types']
+
+    assert len(types)
+    assert schema.release_model('book')['name'] == 'book'
+    assert schema.release_model('book') is None
+    assert sorted(schema.models.keys()) == ['author', 'tag']
+    assert list(schema.query_schemas.keys()) == [('author', 'tag')]
+    assert not any(map(lambda x: x in schema.generator.model_filters_types, types))
+
+    load_models(schema, ['book'])
+
+    assert 'book' in schema.models
+
+
+def test_release_inactive_models(schema):
+    load_models(schema, ['author', 'book', 'tag'])
+    inactive = datetime.datetime.now() - datetime.timedelta(seconds=120)
+    schema.models['author']['last_used'] = inactive
+    schema.models['tag']['last_used'] = inactive
+
+    released = schema.release_inactive_models(60)
+
+    assert sorted(map(lambda x: x['name'], released)) == ['author', 'tag']
+    assert list(schema.models.keys()) == ['book']
+    assert schema.release_inactive_models(60) == []
+
+
+def test_used_model_not_released(schema):
+    load_models(schema, ['author'])
+    schema.models['author']['last_used'] = datetime.datetime.now() - datetime.timedelta(seconds=120)
+
+    schema.get_query_schema(['author'])
+
+    assert schema.release_inactive_models(60) == []
+
+
+def test_reload_models_releases_dependent(schema):
+    load_models(schema, ['author', 'book', 'review', 'tag'])
+    types = dict(map(lambda x: (x['name'], x['types']), schema.models.values()))
+
+    schema.reload_models(['author'])
+
+    # Book relates to author, review relates to book through reverse relationships
+    assert list(schema.models.keys()) == ['tag']
+    assert sorted(schema.generator.relationships_by_name.keys()) == ['tag']
+    assert not any(map(
+        lambda x: x in schema.generator.types_registry,
+        types['author'] + types['book'] + types['review']
+    ))
+    assert all(map(lambda x: x in schema.generator.types_registry, types['tag']))
+
+
+def test_reload_models_keeps_unrelated(schema):
+    load_models(schema, ['author', 'book', 'review', 'tag'])
+    models = dict(schema.models)
+
+    schema.reload_models(['tag'])
+
+    assert sorted(schema.models.keys()) == ['author', 'book', 'review']
+    assert all(map(lambda x: schema.models[x] is models[x], schema.models.keys()))
+
+
+def test_reload_models_updates_names(schema):
+    load_models(schema, ['author', 'tag'])
+    schema.MappedBase.metadata.remove(schema.MappedBase.metadata.tables['tag'])
+
+    schema.reload_models(['tag'])
+
+    assert sorted(schema.models_names.keys()) == ['author', 'book', 'review']
+    assert list(schema.models.keys()) == ['author']
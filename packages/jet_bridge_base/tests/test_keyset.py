@@ -0,0 +1,131 @@
+import base64
+import datetime
+import decimal
+import json
+import uuid
+
+import pytest
+from bson import ObjectId
+from sqlalchemy import create_engine, Column, Integer, String
+from sqlalchemy.orm import declarative_base, sessionmaker
+
+from jet_bridge_base.db_types import get_queryset_keyset, apply_keyset_cursor, encode_keyset_cursor
+from jet_bridge_base.db_types.keyset import encode_keyset_value, decode_keyset_value, decode_keyset_cursor
+from jet_bridge_base.exceptions.validation_error import ValidationError
+
+Base = declarative_base()
+
+
+class Item(Base):
+    __tablename__ = 'item'
+    id = Column(Integer, primary_key=True)
+    name = Column(String, nullable=False)
+    rank = Column(Integer, nullable=True)
+
+
+@pytest.fixture
+def session():
+    engine = create_engine('sqlite://')
+    Base.metadata.create_all(engine)
+    session = sessionmaker(bind=engine)()
+
+    for i in range(1, 31):
+        session.add(Item(id=i, name='item {}'.format(i % 4), rank=None if i % 3 == 0 else i % 5))
+
+    session.commit()
+    yield session
+    session.close()
+
+
+def paginate(session, ordering, page_size):
+    result = []
+    cursor = None
+
+    while True:
+        queryset = session.query(Item).order_by(*ordering)
+        keyset = get_queryset_keyset(Item, queryset)
+
+        if cursor is not None:
+            queryset = apply_keyset_cursor(queryset, keyset, cursor)
+
+        page = queryset.limit(page_size).all()
+        result.extend(map(lambda x: x.id, page))
+
+        if len(page) < page_size:
+            return result
+
+        cursor = encode_keyset_cursor(keyset, page[-1])
+
+
+@pytest.mark.parametrize('ordering', [
+    lambda: [Item.id],
+    lambda: [Item.id.desc()],
+    lambda: [Item.name, Item.id],
+    lambda: [Item.name.desc(), Item.id.desc()],
+    # Nullable column uses OR conditions with NULL ordering of engine
+    lambda: [Item.rank, Item.id],
+    lambda: [Item.rank.desc(), Item.id],
+    lambda: [Item.rank.desc(), Item.name, Item.id.desc()]
+])
+@pytest.mark.parametrize('page_size', [1, 4, 7])
+def test_pages_match_offset_ordering(session, ordering, page_size):
+    expected = list(map(lambda x: x.id, session.query(Item).order_by(*ordering()).all()))
+    assert paginate(session, ordering(), page_size) == expected
+
+
+def test_ordering_requires_pk(session):
+    with pytest.raises(ValidationError):
+        get_queryset_keyset(Item, session.query(Item).order_by(Item.name))
+
+
+@pytest.mark.parametrize('value', [
+    None,
+    True,
+    5,
+    1.5,
+    'text',
+    datetime.datetime(2020, 1, 2, 3, 4, 5, 6, tzinfo=datetime.timezone.utc),
+    datetime.date(2020, 1, 2),
+    datetime.time(3, 4, 5),
+    decimal.Decimal('1.10'),
+    uuid.UUID(int=5),
+    ObjectId('5f1d7a0b2f8fb814b56fa181'),
+    b'\x00\xff'
+])
+def test_value_round_trip(value):
+    encoded = json.loads(json.dumps(encode_keyset_value(value)))
+    assert decode_keyset_value(encoded) == value
+
+
+def encode_cursor(data):
+    return base64.urlsafe_b64encode(json.dumps(data).encode('utf-8')).decode('ascii').rstrip('=')
+
+
+@pytest.mark.parametrize('cursor', [
+    'not base64 !',
+    encode_cursor([1, 2]),
+    encode_cursor('text'),
+    encode_cursor({'o': ['id']}),
+    encode_cursor({'o': ['id'], 'v': 5}),
+    encode_cursor({'o': ['id'], 'v': [{'unknown': 1}]}),
+    encode_cursor({'o': ['id'], 'v': [{'dec': 'abc'}]}),
+    encode_cursor({'o': ['id'], 'v': [{'oid': 'abc'}]}),
+    encode_cursor({'o': ['id'], 'v': [{'dt': 'abc'}]})
+])
+def test_invalid_cursor(session, cursor):
+    keyset = get_queryset_keyset(Item, session.query(Item).order_by(Item.id))
+
+    with pytest.raises(ValidationError) as e:
+        decode_keyset_cursor(keyset, cursor)
+
+    assert e.value.detail == 'Invalid cursor'
+
+
+def test_cursor_ordering_mismatch(session):
+    keyset = get_queryset_keyset(Item, session.query(Item).order_by(Item.id))
+    cursor = encode_cursor({'o': ['-id'], 'v': [1]})
+
+    with pytest.raises(ValidationError) as e:
+        decode_keyset_cursor(keyset, cursor)
+
+    assert e.value.detail == 'Cursor does not match current ordering'
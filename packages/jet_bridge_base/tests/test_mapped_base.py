@@ -0,0 +1,88 @@
+import pytest
+from sqlalchemy import create_engine, MetaData, inspect
+from sqlalchemy.orm import configure_mappers
+
+from jet_bridge_base.automap import automap_base
+from jet_bridge_base.db_types.sql import sql_load_mapped_base
+from jet_bridge_base.db_types.sql.sql_mapped_base import sql_setup_lazy_mapped_base
+
+SCHEMA = [
+    'CREATE TABLE author (id INTEGER PRIMARY KEY, name TEXT)',
+    'CREATE TABLE book (id INTEGER PRIMARY KEY, author_id INTEGER NOT NULL REFERENCES author(id), '
+    'editor_id INTEGER REFERENCES author(id))',
+    'CREATE TABLE tag (id INTEGER PRIMARY KEY, name TEXT)',
+    # Association table is mapped as a regular class, many-to-many relationships are not generated
+    'CREATE TABLE book_tag (book_id INTEGER NOT NULL REFERENCES book(id), tag_id INTEGER NOT NULL REFERENCES tag(id), '
+    'PRIMARY KEY (book_id, tag_id))',
+    'CREATE TABLE node (id INTEGER PRIMARY KEY, parent_id INTEGER REFERENCES node(id))',
+    'CREATE TABLE log (message TEXT)'
+]
+
+
+@pytest.fixture
+def engine():
+    engine = create_engine('sqlite://')
+
+    with engine.begin() as connection:
+        for statement in SCHEMA:
+            connection.exec_driver_sql(statement)
+
+    return engine
+
+
+def create_mapped_base(engine, lazy):
+    metadata = MetaData()
+    metadata.reflect(bind=engine)
+    MappedBase = automap_base(metadata=metadata)
+
+    if lazy:
+        sql_setup_lazy_mapped_base(MappedBase, 'test')
+
+    sql_load_mapped_base(MappedBase)
+    return MappedBase
+
+
+def get_relationships(MappedBase):
+    configure_mappers()
+    result = {}
+
+    for name, cls in MappedBase.classes.items():
+        result[name] = sorted(map(
+            lambda x: (
+                x.key,
+                x.direction.name,
+                x.mapper.local_table.name,
+                x.uselist,
+                x.cascade.delete_orphan,
+                x.secondary is not None
+            ),
+            inspect(cls).relationships
+        ))
+
+    return result
+
+
+def test_lazy_relationships_match_eager(engine):
+    eager = get_relationships(create_mapped_base(engine, False))
+    lazy = get_relationships(create_mapped_base(engine, True))
+
+    assert sorted(eager.keys()) == ['author', 'book', 'book_tag', 'node', 'tag']
+    assert lazy == eager
+
+
+def test_no_many_to_many(engine):
+    relationships = get_relationships(create_mapped_base(engine, True))
+
+    assert not any(map(lambda x: x[5], relationships['book'] + relationships['tag']))
+    assert ('book_tag__book_id__to__id', 'ONETOMANY', 'book_tag', True, True, False) in relationships['book']
+
+
+def test_lazy_lookup_maps_related_tables(engine):
+    MappedBase = create_mapped_base(engine, True)
+    book = MappedBase.classes.book
+    classes = MappedBase.classes._data
+
+    assert sorted(dict.keys(classes)) == ['author', 'book', 'book_tag']
+    assert classes.completed == {'book'}
+    assert inspect(book).relationships['author_id__to__author__id'].mapper.class_ is MappedBase.classes.author
+    assert 'log' not in MappedBase.classes
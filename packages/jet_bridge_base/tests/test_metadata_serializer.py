@@ -0,0 +1,67 @@
+import json
+
+import pytest
+from sqlalchemy import MetaData, Table, Column, Integer, String, CheckConstraint, UniqueConstraint, Index, \
+    create_engine, func, text
+from sqlalchemy.schema import CreateIndex, CreateTable
+
+from jet_bridge_base.db_types.sql.sql_metadata_serializer import sql_serialize_table, sql_deserialize_table, \
+    SqlSerializeError
+
+
+def create_table(metadata):
+    table = Table(
+        'product',
+        metadata,
+        Column('id', Integer, primary_key=True),
+        Column('name', String(100)),
+        Column('price', Integer),
+        CheckConstraint(text('price >= 0'), name='price_positive'),
+        UniqueConstraint('name', name='name_unique')
+    )
+    Index('ix_product_name_price', table.c.name, table.c.price)
+    Index('ix_product_lower_name', text('lower(name)'), unique=True, _table=table)
+    Index('ix_product_price', table.c.price, sqlite_where=text('price > 0'))
+    return table
+
+
+def get_ddl(table, engine):
+    # Constraints order does not matter, so DDL is compared by lines
+    statements = [CreateTable(table)] + list(map(lambda x: CreateIndex(x), table.indexes))
+    lines = (line for statement in statements for line in str(statement.compile(engine)).splitlines())
+    return sorted(filter(lambda x: x, map(lambda x: x.strip().rstrip(','), lines)))
+
+
+def test_table_round_trip():
+    engine = create_engine('sqlite://')
+    table = create_table(MetaData())
+    record = json.loads(json.dumps(sql_serialize_table(table)))
+    restored = sql_deserialize_table(MetaData(), record)
+
+    assert get_ddl(restored, engine) == get_ddl(table, engine)
+    assert sorted(map(lambda x: x['name'], record['indexes'])) == [
+        'ix_product_lower_name', 'ix_product_name_price', 'ix_product_price'
+    ]
+    assert record['check_constraints'] == [{'name': 'price_positive', 'sqltext': 'price >= 0'}]
+
+
+@pytest.mark.filterwarnings('ignore:Skipped unsupported reflection')
+def test_reflected_table_round_trip():
+    engine = create_engine('sqlite://')
+    create_table(MetaData()).create(engine)
+
+    metadata = MetaData()
+    metadata.reflect(bind=engine)
+    table = metadata.tables['product']
+    restored = sql_deserialize_table(MetaData(), json.loads(json.dumps(sql_serialize_table(table))))
+
+    assert get_ddl(restored, engine) == get_ddl(table, engine)
+
+
+def test_unsupported_expression():
+    table = create_table(MetaData())
+    Index('ix_product_upper_name', func.upper(table.c.name))
+
+    # Table is reflected on load instead of being saved to schema cache
+    with pytest.raises(SqlSerializeError):
+        sql_serialize_table(table)
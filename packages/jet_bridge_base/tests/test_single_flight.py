@@ -0,0 +1,199 @@
+import threading
+import time
+
+import pytest
+
+from jet_bridge_base.request import Request
+from jet_bridge_base.utils.single_flight import SingleFlight, get_request_single_flight_key
+
+FOLLOWERS = 4
+
+
+class View(object):
+    pass
+
+
+class OtherView(object):
+    pass
+
+
+def wait_followers(single_flight, followers):
+    deadline = time.time() + 5
+
+    while single_flight.get_stats()['followers'] < followers:
+        assert time.time() < deadline, 'Followers did not join the call'
+        time.sleep(0.001)
+
+
+def run_concurrent(single_flight, key, func, followers=FOLLOWERS):
+    """
+    Runs leader call blocked in func until all followers joined it, returns results and exceptions by caller.
+    """
+
+    release = threading.Event()
+    results = {}
+    errors = {}
+
+    def leader_func():
+        release.wait(5)
+        return func()
+
+    def call(name, f):
+        try:
+            results[name] = single_flight.do(key, f)
+        except Exception as e:
+            errors[name] = e
+
+    leader = threading.Thread(target=call, args=('leader', leader_func))
+    leader.start()
+
+    while single_flight.get_stats()['in_flight'] == 0:
+        time.sleep(0.001)
+
+    threads = list(map(
+        lambda i: threading.Thread(target=call, args=(i, lambda: pytest.fail('Follower function called'))),
+        range(followers)
+    ))
+
+    for thread in threads:
+        thread.start()
+
+    wait_followers(single_flight, followers)
+    release.set()
+
+    for thread in [leader] + threads:
+        thread.join(5)
+
+    return results, errors
+
+
+def test_followers_share_result():
+    single_flight = SingleFlight()
+    calls = []
+
+    def func():
+        calls.append(1)
+        return {'value': 1}
+
+    results, errors = run_concurrent(single_flight, 'key', func)
+
+    assert calls == [1]
+    assert errors == {}
+    assert len(results) == FOLLOWERS + 1
+    assert all(map(lambda x: x is results['leader'], results.values()))
+
+
+def test_followers_receive_error():
+    single_flight = SingleFlight()
+    error = ValueError('failed')
+
+    def func():
+        raise error
+
+    results, errors = run_concurrent(single_flight, 'key', func)
+
+    assert results == {}
+    assert len(errors) == FOLLOWERS + 1
+    assert all(map(lambda x: x is error, errors.values()))
+
+
+def test_key_released():
+    single_flight = SingleFlight()
+
+    with pytest.raises(ValueError):
+        single_flight.do('key', lambda: int('error'))
+
+    assert single_flight.calls == {}
+    assert single_flight.do('key', lambda: 1) == 1
+    assert single_flight.do('key', lambda: 2) == 2
+    assert single_flight.calls == {}
+
+
+def test_different_keys_not_shared():
+    single_flight = SingleFlight()
+    release = threading.Event()
+    results = {}
+
+    def call(key):
+        results[key] = single_flight.do(key, lambda: release.wait(5) and key)
+
+    threads = list(map(lambda x: threading.Thread(target=call, args=(x,)), ['a', 'b']))
+
+    for thread in threads:
+        thread.start()
+
+    while single_flight.get_stats()['in_flight'] < 2:
+        time.sleep(0.001)
+
+    release.set()
+
+    for thread in threads:
+        thread.join(5)
+
+    assert results == {'a': 'a', 'b': 'b'}
+    assert single_flight.get_stats()['leaders'] == 2
+
+
+def test_stats():
+    single_flight = SingleFlight()
+
+    assert single_flight.get_stats() == {
+        'in_flight': 0,
+        'leaders': 0,
+        'followers': 0,
+        'errors': 0,
+        'hit_ratio': None
+    }
+
+    run_concurrent(single_flight, 'key', lambda: 1, followers=3)
+
+    with pytest.raises(ValueError):
+        single_flight.do('key', lambda: int('error'))
+
+    assert single_flight.get_stats() == {
+        'in_flight': 0,
+        'leaders': 2,
+        'followers': 3,
+        'errors': 1,
+        'hit_ratio': 0.6
+    }
+
+
+def create_request(**kwargs):
+    request = Request(
+        method=kwargs.pop('method', 'GET'),
+        path_kwargs=kwargs.pop('path_kwargs', {'model': 'item'}),
+        query_arguments=kwargs.pop('query_arguments', {'page': [b'1']})
+    )
+    request.conf = kwargs.pop('conf', {'engine': 'sqlite', 'name': 'test'})
+
+    for key, value in kwargs.items():
+        setattr(request, key, value)
+
+    return request
+
+
+def test_request_key():
+    key = get_request_single_flight_key(create_request(), View(), 'list')
+
+    assert get_request_single_flight_key(create_request(), View(), 'list') == key
+    assert get_request_single_flight_key(create_request(query_arguments={'page': ['1']}), View(), 'list') == key
+
+    for request, view, action in [
+        (create_request(), OtherView(), 'list'),
+        (create_request(), View(), 'retrieve'),
+        (create_request(method='POST'), View(), 'list'),
+        (create_request(path_kwargs={'model': 'other'}), View(), 'list'),
+        (create_request(query_arguments={'page': [b'2']}), View(), 'list'),
+        (create_request(conf={'engine': 'sqlite', 'name': 'other'}), View(), 'list'),
+        (create_request(project='project'), View(), 'list'),
+        (create_request(environment='environment'), View(), 'list'),
+        (create_request(admin=True), View(), 'list'),
+        (create_request(sso_shared_data={'sso': {'user_id': 1}}, conf={
+            'engine': 'sqlite',
+            'name': 'test',
+            'rls_type': 'supabase',
+            'rls_sso': 'sso'
+        }), View(), 'list')
+    ]:
+        assert get_request_single_flight_key(request, view, action) != key
@@ -0,0 +1,162 @@
+import threading
+import time
+
+import pytest
+
+from jet_bridge_base import settings
+from jet_bridge_base.request import Request
+from jet_bridge_base.utils import sql_cache as sql_cache_module
+from jet_bridge_base.utils.sql_cache import sql_cache, is_read_only_query, get_sql_cache_key, \
+    get_sql_cache_scope, get_sql_cache_generation, get_cached_sql_response, set_cached_sql_response, \
+    invalidate_sql_cache, submit_sql_cache_refresh
+
+
+@pytest.fixture(autouse=True)
+def cache_settings(monkeypatch):
+    monkeypatch.setattr(settings, 'SQL_CACHE_TTL', 60)
+    monkeypatch.setattr(settings, 'SQL_CACHE_STALE_TTL', 60)
+    sql_cache.clear()
+    yield
+    sql_cache.clear()
+
+
+def create_request(name):
+    request = Request(method='POST', action='post')
+    request.conf = {'engine': 'sqlite', 'name': name}
+    return request
+
+
+def store(request, query, response=None, generation=None):
+    key = get_sql_cache_key(request, {'query': query})
+    scope = get_sql_cache_scope(request)
+    generation = get_sql_cache_generation(scope) if generation is None else generation
+    set_cached_sql_response(key, scope, generation, query, response or {'data': [[query]]})
+    return key
+
+
+def get(key):
+    return get_cached_sql_response(key, lambda: None)
+
+
+@pytest.mark.parametrize('query,read_only', [
+    ('SELECT * FROM item', True),
+    ('  with t as (select 1) select * from t', True),
+    ('SELECT nextval(\'seq\')', False),
+    ('SELECT * INTO copy FROM item', False),
+    ('WITH t AS (DELETE FROM item RETURNING *) SELECT * FROM t', False),
+    ('UPDATE item SET name = 1', False),
+    ('', False)
+])
+def test_read_only_query(query, read_only):
+    assert is_read_only_query(query) == read_only
+
+
+def test_cache_key(sql_request, monkeypatch):
+    key = get_sql_cache_key(sql_request, {'query': 'SELECT 1;', 'limit': 10})
+
+    assert key == get_sql_cache_key(sql_request, {'query': ' SELECT 1 ', 'limit': 10})
+    assert key != get_sql_cache_key(sql_request, {'query': 'SELECT 1', 'limit': 20})
+    assert key != get_sql_cache_key(create_request('other'), {'query': 'SELECT 1', 'limit': 10})
+    assert get_sql_cache_key(sql_request, {'query': 'DELETE FROM item'}) is None
+
+    monkeypatch.setattr(settings, 'SQL_CACHE_TTL', 0)
+    assert get_sql_cache_key(sql_request, {'query': 'SELECT 1'}) is None
+
+
+def test_invalidate_table(sql_request):
+    other_request = create_request('other')
+    item_key = store(sql_request, 'SELECT * FROM item')
+    user_key = store(sql_request, 'SELECT * FROM "User"')
+    other_item_key = store(other_request, 'SELECT * FROM item')
+
+    assert invalidate_sql_cache(sql_request, 'ITEM') == 1
+    assert get(item_key) is None
+    assert get(user_key)['data'] == [['SELECT * FROM "User"']]
+    # Results of other connections are kept
+    assert get(other_item_key) is not None
+
+    invalidate_sql_cache(sql_request)
+    assert get(user_key) is None
+    assert get(other_item_key) is not None
+
+
+def test_result_started_before_invalidation_is_not_stored(sql_request):
+    scope = get_sql_cache_scope(sql_request)
+    generation = get_sql_cache_generation(scope)
+
+    invalidate_sql_cache(sql_request, 'item')
+
+    key = store(sql_request, 'SELECT * FROM item', generation=generation)
+    assert get(key) is None
+
+    key = store(sql_request, 'SELECT * FROM item')
+    assert get(key) is not None
+
+
+def test_stale_response_refreshed_once(sql_request, monkeypatch):
+    key = store(sql_request, 'SELECT * FROM item')
+    assert get(key)['cache_age'] < 1
+
+    monkeypatch.setattr(settings, 'SQL_CACHE_TTL', 0.01)
+    time.sleep(0.02)
+
+    release = threading.Event()
+    refreshed = []
+
+    def refresh():
+        refreshed.append(True)
+        release.wait(5)
+
+    # Stale response is returned while refresh is running, it is submitted only once
+    assert get_cached_sql_response(key, refresh) is not None
+    assert get_cached_sql_response(key, refresh) is not None
+
+    release.set()
+
+    for _ in range(100):
+        if key not in sql_cache_module.sql_cache_refreshing:
+            break
+        time.sleep(0.01)
+
+    assert refreshed == [True]
+    assert key not in sql_cache_module.sql_cache_refreshing
+
+
+def test_refresh_error_releases_key():
+    done = threading.Event()
+
+    def refresh():
+        done.set()
+        raise Exception('failed')
+
+    submit_sql_cache_refresh('key', refresh)
+    assert done.wait(5)
+
+    for _ in range(100):
+        if 'key' not in sql_cache_module.sql_cache_refreshing:
+            break
+        time.sleep(0.01)
+
+    assert 'key' not in sql_cache_module.sql_cache_refreshing
+
+
+def test_max_memory(sql_request, monkeypatch):
+    monkeypatch.setattr(settings, 'SQL_CACHE_MAX_MEMORY', 100)
+
+    key = store(sql_request, 'SELECT * FROM item', {'data': [['x' * 200]]})
+    assert get(key) is None
+
+
+def test_execute_cached(execute_sql, sql_engine):
+    query = {'query': 'SELECT id FROM item WHERE id < 5'}
+    response = execute_sql(query, use_cache=True)
+
+    with sql_engine.begin() as connection:
+        connection.exec_driver_sql('DELETE FROM item WHERE id = 1')
+
+    cached = execute_sql(query, use_cache=True)
+
+    assert 'cache_age' not in response
+    assert cached['data'] == response['data'] == [[1], [2], [3], [4]]
+    assert 'cache_age' in cached
+    assert execute_sql(query)['data'] == [[2], [3], [4]]
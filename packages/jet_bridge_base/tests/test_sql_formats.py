@@ -0,0 +1,77 @@
+import json
+
+import pytest
+
+from jet_bridge_base.encoders import JSONEncoder
+from jet_bridge_base.responses.json import JSONResponse
+from jet_bridge_base.responses.msgpack import MsgpackResponse, msgpack
+from jet_bridge_base.responses.streaming_json import StreamingJSONResponse
+
+requires_msgpack = pytest.mark.skipif(not MsgpackResponse.is_available(), reason='msgpack is not installed')
+
+QUERIES = [
+    {'query': 'SELECT * FROM item'},
+    {'query': 'SELECT id, name, data FROM item WHERE id > :id', 'params_obj': {'id': 40}, 'v': 2},
+    {'query': 'SELECT * FROM item', 'order_by': ['-value'], 'limit': 15, 'offset': 5, 'count': True},
+    {'query': 'SELECT * FROM item WHERE id < 0'}
+]
+
+
+def unpack_msgpack(content):
+    unpacker = msgpack.Unpacker(raw=False, strict_map_key=False)
+    unpacker.feed(content)
+    return list(unpacker)
+
+
+def normalize(response):
+    # Rendered data is compared, so values converted by encoder (dates, decimals) are equal in all formats
+    return msgpack.unpackb(
+        msgpack.packb(response, default=JSONEncoder().default, use_bin_type=True),
+        raw=False,
+        strict_map_key=False
+    )
+
+
+def without_timing(response, exclude=None):
+    return dict(filter(lambda x: not x[0].endswith('_time') and x[0] != exclude, response.items()))
+
+
+@pytest.mark.parametrize('query', QUERIES)
+def test_columns_match_rows(execute_sql, query):
+    rows = execute_sql(query)
+    columns = execute_sql(dict(query, format='columns'))
+
+    assert columns['columns'] == rows['columns']
+    assert columns['row_count'] == rows['row_count'] == len(rows['data'])
+    assert columns['data'] == list(map(lambda i: list(map(lambda x: x[i], rows['data'])), range(len(rows['columns']))))
+    assert without_timing(columns, 'data') == without_timing(rows, 'data')
+
+
+@requires_msgpack
+@pytest.mark.parametrize('query', QUERIES)
+@pytest.mark.parametrize('stream', [False, True])
+def test_msgpack_matches_rows(execute_sql, query, stream):
+    rows = normalize(execute_sql(query))
+    objects = unpack_msgpack(MsgpackResponse(execute_sql(dict(query, format='msgpack'), stream=stream)).render())
+
+    header = objects[0]
+    batches = objects[1:]
+    trailer = {}
+
+    if stream:
+        # Values known only after rows are written follow batches
+        trailer = batches.pop()
+        assert set(trailer.keys()) == {'row_count', 'truncated'}
+
+    data = [row for batch in batches for row in batch]
+
+    assert data == rows['data']
+    assert without_timing(dict(header, **trailer)) == without_timing(rows, 'data')
+
+
+@pytest.mark.parametrize('query', QUERIES)
+def test_streamed_json_matches_rows(execute_sql, query):
+    rows = JSONResponse(execute_sql(query)).render()
+    streamed = StreamingJSONResponse(execute_sql(query, stream=True)).render()
+
+    assert without_timing(json.loads(streamed)) == without_timing(json.loads(rows))
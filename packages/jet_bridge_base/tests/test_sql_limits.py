@@ -0,0 +1,108 @@
+import json
+
+import pytest
+
+from jet_bridge_base import encoders, settings
+from jet_bridge_base.responses.streaming_json import StreamingJSONResponse
+from jet_bridge_base.serializers.sql import fetch_result_batches_limited, estimate_rows_size, SQL_SIZE_SAMPLE_ROWS
+
+QUERY = {'query': 'SELECT id, name FROM item'}
+
+
+def render_streamed(response):
+    return json.loads(StreamingJSONResponse(response).render())
+
+
+@pytest.fixture(autouse=True)
+def chunk_size(monkeypatch):
+    monkeypatch.setattr(settings, 'STREAM_CHUNK_SIZE', 7)
+    monkeypatch.setattr(settings, 'JSON_BACKEND', encoders.JSON_BACKEND_JSON)
+
+
+@pytest.mark.parametrize('stream', [False, True])
+def test_not_truncated(execute_sql, sql_items_count, stream):
+    response = execute_sql(QUERY, stream=stream)
+
+    if stream:
+        # Row count is known only after rows are written
+        assert callable(response['row_count']) and callable(response['truncated'])
+        response = render_streamed(response)
+
+    assert len(response['data']) == sql_items_count
+    assert response['row_count'] == sql_items_count
+    assert response['truncated'] is False
+
+
+@pytest.mark.parametrize('stream', [False, True])
+@pytest.mark.parametrize('max_rows', [1, 7, 30, 99])
+def test_max_rows(execute_sql, stream, max_rows):
+    response = execute_sql(QUERY, stream=stream, sql_max_rows=max_rows)
+
+    if stream:
+        response = render_streamed(response)
+
+    assert list(map(lambda x: x[0], response['data'])) == list(range(1, max_rows + 1))
+    assert response['row_count'] == max_rows
+    assert response['truncated'] is True
+
+
+def test_max_rows_equal_to_result(execute_sql, sql_items_count):
+    response = execute_sql(QUERY, sql_max_rows=sql_items_count)
+
+    assert response['row_count'] == sql_items_count
+    assert response['truncated'] is False
+
+
+@pytest.mark.parametrize('stream', [False, True])
+@pytest.mark.parametrize('max_size', [1, 100, 1000])
+def test_max_response_size(execute_sql, sql_items_count, stream, max_size):
+    response = execute_sql(QUERY, stream=stream, sql_max_response_size=max_size)
+
+    if stream:
+        response = render_streamed(response)
+
+    # Rows are encoded separately near the limit, so returned rows never exceed it
+    assert len(json.dumps(response['data'])) - 2 <= max_size + len(response['data'])
+    assert response['row_count'] == len(response['data']) < sql_items_count
+    assert response['truncated'] is True
+
+
+def test_columns_format_limits(execute_sql):
+    response = execute_sql(dict(QUERY, format='columns'), sql_max_rows=10)
+
+    assert response['data'][0] == list(range(1, 11))
+    assert response['row_count'] == 10
+    assert response['truncated'] is True
+
+
+class Result(object):
+    def __init__(self, rows):
+        self.rows = rows
+        self.closed = False
+
+    def fetchmany(self, size):
+        rows, self.rows = self.rows[:size], self.rows[size:]
+        return rows
+
+    def close(self):
+        self.closed = True
+
+
+def test_fetch_batches_closes_truncated_result():
+    result = Result(list(map(lambda x: (x, 'name'), range(50))))
+    state = {}
+    batches = list(fetch_result_batches_limited(result, 10, list, max_rows=25, state=state))
+
+    assert list(map(len, batches)) == [10, 10, 5]
+    assert state == {'rows': 25, 'truncated': True}
+    assert result.closed
+    # Rest of the rows are not fetched
+    assert len(result.rows) == 20
+
+
+def test_estimate_rows_size():
+    rows = list(map(lambda x: [x, 'name {}'.format(x)], range(1000, 1000 + SQL_SIZE_SAMPLE_ROWS * 10)))
+    size = len(encoders.json_dumps(rows))
+
+    assert estimate_rows_size(rows[:SQL_SIZE_SAMPLE_ROWS]) == len(encoders.json_dumps(rows[:SQL_SIZE_SAMPLE_ROWS]))
+    assert abs(estimate_rows_size(rows) - size) < size * 0.05
@@ -89,7 +89,13 @@ class JetDjangoConfiguration(Configuration):
             'DATABASE_RLS_TYPE': settings.JET_DATABASE_RLS_TYPE,
             'DATABASE_RLS_SSO': settings.JET_DATABASE_RLS_SSO,
             'DATABASE_RLS_USER_PROPERTY': settings.JET_DATABASE_RLS_USER_PROPERTY,
+            'DATABASE_SQL_MAX_ROWS': settings.JET_DATABASE_SQL_MAX_ROWS,
+            'DATABASE_SQL_MAX_RESPONSE_SIZE': settings.JET_DATABASE_SQL_MAX_RESPONSE_SIZE,
             'DATABASE_REFLECT_MAX_RECORDS': settings.JET_DATABASE_REFLECT_MAX_RECORDS,
+            'DATABASE_REFLECT_THREADS': settings.JET_DATABASE_REFLECT_THREADS,
+            'DATABASE_REFLECT_SAMPLE': settings.JET_DATABASE_REFLECT_SAMPLE,
+            'DATABASE_BULK_WRITE_SIZE': settings.JET_DATABASE_BULK_WRITE_SIZE,
+            'DATABASE_LAZY_MAPPING': settings.JET_DATABASE_LAZY_MAPPING,
             'DATABASE_SSL_CA': settings.JET_DATABASE_SSL_CA,
             'DATABASE_SSL_CERT': settings.JET_DATABASE_SSL_CERT,
             'DATABASE_SSL_KEY': settings.JET_DATABASE_SSL_KEY,
@@ -105,6 +111,27 @@ class JetDjangoConfiguration(Configuration):
             'CACHE_METADATA': settings.JET_CACHE_METADATA,
             'CACHE_METADATA_PATH': settings.JET_CACHE_METADATA_PATH,
             'CACHE_MODEL_DESCRIPTIONS': settings.JET_CACHE_MODEL_DESCRIPTIONS,
+            'CACHE_GRAPHQL_SCHEMA': settings.JET_CACHE_GRAPHQL_SCHEMA,
+            'BRIDGE_SETTINGS_CACHE_SIZE': settings.JET_BRIDGE_SETTINGS_CACHE_SIZE,
+            'BRIDGE_SETTINGS_CACHE_TTL': settings.JET_BRIDGE_SETTINGS_CACHE_TTL,
+            'COUNT_STRATEGY': settings.JET_COUNT_STRATEGY,
+            'COUNT_CAP': settings.JET_COUNT_CAP,
+            'COUNT_CACHE_SIZE': settings.JET_COUNT_CACHE_SIZE,
+            'COUNT_CACHE_TTL': settings.JET_COUNT_CACHE_TTL,
+            'COUNT_CONCURRENT': settings.JET_COUNT_CONCURRENT,
+            'STREAM_RESPONSES': settings.JET_STREAM_RESPONSES,
+            'STREAM_CHUNK_SIZE': settings.JET_STREAM_CHUNK_SIZE,
+            'JSON_BACKEND': settings.JET_JSON_BACKEND,
+            'GRAPHQL_LAZY_SCHEMA': settings.JET_GRAPHQL_LAZY_SCHEMA,
+            'GRAPHQL_DOCUMENTS_CACHE_SIZE': settings.JET_GRAPHQL_DOCUMENTS_CACHE_SIZE,
+            'GRAPHQL_PERSISTED_QUERIES': settings.JET_GRAPHQL_PERSISTED_QUERIES,
+            'GRAPHQL_PERSISTED_QUERIES_CACHE_SIZE': settings.JET_GRAPHQL_PERSISTED_QUERIES_CACHE_SIZE,
+            'SQL_BATCH_CONCURRENCY': settings.JET_SQL_BATCH_CONCURRENCY,
+            'SQL_CACHE_TTL': settings.JET_SQL_CACHE_TTL,
+            'SQL_CACHE_STALE_TTL': settings.JET_SQL_CACHE_STALE_TTL,
+            'SQL_CACHE_SIZE': settings.JET_SQL_CACHE_SIZE,
+            'SQL_CACHE_MAX_MEMORY': settings.JET_SQL_CACHE_MAX_MEMORY,
+            'COALESCE_REQUESTS': settings.JET_COALESCE_REQUESTS,
             'SSO_APPLICATIONS': self.clean_sso_applications(settings.JET_SSO_APPLICATIONS),
             'ALLOW_ORIGIN': settings.JET_ALLOW_ORIGIN,
             'TRACK_DATABASES': settings.JET_TRACK_DATABASES,
@@ -114,6 +141,9 @@ class JetDjangoConfiguration(Configuration):
             'TRACK_MODELS_AUTH': settings.JET_TRACK_MODELS_AUTH,
             'TRACK_QUERY_SLOW_TIME': settings.JET_TRACK_QUERY_SLOW_TIME,
             'TRACK_QUERY_HIGH_MEMORY': settings.JET_TRACK_QUERY_HIGH_MEMORY,
+            'RELEASE_INACTIVE_CONNECTIONS_TIMEOUT': settings.JET_RELEASE_INACTIVE_CONNECTIONS_TIMEOUT,
+            'CONNECTIONS_LIMIT': settings.JET_CONNECTIONS_LIMIT,
+            'CONNECTIONS_MEMORY_LIMIT': settings.JET_CONNECTIONS_MEMORY_LIMIT,
             'DISABLE_AUTH': settings.JET_DISABLE_AUTH
         }
 
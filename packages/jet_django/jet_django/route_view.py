@@ -1,6 +1,6 @@
 import os
 import sys
-from django.http import HttpResponse, HttpResponseRedirect
+from django.http import HttpResponse, HttpResponseRedirect, StreamingHttpResponse
 from django.http.response import HttpResponseBase
 from django.template import Template
 from django.template.context import Context
@@ -13,6 +13,7 @@ from jet_bridge_base.request import Request
 from jet_bridge_base.responses.base import Response
 from jet_bridge_base.responses.optional_json import OptionalJSONResponse
 from jet_bridge_base.responses.redirect import RedirectResponse
+from jet_bridge_base.responses.streaming import StreamingResponse
 from jet_bridge_base.responses.template import TemplateResponse
 
 from jet_bridge_base.status import HTTP_204_NO_CONTENT
@@ -75,6 +76,9 @@ class BaseRouteView(generic.View):
                 context = Context(response.data)
                 content = Template(template).render(context)
                 result = HttpResponse(content, status=response.status)
+        elif isinstance(response, StreamingResponse):
+            # Response is closed by Django after all chunks are sent or client disconnected
+            result = StreamingHttpResponse(response, status=response.status)
         else:
             result = HttpResponse(response.render(), status=response.status)
 
@@ -40,7 +40,13 @@ JET_DATABASE_TIMEZONE = getattr(settings, 'JET_DATABASE_TIMEZONE', None)
 JET_DATABASE_RLS_TYPE = getattr(settings, 'JET_DATABASE_RLS_TYPE', None)
 JET_DATABASE_RLS_SSO = getattr(settings, 'JET_DATABASE_RLS_SSO', None)
 JET_DATABASE_RLS_USER_PROPERTY = getattr(settings, 'JET_DATABASE_RLS_USER_PROPERTY', None)
+JET_DATABASE_SQL_MAX_ROWS = getattr(settings, 'JET_DATABASE_SQL_MAX_ROWS', 1000000)
+JET_DATABASE_SQL_MAX_RESPONSE_SIZE = getattr(settings, 'JET_DATABASE_SQL_MAX_RESPONSE_SIZE', 256 * 1024 * 1024)
 JET_DATABASE_REFLECT_MAX_RECORDS = getattr(settings, 'JET_DATABASE_REFLECT_MAX_RECORDS', 1000000)
+JET_DATABASE_REFLECT_THREADS = getattr(settings, 'JET_DATABASE_REFLECT_THREADS', 4)
+JET_DATABASE_REFLECT_SAMPLE = getattr(settings, 'JET_DATABASE_REFLECT_SAMPLE', True)
+JET_DATABASE_BULK_WRITE_SIZE = getattr(settings, 'JET_DATABASE_BULK_WRITE_SIZE', 1000)
+JET_DATABASE_LAZY_MAPPING = getattr(settings, 'JET_DATABASE_LAZY_MAPPING', False)
 
 JET_DATABASE_SSL_CA = getattr(settings, 'JET_DATABASE_SSL_CA', None)
 JET_DATABASE_SSL_CERT = getattr(settings, 'JET_DATABASE_SSL_CERT', None)
@@ -61,6 +67,32 @@ JET_STORE_PATH = getattr(settings, 'JET_STORE_PATH', 'jet_bridge_store.sqlite3')
 JET_CACHE_METADATA = getattr(settings, 'JET_CACHE_METADATA', False)
 JET_CACHE_METADATA_PATH = getattr(settings, 'JET_CACHE_METADATA_PATH', 'metadata')
 JET_CACHE_MODEL_DESCRIPTIONS = getattr(settings, 'JET_CACHE_MODEL_DESCRIPTIONS', False)
+JET_CACHE_GRAPHQL_SCHEMA = getattr(settings, 'JET_CACHE_GRAPHQL_SCHEMA', False)
+
+JET_BRIDGE_SETTINGS_CACHE_SIZE = getattr(settings, 'JET_BRIDGE_SETTINGS_CACHE_SIZE', 1000)
+JET_BRIDGE_SETTINGS_CACHE_TTL = getattr(settings, 'JET_BRIDGE_SETTINGS_CACHE_TTL', 300)
+
+JET_COUNT_STRATEGY = getattr(settings, 'JET_COUNT_STRATEGY', 'auto')
+JET_COUNT_CAP = getattr(settings, 'JET_COUNT_CAP', 10000)
+JET_COUNT_CACHE_SIZE = getattr(settings, 'JET_COUNT_CACHE_SIZE', 1000)
+JET_COUNT_CACHE_TTL = getattr(settings, 'JET_COUNT_CACHE_TTL', 60)
+JET_COUNT_CONCURRENT = getattr(settings, 'JET_COUNT_CONCURRENT', False)
+
+JET_STREAM_RESPONSES = getattr(settings, 'JET_STREAM_RESPONSES', False)
+JET_STREAM_CHUNK_SIZE = getattr(settings, 'JET_STREAM_CHUNK_SIZE', 1000)
+JET_JSON_BACKEND = getattr(settings, 'JET_JSON_BACKEND', 'json')
+JET_GRAPHQL_LAZY_SCHEMA = getattr(settings, 'JET_GRAPHQL_LAZY_SCHEMA', False)
+JET_GRAPHQL_DOCUMENTS_CACHE_SIZE = getattr(settings, 'JET_GRAPHQL_DOCUMENTS_CACHE_SIZE', 1000)
+JET_GRAPHQL_PERSISTED_QUERIES = getattr(settings, 'JET_GRAPHQL_PERSISTED_QUERIES', False)
+JET_GRAPHQL_PERSISTED_QUERIES_CACHE_SIZE = getattr(settings, 'JET_GRAPHQL_PERSISTED_QUERIES_CACHE_SIZE', 1000)
+
+JET_SQL_BATCH_CONCURRENCY = getattr(settings, 'JET_SQL_BATCH_CONCURRENCY', 0)
+JET_SQL_CACHE_TTL = getattr(settings, 'JET_SQL_CACHE_TTL', 0)
+JET_SQL_CACHE_STALE_TTL = getattr(settings, 'JET_SQL_CACHE_STALE_TTL', 60)
+JET_SQL_CACHE_SIZE = getattr(settings, 'JET_SQL_CACHE_SIZE', 1000)
+JET_SQL_CACHE_MAX_MEMORY = getattr(settings, 'JET_SQL_CACHE_MAX_MEMORY', 64 * 1024 * 1024)
+
+JET_COALESCE_REQUESTS = getattr(settings, 'JET_COALESCE_REQUESTS', False)
 
 JET_SSO_APPLICATIONS = getattr(settings, 'JET_SSO_APPLICATIONS', '{}')
 JET_ALLOW_ORIGIN = getattr(settings, 'JET_ALLOW_ORIGIN', '*')
@@ -75,6 +107,10 @@ JET_TRACK_MODELS_AUTH = getattr(settings, 'JET_TRACK_MODELS_AUTH', '')
 JET_TRACK_QUERY_SLOW_TIME = getattr(settings, 'JET_TRACK_QUERY_SLOW_TIME', None)
 JET_TRACK_QUERY_HIGH_MEMORY = getattr(settings, 'JET_TRACK_QUERY_HIGH_MEMORY', None)
 
+JET_RELEASE_INACTIVE_CONNECTIONS_TIMEOUT = getattr(settings, 'JET_RELEASE_INACTIVE_CONNECTIONS_TIMEOUT', None)
+JET_CONNECTIONS_LIMIT = getattr(settings, 'JET_CONNECTIONS_LIMIT', None)
+JET_CONNECTIONS_MEMORY_LIMIT = getattr(settings, 'JET_CONNECTIONS_MEMORY_LIMIT', None)
+
 JET_DISABLE_AUTH = getattr(settings, 'JET_DISABLE_AUTH', False)
 
 try: